@@ -0,0 +1,71 @@
+import hashlib
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from openproduct.utils.oidc_drf_middleware import clear_token_user_cache
+
+from .metrics import token_cache_lookups
+
+
+def _token_cache_key(key: str) -> str:
+    # the keys of the tokens are not stored in the cache
+    return f"api_token:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def clear_token_cache(keys: Iterable[str]) -> None:
+    """
+    Remove the cached users of the tokens, now & when the transaction is committed,
+    so a user that was cached from the previous state during the transaction is
+    removed as well.
+    """
+    cache_keys = [_token_cache_key(key) for key in keys]
+    if not cache_keys:
+        return
+
+    cache.delete_many(cache_keys)
+    transaction.on_commit(lambda: cache.delete_many(cache_keys))
+
+
+def clear_user_token_cache(user_ids: Iterable[int]) -> None:
+    """
+    Remove the cached users of the API & OIDC access tokens of the users.
+    """
+    user_ids = list(user_ids)
+    clear_token_cache(
+        Token.objects.filter(user_id__in=user_ids).values_list("key", flat=True)
+    )
+    clear_token_user_cache(user_ids)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    `TokenAuthentication` that caches the user of a token, including its
+    permissions, for `API_TOKEN_CACHE_TIMEOUT` seconds.
+
+    The cache is cleared when the token is deleted or when the user, its groups or
+    its permissions are changed, see `openproduct.accounts.signals`.
+    """
+
+    def authenticate_credentials(self, key):
+        timeout = settings.API_TOKEN_CACHE_TIMEOUT
+        if not timeout:
+            return super().authenticate_credentials(key)
+
+        cache_key = _token_cache_key(key)
+        if (cached := cache.get(cache_key)) is not None:
+            token_cache_lookups.add(1, attributes={"result": "hit"})
+            return cached
+
+        token_cache_lookups.add(1, attributes={"result": "miss"})
+        user, token = super().authenticate_credentials(key)
+
+        # load the permissions, which are cached on the user by the ModelBackend
+        user.get_all_permissions()
+        cache.set(cache_key, (user, token), timeout)
+        return user, token
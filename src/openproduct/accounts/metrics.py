@@ -61,3 +61,9 @@ user_lockouts = meter.create_counter(
     unit="1",  # unitless count
     description="The number of user lockouts because of failed logins.",
 )
+
+token_cache_lookups = meter.create_counter(
+    "openproduct.auth.token_cache_lookups",
+    unit="1",  # unitless count
+    description="The number of API token lookups in the cache, by hit or miss.",
+)
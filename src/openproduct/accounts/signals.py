@@ -1,15 +1,19 @@
 from typing import Literal
 
+from django.contrib.auth.models import Group
 from django.contrib.auth.signals import (
     user_logged_in,
     user_logged_out,
     user_login_failed,
 )
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django.http import HttpRequest
 
 from axes.signals import user_locked_out
+from rest_framework.authtoken.models import Token
 
+from .authentication import clear_token_cache, clear_user_token_cache
 from .metrics import login_failures, logins, logouts, user_lockouts
 from .models import User
 
@@ -61,3 +65,64 @@ def increment_user_locked_out_counter(
             "username": username,
         },
     )
+
+
+@receiver(post_delete, sender=Token, dispatch_uid="token.clear_token_cache")
+def clear_deleted_token_cache(sender, instance: Token, **kwargs) -> None:
+    clear_token_cache([instance.key])
+
+
+@receiver(post_save, sender=User, dispatch_uid="user.clear_token_cache")
+@receiver(post_delete, sender=User, dispatch_uid="deleted_user.clear_token_cache")
+def clear_changed_user_token_cache(sender, instance: User, **kwargs) -> None:
+    clear_user_token_cache([instance.pk])
+
+
+@receiver(
+    m2m_changed,
+    sender=User.groups.through,
+    dispatch_uid="user_groups.clear_token_cache",
+)
+@receiver(
+    m2m_changed,
+    sender=User.user_permissions.through,
+    dispatch_uid="user_permissions.clear_token_cache",
+)
+def clear_user_permissions_token_cache(
+    sender, instance, action: str, reverse: bool, pk_set: set[int] | None, **kwargs
+) -> None:
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if not reverse:
+        clear_user_token_cache([instance.pk])
+    elif pk_set:
+        clear_user_token_cache(pk_set)
+    else:
+        # a group or permission is cleared, before its users are removed
+        clear_user_token_cache(instance.user_set.values_list("pk", flat=True))
+
+
+@receiver(
+    m2m_changed,
+    sender=Group.permissions.through,
+    dispatch_uid="group_permissions.clear_token_cache",
+)
+def clear_group_permissions_token_cache(
+    sender, instance, action: str, reverse: bool, pk_set: set[int] | None, **kwargs
+) -> None:
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if not reverse:
+        users = User.objects.filter(groups=instance)
+    elif pk_set:
+        users = User.objects.filter(groups__in=pk_set)
+    else:
+        users = User.objects.filter(groups__permissions=instance)
+    clear_user_token_cache(users.values_list("pk", flat=True).distinct())
+
+
+@receiver(pre_delete, sender=Group, dispatch_uid="group.clear_token_cache")
+def clear_deleted_group_token_cache(sender, instance: Group, **kwargs) -> None:
+    clear_user_token_cache(instance.user_set.values_list("pk", flat=True))
@@ -0,0 +1,126 @@
+from unittest.mock import MagicMock, call, patch
+
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from ..authentication import CachedTokenAuthentication, _token_cache_key
+from ..metrics import token_cache_lookups
+from .factories import UserFactory
+
+
+@override_settings(API_TOKEN_CACHE_TIMEOUT=60)
+class CachedTokenAuthenticationTests(APITestCase):
+    path = reverse("producttype-list")
+
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory.create()
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+        self.view_permission = Permission.objects.get(codename="view_producttype")
+        self.user.user_permissions.add(self.view_permission)
+
+    def assertStatusCode(self, expected_code):
+        response = self.client.get(self.path)
+        self.assertEqual(response.status_code, expected_code)
+
+    @patch.object(token_cache_lookups, "add", wraps=token_cache_lookups.add)
+    def test_user_and_permissions_are_cached(self, mock_add: MagicMock):
+        self.assertStatusCode(status.HTTP_200_OK)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertStatusCode(status.HTTP_200_OK)
+
+        self.assertFalse(
+            any(
+                table in query["sql"]
+                for query in queries.captured_queries
+                for table in ("authtoken_token", "auth_permission")
+            )
+        )
+        self.assertEqual(
+            mock_add.call_args_list,
+            [
+                call(1, attributes={"result": "miss"}),
+                call(1, attributes={"result": "hit"}),
+            ],
+        )
+
+    def test_invalid_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token invalid")
+
+        self.assertStatusCode(status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_token(self):
+        self.assertStatusCode(status.HTTP_200_OK)
+
+        self.token.delete()
+
+        self.assertStatusCode(status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user(self):
+        self.assertStatusCode(status.HTTP_200_OK)
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertStatusCode(status.HTTP_401_UNAUTHORIZED)
+
+    def test_user_cached_before_the_commit(self):
+        cached = CachedTokenAuthentication().authenticate_credentials(self.token.key)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+            # e.g. by a request that doesn't see the change yet
+            cache.set(_token_cache_key(self.token.key), cached)
+
+        self.assertStatusCode(status.HTTP_401_UNAUTHORIZED)
+
+    def has_view_permission(self) -> bool:
+        user, _token = CachedTokenAuthentication().authenticate_credentials(
+            self.token.key
+        )
+        return user.has_perm("producttypen.view_producttype")
+
+    def test_removed_permission(self):
+        self.assertTrue(self.has_view_permission())
+
+        self.user.user_permissions.remove(self.view_permission)
+
+        self.assertFalse(self.has_view_permission())
+
+    def test_group_permissions(self):
+        self.user.user_permissions.clear()
+        group = Group.objects.create(name="producttypen")
+        self.assertFalse(self.has_view_permission())
+
+        with self.subTest("added group"):
+            group.permissions.add(self.view_permission)
+            self.user.groups.add(group)
+
+            self.assertTrue(self.has_view_permission())
+
+        with self.subTest("removed group permission"):
+            group.permissions.remove(self.view_permission)
+
+            self.assertFalse(self.has_view_permission())
+
+        with self.subTest("added group permission"):
+            self.view_permission.group_set.add(group)
+
+            self.assertTrue(self.has_view_permission())
+
+        with self.subTest("deleted group"):
+            group.delete()
+
+            self.assertFalse(self.has_view_permission())
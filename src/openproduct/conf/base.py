@@ -74,6 +74,46 @@ OIDC_CREATE_USER = config(
     ),
 )
 
+API_TOKEN_CACHE_TIMEOUT = config(
+    "API_TOKEN_CACHE_TIMEOUT",
+    default=60,
+    documentation=DocumentationParams(
+        help_text=(
+            "the number of seconds the user & permissions of an API token are cached. "
+            "``0`` disables the cache."
+        ),
+        group="Authentication",
+    ),
+)
+
+OIDC_TOKEN_CACHE_TIMEOUT = config(
+    "OIDC_TOKEN_CACHE_TIMEOUT",
+    default=300,
+    documentation=DocumentationParams(
+        help_text=(
+            "the number of seconds the user & claims of an OIDC access token are "
+            "cached, at most until the token expires, or at most 60 seconds for "
+            "opaque tokens. ``0`` disables the cache."
+        ),
+        group="Authentication",
+    ),
+)
+
+OIDC_VERIFY_ACCESS_TOKENS_LOCALLY = config(
+    "OIDC_VERIFY_ACCESS_TOKENS_LOCALLY",
+    default=False,
+    documentation=DocumentationParams(
+        help_text=(
+            "whether JWT access tokens are verified with the (cached) JSON Web Key Set "
+            "of the OIDC provider instead of its userinfo endpoint. The claims of the "
+            "user are read from the access token. The issuer must match the discovery "
+            "endpoint of the provider, which is required, and the audience or "
+            "authorized party must be the client ID."
+        ),
+        group="Authentication",
+    ),
+)
+
 #
 # CELERY
 #
@@ -86,13 +126,27 @@ CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 CELERY_BEAT_SCHEDULE = {
     "Update product statussen": {
         "task": "openproduct.producten.tasks.set_product_states",
-        "schedule": crontab(minute="0", hour="0"),
+        # hourly, the due products are found with an index
+        "schedule": crontab(minute="0"),
     },
     "Prune timeline logs": {
         "task": "openproduct.logging.tasks.prune_logs",
         "schedule": crontab(minute="0", hour="0", day_of_month="1"),
         "args": (PRUNE_LOGS_TASK_KEEP_DAYS,),
     },
+    "Create timeline log partitions": {
+        "task": "openproduct.logging.tasks.create_log_partitions",
+        "schedule": crontab(minute="0", hour="0", day_of_month="15"),
+    },
+    "Sync product indexes": {
+        "task": "openproduct.producten.tasks.sync_indexes",
+        "schedule": crontab(minute="0", hour="1"),
+    },
+    "Refresh OIDC key set": {
+        "task": "openproduct.utils.tasks.refresh_oidc_jwks",
+        # before the cached key set expires
+        "schedule": crontab(minute="*/15"),
+    },
 }
 
 #
@@ -151,7 +205,7 @@ REVERSION_COMPARE_IGNORE_NOT_REGISTERED = False
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "openproduct.utils.oidc_drf_middleware.OIDCAuthentication",
-        "rest_framework.authentication.TokenAuthentication",
+        "openproduct.accounts.authentication.CachedTokenAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.DjangoModelPermissions",
@@ -205,7 +259,7 @@ SPECTACULAR_SETTINGS = {  # TODO: may need to be expanded.
     "COMPONENT_SPLIT_REQUEST": True,
     "AUTHENTICATION_WHITELIST": [
         "openproduct.utils.oidc_drf_middleware.OIDCAuthentication",
-        "rest_framework.authentication.TokenAuthentication",
+        "openproduct.accounts.authentication.CachedTokenAuthentication",
     ],
     "GET_LIB_DOC_EXCLUDES": "openproduct.utils.spectacular.get_lib_doc_excludes",
 }
@@ -275,6 +329,63 @@ COMMONGROUND_API_COMMON = {
 }
 
 
+AUDIT_READ_MODE = config(
+    "AUDIT_READ_MODE",
+    default="event",
+    documentation=DocumentationParams(
+        help_text=(
+            "how reads are audited: ``event`` logs every read, ``aggregated`` logs the "
+            "number of reads per object, user and period. Writes are always logged "
+            "per event."
+        ),
+        group="Audit logging",
+    ),
+)
+AUDIT_READ_AGGREGATION_INTERVAL = config(
+    "AUDIT_READ_AGGREGATION_INTERVAL",
+    default=300,
+    documentation=DocumentationParams(
+        help_text="the length in seconds of the periods in which reads are aggregated.",
+        group="Audit logging",
+    ),
+)
+AUDIT_READ_AGGREGATION_FLUSH_INTERVAL = config(
+    "AUDIT_READ_AGGREGATION_FLUSH_INTERVAL",
+    default=60,
+    documentation=DocumentationParams(
+        help_text=(
+            "the number of seconds between the writes of the aggregated reads of a "
+            "process. The reads since the last write are lost when the process is "
+            "killed."
+        ),
+        group="Audit logging",
+    ),
+)
+AUDIT_READ_AGGREGATION_MAX_ENTRIES = config(
+    "AUDIT_READ_AGGREGATION_MAX_ENTRIES",
+    default=10000,
+    documentation=DocumentationParams(
+        help_text=(
+            "the number of aggregated reads a process keeps in memory before they "
+            "are written without waiting for the flush interval. The reads of a "
+            "failed write are dropped if they would exceed this number."
+        ),
+        group="Audit logging",
+    ),
+)
+AUDIT_READ_EVENT_MODELS = config(
+    "AUDIT_READ_EVENT_MODELS",
+    default=["producten.Product"],
+    split=True,
+    documentation=DocumentationParams(
+        help_text=(
+            "comma separated list of models (``app_label.ModelName``) of which every "
+            "read is logged, also when ``AUDIT_READ_MODE`` is ``aggregated``."
+        ),
+        group="Audit logging",
+    ),
+)
+
 JSONSCHEMA_USE_FORMAT_CHECKER = config(
     "JSONSCHEMA_USE_FORMAT_CHECKER",
     default=True,
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.15 on 2026-10-18 10:18
+
+import uuid
+from django.db import migrations, models
+
+from openproduct.utils.migration_operations import AlterFieldUniqueConcurrently
+
+
+class Migration(migrations.Migration):
+    # the unique indexes are created concurrently, which can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('locaties', '0003_alter_locatie_postcode_alter_organisatie_postcode'),
+    ]
+
+    operations = [
+        AlterFieldUniqueConcurrently(
+            model_name='contact',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        AlterFieldUniqueConcurrently(
+            model_name='locatie',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        AlterFieldUniqueConcurrently(
+            model_name='organisatie',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+    ]
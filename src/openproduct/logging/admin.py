@@ -27,7 +27,7 @@ class EventListFilter(SimpleListFilter):
         self, request: HttpRequest, queryset: models.QuerySet[TimelineLogProxy]
     ):
         if value := self.value():
-            return queryset.filter(extra_data__event=value)
+            return queryset.filter(_event=value)
         return queryset
 
 
@@ -43,15 +43,21 @@ class TimelineLogProxyAdmin(admin.ModelAdmin):
     )
     list_filter = ("timestamp", EventListFilter)
     ordering = ("-timestamp",)
+    # the annotated expressions have (trigram) indexes, the extra_data keys don't
     search_fields = (
-        "extra_data__acting_user__identifier",
-        "extra_data__acting_user__display_name",
-        "extra_data___cached_object_repr",
+        "_acting_user_identifier",
+        "_acting_user_display_name",
+        "_object_repr",
     )
     list_select_related = ("content_type", "user")
     date_hierarchy = "timestamp"
+    # counting all logs can't use the partition pruning of the filters
+    show_full_result_count = False
     readonly_fields = ("get_message",)
 
+    def get_queryset(self, request: HttpRequest):
+        return super().get_queryset(request).with_columns()
+
     def has_add_permission(self, request: HttpRequest):
         # Not even superusers are allowed to make changes
         return False
@@ -77,7 +83,7 @@ class TimelineLogProxyAdmin(admin.ModelAdmin):
         full_msg = strip_tags(self.full_message(obj))
         return Truncator(full_msg).chars(100) or gettext("(no message)")
 
-    @admin.display(description=_("event"), ordering="extra_data__event")
+    @admin.display(description=_("event"), ordering="_event")
     def show_event(self, obj: TimelineLogProxy) -> str:
         if (event := obj.event) == "unknown":
             return gettext("Unknown")
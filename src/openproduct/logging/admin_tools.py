@@ -13,6 +13,7 @@ from .logevent import (
     audit_admin_delete,
     audit_admin_read,
     audit_admin_update,
+    buffered_audit_events,
 )
 from .serializing import serialize_instance
 
@@ -23,11 +24,24 @@ class AdminAuditLogMixin:
     """
     Enable audit logging in the admin.
 
-    Add, change, delete and view action will be logged.
+    Add, change, delete and view action will be logged. The events of a request,
+    including those of the inlines, are written at the end of it.
     """
 
     model: type[models.Model]
 
+    def changeform_view(self, request, *args, **kwargs):
+        with buffered_audit_events():
+            return super().changeform_view(  # pyright: ignore[reportAttributeAccessIssue]
+                request, *args, **kwargs
+            )
+
+    def delete_view(self, request, *args, **kwargs):
+        with buffered_audit_events():
+            return super().delete_view(  # pyright: ignore[reportAttributeAccessIssue]
+                request, *args, **kwargs
+            )
+
     def log_addition(self, request, object, message):
         assert isinstance(request.user, User)
         audit_admin_create(
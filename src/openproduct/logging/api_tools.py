@@ -1,8 +1,10 @@
 from typing import Generic, TypeVar
 
+from django.db import transaction
 from django.db.models import Model
 
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.request import Request
 
 from .logevent import (
@@ -10,6 +12,7 @@ from .logevent import (
     audit_api_delete,
     audit_api_read,
     audit_api_update,
+    buffered_audit_events,
 )
 from .serializing import serialize_instance
 
@@ -145,5 +148,22 @@ class AuditTrailViewSetMixin(
     """
     Add support for audit trails.
 
-    This includes all the CRUD operations.
+    This includes all the CRUD operations. The audit log events of a request that
+    changes data are written at the end of it, in the same transaction as the changes.
+    The changes & events of a request with an error response are rolled back, since
+    DRF handles the exceptions that would otherwise do so.
     """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return super().dispatch(  # pyright: ignore[reportAttributeAccessIssue]
+                request, *args, **kwargs
+            )
+
+        with buffered_audit_events():
+            response = super().dispatch(  # pyright: ignore[reportAttributeAccessIssue]
+                request, *args, **kwargs
+            )
+            if response.status_code >= 400:
+                transaction.set_rollback(True)
+            return response
@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+import json
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import assert_never
 
-from django.db import models
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
 
 from openproduct.accounts.models import User
 
 from .constants import Events
 from .models import TimelineLogProxy
-from .typing import JSONObject, MetadataDict
+from .read_aggregation import read_aggregator, should_aggregate_reads
+from .serializing import get_delta, get_snapshot_policy
+from .typing import ActingUser, JSONObject, MetadataDict
 
 __all__ = [
+    "buffered_audit_events",
     # admin
     "audit_admin_create",
     "audit_admin_read",
@@ -22,18 +31,105 @@ __all__ = [
     "audit_api_update",
     "audit_api_delete",
     "audit_api_download",
+    "audit_api_bulk_create",
+    "audit_api_bulk_update",
+    # automation
+    "audit_automation_update",
+    "audit_automation_bulk_update",
 ]
 
 
-def _audit_event(
+# the maximum number of audit log entries with a delta after a full snapshot
+FULL_SNAPSHOT_INTERVAL = 10
+
+
+_buffer: ContextVar[list[TimelineLogProxy] | None] = ContextVar(
+    "audit_event_buffer", default=None
+)
+
+
+@contextmanager
+def buffered_audit_events() -> Iterator[None]:
+    """
+    Collect the audit log events of the block and write them with a single query
+    at the end of it.
+
+    The block is atomic and the events are written before it is committed, so the
+    events are stored if and only if the changes they describe are. If the block is
+    marked for rollback (see `transaction.set_rollback`), the events are discarded
+    along with the changes. The events are still validated when they are logged.
+    """
+    if _buffer.get() is not None:
+        yield
+        return
+
+    events = []
+    with transaction.atomic():
+        token = _buffer.set(events)
+        try:
+            yield
+        finally:
+            _buffer.reset(token)
+
+        if not transaction.get_rollback():
+            _write_buffered_audit_events(events)
+
+
+def _write_buffered_audit_events(events: list[TimelineLogProxy]) -> None:
+    content_object_field = TimelineLogProxy._meta.get_field("content_object")
+
+    # the representation of an object is cached once, from its last event
+    object_reprs = {}
+    for event in reversed(events):
+        key = (event.content_type_id, event.object_id)
+        if key not in object_reprs:
+            # the object of the event itself is used, since a deleted object can't
+            # be retrieved through the generic relation anymore
+            object_reprs[key] = str(content_object_field.get_cached_value(event))
+        event.extra_data["_cached_object_repr"] = object_reprs[key]
+        # only the type & id of the object are needed to write the event
+        content_object_field.delete_cached_value(event)
+
+    TimelineLogProxy.objects.bulk_create(events)
+
+
+def _write_audit_events(events: list[TimelineLogProxy]) -> None:
+    if (buffer := _buffer.get()) is None:
+        TimelineLogProxy.objects.bulk_create(events)
+        return
+
+    for event in events:
+        # validate the events where they are logged, the object representation is
+        # cached when the events are written
+        event.prepare(cache_object_repr=False)
+    buffer += events
+
+
+def _audit_event(**kwargs) -> None:
+    _write_audit_events([_build_audit_event(**kwargs)])
+
+
+def _bulk_audit_events(
     *,
-    content_object: models.Model,
-    event: Events,
-    user_id: str = "",
-    user_display: str = "",
-    django_user: User | None = None,
+    content_objects: Sequence[models.Model],
+    extra_data: Sequence[dict],
     **kwargs,
 ) -> None:
+    """
+    Log the same event for multiple objects in a single query, `extra_data` contains
+    the additional log data per object.
+    """
+    _write_audit_events(
+        [
+            _build_audit_event(content_object=content_object, **kwargs, **data)
+            for content_object, data in zip(content_objects, extra_data, strict=True)
+        ]
+    )
+
+
+def _get_acting_user(
+    user_id: str = "", user_display: str = "", django_user: User | None = None
+) -> ActingUser:
     if django_user is None and not (user_id and user_display):
         raise ValueError(
             "Provide either a Django user, or non-empty 'user_id' and 'user_display' "
@@ -56,15 +152,31 @@ def _audit_event(
         case _:  # pragma: no cover
             assert_never(django_user)
 
+    return {"identifier": identifier, "display_name": display_name}
+
+
+def _build_audit_event(
+    *,
+    content_object: models.Model,
+    event: Events,
+    user_id: str = "",
+    user_display: str = "",
+    django_user: User | None = None,
+    **kwargs,
+) -> TimelineLogProxy:
     metadata: MetadataDict = {
         "event": event,
-        "acting_user": {
-            "identifier": identifier,
-            "display_name": display_name,
-        },
+        "acting_user": _get_acting_user(user_id, user_display, django_user),
     }
 
-    TimelineLogProxy.objects.create(
+    if (
+        event == Events.update
+        and kwargs.get("object_data") is not None
+        and get_snapshot_policy(content_object).delta
+    ):
+        kwargs |= _get_object_data_delta(content_object, kwargs["object_data"])
+
+    return TimelineLogProxy(
         content_object=content_object,
         extra_data={
             **metadata,
@@ -74,6 +186,86 @@ def _audit_event(
     )
 
 
+def _get_object_data_delta(content_object: models.Model, object_data: JSONObject):
+    """
+    Replace the snapshot with the fields that changed since the previous audit log
+    entry of the object.
+
+    The previous state is rebuilt from the last full snapshot and the deltas after
+    it, including the entries that are buffered and not yet written. A full snapshot
+    is stored if there are too many deltas, so this only needs the last couple of
+    entries.
+    """
+    content_type = ContentType.objects.get_for_model(content_object)
+    object_id = str(content_object.pk)
+
+    pending = [
+        # the values as they will be stored, which doesn't change the buffered entry
+        json.loads(json.dumps(event.extra_data, cls=DjangoJSONEncoder))
+        for event in reversed(_buffer.get() or [])
+        if event.content_type_id == content_type.pk
+        and str(event.object_id) == object_id
+        and "object_data" in event.extra_data
+    ]
+    entries = [
+        *pending,
+        *TimelineLogProxy.objects.filter(
+            content_type=content_type,
+            object_id=object_id,
+            extra_data__has_key="object_data",
+        )
+        .order_by("-pk")
+        .values_list("extra_data", flat=True)[
+            : max(FULL_SNAPSHOT_INTERVAL - len(pending), 0)
+        ],
+    ][:FULL_SNAPSHOT_INTERVAL]
+
+    deltas = []
+    for extra_data in entries:
+        if extra_data.get("delta"):
+            deltas.append(extra_data["object_data"])
+            continue
+
+        previous = extra_data["object_data"]
+        for delta in reversed(deltas):
+            previous |= delta
+
+        # compare the values as they are stored
+        current = json.loads(json.dumps(object_data, cls=DjangoJSONEncoder))
+        return {"object_data": get_delta(previous, current), "delta": True}
+
+    return {}
+
+
+def _audit_read(
+    *,
+    content_object: models.Model,
+    user_id: str = "",
+    user_display: str = "",
+    django_user: User | None = None,
+    **kwargs,
+) -> None:
+    if not should_aggregate_reads(content_object):
+        _audit_event(
+            content_object=content_object,
+            event=Events.read,
+            user_id=user_id,
+            user_display=user_display,
+            django_user=django_user,
+            **kwargs,
+        )
+        return
+
+    # the reads are counted, so the remarks of a single read are not stored
+    acting_user = _get_acting_user(user_id, user_display, django_user)
+    read_aggregator.add(
+        content_object,
+        identifier=acting_user["identifier"],
+        display_name=acting_user["display_name"],
+        django_user_id=django_user.pk if django_user else None,
+    )
+
+
 # Admin tooling:
 
 
@@ -96,11 +288,7 @@ def audit_admin_read(
     content_object: models.Model,
     django_user: User,
 ) -> None:
-    _audit_event(
-        content_object=content_object,
-        event=Events.read,
-        django_user=django_user,
-    )
+    _audit_read(content_object=content_object, django_user=django_user)
 
 
 def audit_admin_update(
@@ -160,9 +348,8 @@ def audit_api_read(
     user_display: str,
     remarks: str,
 ) -> None:
-    _audit_event(
+    _audit_read(
         content_object=content_object,
-        event=Events.read,
         user_id=user_id,
         user_display=user_display,
         django_user=None,
@@ -225,6 +412,44 @@ def audit_api_download(
     )
 
 
+def audit_api_bulk_create(
+    *,
+    content_objects: Sequence[models.Model],
+    user_id: str,
+    user_display: str,
+    object_data: Sequence[JSONObject],
+    remarks: str,
+) -> None:
+    _bulk_audit_events(
+        content_objects=content_objects,
+        extra_data=[{"object_data": data} for data in object_data],
+        event=Events.create,
+        user_id=user_id,
+        user_display=user_display,
+        django_user=None,
+        remarks=remarks,
+    )
+
+
+def audit_api_bulk_update(
+    *,
+    content_objects: Sequence[models.Model],
+    user_id: str,
+    user_display: str,
+    object_data: Sequence[JSONObject],
+    remarks: str,
+) -> None:
+    _bulk_audit_events(
+        content_objects=content_objects,
+        extra_data=[{"object_data": data} for data in object_data],
+        event=Events.update,
+        user_id=user_id,
+        user_display=user_display,
+        django_user=None,
+        remarks=remarks,
+    )
+
+
 def audit_automation_update(
     content_object: models.Model,
     remarks: str,
@@ -237,3 +462,17 @@ def audit_automation_update(
         django_user=None,
         remarks=remarks,
     )
+
+
+def audit_automation_bulk_update(
+    content_objects: Sequence[models.Model],
+    remarks: Sequence[str],
+) -> None:
+    _bulk_audit_events(
+        content_objects=content_objects,
+        extra_data=[{"remarks": remark} for remark in remarks],
+        event=Events.update,
+        user_id="-",
+        user_display="Automation",
+        django_user=None,
+    )
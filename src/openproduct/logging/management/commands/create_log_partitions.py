@@ -0,0 +1,31 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from openproduct.logging.partitions import create_partitions
+from openproduct.logging.tasks import PARTITION_MONTHS_AHEAD
+
+
+class Command(BaseCommand):
+    help = "Create the monthly partitions of the audit log table ahead of time."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=PARTITION_MONTHS_AHEAD,
+            help="The number of months after the start month to create partitions for.",
+        )
+        parser.add_argument(
+            "--start",
+            type=date.fromisoformat,
+            help="The first month to create a partition for (default: this month).",
+        )
+
+    def handle(self, *args, **options):
+        created = create_partitions(options["months_ahead"], start=options["start"])
+
+        for name in created:
+            self.stdout.write(f"Created partition {name}")
+        if not created:
+            self.stdout.write("All partitions exist")
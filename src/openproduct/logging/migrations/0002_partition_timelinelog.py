@@ -0,0 +1,254 @@
+"""
+Partition the audit log table by month on the ``timestamp``, without copying it.
+
+The existing table becomes the historical partition of all logs before a cutoff a
+couple of months ahead, so the logs that are written while this runs still fit in
+it. A validated CHECK constraint proves that its rows fit in that range, so attaching
+it doesn't scan it. The monthly partitions start at the cutoff.
+
+Only the switch to the partitioned table runs in a transaction that blocks writes,
+and it only changes the catalog. The migration isn't atomic, so the unique index and
+the CHECK constraint are built beforehand without blocking writes.
+
+The table belongs to the ``timeline_logger`` package, whose migrations don't know that
+it's partitioned. A later migration of the package (e.g. ``AlterField`` or
+``AddIndex``) can fail on the partitioned table, so the package is pinned and
+``test_timeline_logger_migrations_are_known`` fails when it gets a new migration,
+which must then be checked against the partitioned table.
+"""
+
+from datetime import UTC, datetime
+
+from django.db import migrations
+from django.utils import timezone
+
+TABLE = "timeline_logger_timelinelog"
+DEFAULT_PARTITION = f"{TABLE}_default"
+HISTORICAL_PARTITION_PREFIX = f"{TABLE}_before_"
+
+# the last migration of the package that this migration takes into account
+TIMELINE_LOGGER_MIGRATION = ("timeline_logger", "0006_auto_20220413_0749")
+
+# the indexes of the historical partition are renamed, so the partitioned table gets
+# the names of the model
+HISTORICAL_INDEX_SUFFIX = "_hist"
+
+# the partitions after the cutoff that are created, the others are created by the
+# `create_log_partitions` task
+MONTHS_AFTER_CUTOFF = 2
+
+# the primary key of a partitioned table must contain the partition key, the ids are
+# still unique because they come from a single sequence
+UNIQUE_INDEX = f"{TABLE}_id_timestamp_uniq{HISTORICAL_INDEX_SUFFIX}"
+
+# a partition can't have its own primary key, the index of the primary key of the
+# table is built again when the partitioning is reversed
+PRIMARY_KEY_INDEX = f"{TABLE}_id_uniq{HISTORICAL_INDEX_SUFFIX}"
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    year, index = divmod(month.year * 12 + month.month - 1 + months, 12)
+    return datetime(year, index + 1, 1, tzinfo=UTC)
+
+
+def get_historical_partition(cursor) -> str | None:
+    cursor.execute(
+        """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+        JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+        WHERE parent.relname = %s AND child.relname LIKE %s
+        """,
+        [TABLE, f"{HISTORICAL_PARTITION_PREFIX}%"],
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def get_index_names(cursor, table: str) -> list[str]:
+    cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = %s", [table])
+    return [name for (name,) in cursor.fetchall()]
+
+
+def get_model_indexes_and_constraints(schema_editor, model) -> list[str]:
+    """
+    The indexes & foreign keys of the model, as Django creates them.
+    """
+    statements = []
+    for field in model._meta.local_fields:
+        statements += schema_editor._field_indexes_sql(model, field)
+        if field.remote_field and field.db_constraint:
+            statements.append(
+                schema_editor._create_fk_sql(
+                    model, field, "_fk_%(to_table)s_%(to_column)s"
+                )
+            )
+    return [str(statement) for statement in statements]
+
+
+def create_monthly_partition(cursor, month: datetime) -> None:
+    cursor.execute(
+        f"CREATE TABLE {TABLE}_p{month:%Y%m} PARTITION OF {TABLE} "
+        "FOR VALUES FROM (%s) TO (%s)",
+        [month, add_months(month, 1)],
+    )
+
+
+def partition_timelinelog(apps, schema_editor):
+    model = apps.get_model("timeline_logger", "TimelineLog")
+    connection = schema_editor.connection
+
+    # build the index & validate the constraint without blocking writes, the leftovers
+    # of an interrupted run are removed first
+    with connection.cursor() as cursor:
+        # the cutoff is after the logs with a timestamp in the future as well
+        cursor.execute(f'SELECT max("timestamp") FROM {TABLE}')
+        (last,) = cursor.fetchone()
+        last = max(last or timezone.now(), timezone.now())
+        cutoff = add_months(datetime(last.year, last.month, 1, tzinfo=UTC), 2)
+        historical = f"{HISTORICAL_PARTITION_PREFIX}{cutoff:%Y%m}"
+        check = f"{historical}_check"
+
+        cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {UNIQUE_INDEX}")
+        cursor.execute(f"ALTER TABLE {TABLE} DROP CONSTRAINT IF EXISTS {check}")
+        cursor.execute(
+            f'CREATE UNIQUE INDEX CONCURRENTLY {UNIQUE_INDEX} ON {TABLE} (id, "timestamp")'
+        )
+        cursor.execute(
+            f'ALTER TABLE {TABLE} ADD CONSTRAINT {check} CHECK ("timestamp" < %s) '
+            "NOT VALID",
+            [cutoff],
+        )
+        cursor.execute(f"ALTER TABLE {TABLE} VALIDATE CONSTRAINT {check}")
+
+    with connection.schema_editor(atomic=True) as editor, connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+        cursor.execute(f"SELECT coalesce(max(id), 0) FROM {TABLE}")
+        (max_id,) = cursor.fetchone()
+
+        cursor.execute(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'p'",
+            [TABLE],
+        )
+        for (primary_key,) in cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {TABLE} DROP CONSTRAINT {primary_key}")
+
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {historical}")
+        for name in get_index_names(cursor, historical):
+            if not name.endswith(HISTORICAL_INDEX_SUFFIX):
+                cursor.execute(
+                    f"ALTER INDEX {name} RENAME TO {name}{HISTORICAL_INDEX_SUFFIX}"
+                )
+        cursor.execute(
+            f"ALTER TABLE {historical} ADD CONSTRAINT {UNIQUE_INDEX} "
+            f"PRIMARY KEY USING INDEX {UNIQUE_INDEX}"
+        )
+
+        # the ids of all partitions come from the sequence of the partitioned table
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [historical])
+        (sequence,) = cursor.fetchone()
+        cursor.execute(f"ALTER TABLE {historical} ALTER COLUMN id DROP IDENTITY IF EXISTS")
+        cursor.execute(f"ALTER TABLE {historical} ALTER COLUMN id DROP DEFAULT")
+        if sequence:
+            cursor.execute(f"DROP SEQUENCE IF EXISTS {sequence}")
+
+        cursor.execute(
+            f"CREATE TABLE {TABLE} (LIKE {historical} INCLUDING DEFAULTS) "
+            'PARTITION BY RANGE ("timestamp")'
+        )
+        cursor.execute(f"CREATE SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id")
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{TABLE}_id_seq')"
+        )
+        cursor.execute(f"SELECT setval('{TABLE}_id_seq', %s + 1, false)", [max_id])
+        cursor.execute(
+            f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, "timestamp")'
+        )
+        for statement in get_model_indexes_and_constraints(editor, model):
+            cursor.execute(statement)
+
+        # the equivalent indexes & foreign keys of the historical partition are
+        # attached, and the CHECK constraint proves the range, so nothing is scanned
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ATTACH PARTITION {historical} "
+            "FOR VALUES FROM (MINVALUE) TO (%s)",
+            [cutoff],
+        )
+        cursor.execute(f"ALTER TABLE {historical} DROP CONSTRAINT {check}")
+
+        cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT")
+        for months in range(MONTHS_AFTER_CUTOFF):
+            create_monthly_partition(cursor, add_months(cutoff, months))
+
+
+def unpartition_timelinelog(apps, schema_editor):
+    """
+    Turn the historical partition back into the table, the logs of the other
+    partitions are copied into it.
+    """
+    model = apps.get_model("timeline_logger", "TimelineLog")
+    connection = schema_editor.connection
+
+    # build the index of the primary key without blocking writes
+    with connection.cursor() as cursor:
+        if historical := get_historical_partition(cursor):
+            cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {PRIMARY_KEY_INDEX}")
+            cursor.execute(
+                f"CREATE UNIQUE INDEX CONCURRENTLY {PRIMARY_KEY_INDEX} "
+                f"ON {historical} (id)"
+            )
+
+    with connection.schema_editor(atomic=True) as editor, connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+        cursor.execute(f"SELECT coalesce(max(id), 0) FROM {TABLE}")
+        (max_id,) = cursor.fetchone()
+
+        if historical:
+            cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {historical}")
+
+        cursor.execute(
+            "CREATE TEMPORARY TABLE timelinelog_partitions ON COMMIT DROP AS "
+            f"SELECT * FROM {TABLE}"
+        )
+        cursor.execute(f"DROP TABLE {TABLE}")
+
+        if historical:
+            cursor.execute(f"ALTER TABLE {historical} RENAME TO {TABLE}")
+            cursor.execute(f"ALTER TABLE {TABLE} DROP CONSTRAINT {UNIQUE_INDEX}")
+            cursor.execute(
+                f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey "
+                f"PRIMARY KEY USING INDEX {PRIMARY_KEY_INDEX}"
+            )
+            for name in get_index_names(cursor, TABLE):
+                if name.endswith(HISTORICAL_INDEX_SUFFIX):
+                    original = name.removesuffix(HISTORICAL_INDEX_SUFFIX)
+                    cursor.execute(f"ALTER INDEX {name} RENAME TO {original}")
+            cursor.execute(
+                f"ALTER TABLE {TABLE} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY"
+            )
+        else:
+            # the historical partition was pruned
+            editor.create_model(model)
+
+        cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM timelinelog_partitions")
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), %s + 1, false)",
+            [max_id],
+        )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("logging", "0001_initial"),
+        TIMELINE_LOGGER_MIGRATION,
+        ("accounts", "0001_initial"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_timelinelog, unpartition_timelinelog),
+    ]
@@ -0,0 +1,106 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+from django.db.backends.utils import truncate_name
+
+TABLE = "timeline_logger_timelinelog"
+
+# The package model can't get extra fields, so the extra data is indexed on the
+# expressions that the annotations of the proxy model use (see
+# ``TimelineLogProxyQuerySet.with_columns``), which doesn't rewrite the table.
+#
+# The admin search uses icontains, which compares UPPER(<expression>).
+INDEXES = {
+    "timelinelog_event_timestamp": """((extra_data ->> 'event'), "timestamp")""",
+    "timelinelog_acting_user_identifier": (
+        "((extra_data -> 'acting_user' ->> 'identifier'))"
+    ),
+    "timelinelog_acting_user_identifier_trgm": (
+        "USING gin (UPPER(extra_data -> 'acting_user' ->> 'identifier') gin_trgm_ops)"
+    ),
+    "timelinelog_acting_user_display_name_trgm": (
+        "USING gin (UPPER(extra_data -> 'acting_user' ->> 'display_name') gin_trgm_ops)"
+    ),
+    "timelinelog_object_repr_trgm": (
+        "USING gin (UPPER(extra_data ->> '_cached_object_repr') gin_trgm_ops)"
+    ),
+}
+
+
+def get_unindexed_partitions(cursor, index: str) -> list[str]:
+    """
+    The partitions without an index attached to the index of the partitioned table.
+    """
+    cursor.execute(
+        """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+        JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+        WHERE parent.relname = %s AND NOT EXISTS (
+            SELECT FROM pg_inherits index_inherits
+            JOIN pg_index ON pg_index.indexrelid = index_inherits.inhrelid
+            WHERE index_inherits.inhparent = %s::regclass
+            AND pg_index.indrelid = child.oid
+        )
+        """,
+        [TABLE, index],
+    )
+    return [name for (name,) in cursor.fetchall()]
+
+
+def is_valid_index(cursor, name: str) -> bool | None:
+    cursor.execute(
+        "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)", [name]
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def create_indexes(apps, schema_editor):
+    """
+    Create the indexes on the partitioned table only, and build them concurrently on
+    every partition, without blocking writes. The index of the partitioned table is
+    valid once the indexes of all partitions are attached to it.
+
+    Partitions that are created in the meantime get the indexes with the table, and
+    the partitions that have them are skipped when an interrupted run is repeated.
+    """
+    connection = schema_editor.connection
+    max_name_length = connection.ops.max_name_length()
+
+    with connection.cursor() as cursor:
+        for name, definition in INDEXES.items():
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {name} ON ONLY {TABLE} {definition}"
+            )
+
+            for partition in get_unindexed_partitions(cursor, name):
+                partition_index = truncate_name(f"{partition}_{name}", max_name_length)
+                # an interrupted concurrent build leaves an invalid index behind
+                if is_valid_index(cursor, partition_index) is False:
+                    cursor.execute(f"DROP INDEX CONCURRENTLY {partition_index}")
+
+                cursor.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} "
+                    f"ON {partition} {definition}"
+                )
+                cursor.execute(f"ALTER INDEX {name} ATTACH PARTITION {partition_index}")
+
+
+def drop_indexes(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for name in INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("logging", "0002_partition_timelinelog"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -20,7 +20,7 @@ class ModelOwnerMixin:
             self
         )
         try:
-            log = qs.get(extra_data__event=Events.create)
+            log = qs.with_columns().get(_event=Events.create)
         except TimelineLogProxy.DoesNotExist:
             return None
         assert isinstance(log, TimelineLogProxy)
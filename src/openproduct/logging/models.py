@@ -1,7 +1,10 @@
 from typing import Literal
 
+from django.db import models
+from django.db.models.expressions import RawSQL
 from django.utils.translation import gettext_lazy as _
 
+from timeline_logger.manager import TimelineLogManager
 from timeline_logger.models import TimelineLog
 
 from openproduct.accounts.models import User
@@ -9,6 +12,45 @@ from openproduct.accounts.models import User
 from .constants import Events
 from .typing import ActingUser, MetadataDict
 
+# the indexed expressions on the extra data, see migration logging/0003
+INDEXED_EXPRESSIONS = {
+    "event": "extra_data ->> 'event'",
+    "acting_user_identifier": "extra_data -> 'acting_user' ->> 'identifier'",
+    "acting_user_display_name": "extra_data -> 'acting_user' ->> 'display_name'",
+    "object_repr": "extra_data ->> '_cached_object_repr'",
+}
+
+
+class TimelineLogProxyQuerySet(models.QuerySet):
+    def with_columns(self):
+        """
+        Annotate the indexed expressions on the extra data.
+
+        Filter, search and order on these instead of the ``extra_data`` keys, so the
+        indexes can be used, since they only match the exact expressions. The
+        annotations are prefixed, since ``event`` is a property of the model.
+        """
+        table = TimelineLog._meta.db_table
+        return self.annotate(
+            **{
+                f"_{column}": RawSQL(
+                    f'"{table}".{expression}', (), output_field=models.TextField()
+                )
+                for column, expression in INDEXED_EXPRESSIONS.items()
+            }
+        )
+
+
+class TimelineLogProxyManager(
+    TimelineLogManager.from_queryset(TimelineLogProxyQuerySet)
+):
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create doesn't call save, so the checks need to be done here
+        objs = list(objs)
+        for obj in objs:
+            obj.prepare()
+        return super().bulk_create(objs, *args, **kwargs)
+
 
 class TimelineLogProxy(TimelineLog):
     """
@@ -22,12 +64,18 @@ class TimelineLogProxy(TimelineLog):
 
     extra_data: MetadataDict | None
 
+    objects = TimelineLogProxyManager()
+
     class Meta:  # pyright: ignore
         proxy = True
         verbose_name = _("(audit) log entry")
         verbose_name_plural = _("(audit) log entries")
 
     def save(self, *args, **kwargs):
+        self.prepare()
+        super().save(*args, **kwargs)
+
+    def prepare(self, cache_object_repr: bool = True) -> None:
         # there's a setting for this, but then makemigrations produces a new migration
         # in the third party package which is less than ideal...
         if self.template == "timeline_logger/default.txt":
@@ -42,9 +90,8 @@ class TimelineLogProxy(TimelineLog):
         self._validate_event()
         # ensure that we always track the acting user
         self._validate_user_details()
-        self._cache_object_repr()
-
-        super().save(*args, **kwargs)
+        if cache_object_repr:
+            self._cache_object_repr()
 
     def _cache_object_repr(self) -> None:
         # cache the object representation so we can avoid querying the content_object
@@ -52,6 +99,9 @@ class TimelineLogProxy(TimelineLog):
         assert self.extra_data is not None
         if not self.object_id or not self.content_type_id:
             return
+        # the representation of buffered events is cached before they are written
+        if "_cached_object_repr" in self.extra_data:
+            return
         self.extra_data["_cached_object_repr"] = str(self.content_object)
 
     def _validate_event(self):
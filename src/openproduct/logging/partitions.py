@@ -0,0 +1,189 @@
+"""
+The audit log table is partitioned by month on the `timestamp`, so old logs can be
+pruned by dropping whole partitions instead of deleting rows.
+
+The logs from before the partitioning are kept in the historical partition, which is
+the original table, until it can be dropped as a whole. Logs outside of the historical & monthly partitions end up in the
+default partition, which should stay empty by creating the partitions ahead of time.
+"""
+
+import re
+from datetime import UTC, date, datetime
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+import structlog
+from timeline_logger.models import TimelineLog
+
+logger = structlog.stdlib.get_logger(__name__)
+
+TABLE = TimelineLog._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+PARTITION_NAME_RE = re.compile(rf"^{TABLE}_p(?P<year>\d{{4}})(?P<month>\d{{2}})$")
+HISTORICAL_PARTITION_NAME_RE = re.compile(
+    rf"^{TABLE}_before_(?P<year>\d{{4}})(?P<month>\d{{2}})$"
+)
+
+
+def add_months(month: date, months: int) -> date:
+    year, index = divmod(month.year * 12 + month.month - 1 + months, 12)
+    return date(year, index + 1, 1)
+
+
+def start_of(month: date) -> datetime:
+    return datetime(month.year, month.month, 1, tzinfo=UTC)
+
+
+def get_partition_name(month: date) -> str:
+    return f"{TABLE}_p{month.year}{month.month:02d}"
+
+
+def _get_partitions(name_re: re.Pattern) -> dict[str, date]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+            JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+            WHERE parent.relname = %s
+            """,
+            [TABLE],
+        )
+        names = [name for (name,) in cursor.fetchall()]
+
+    return {
+        name: date(int(match["year"]), int(match["month"]), 1)
+        for name in names
+        if (match := name_re.match(name))
+    }
+
+
+def get_partitions() -> dict[str, date]:
+    """
+    The monthly partitions by name, with the first day of their month.
+    """
+    return _get_partitions(PARTITION_NAME_RE)
+
+
+def get_historical_partition() -> tuple[str, date] | None:
+    """
+    The historical partition with the first day of the month it ends at, if it
+    wasn't dropped.
+    """
+    return next(iter(_get_partitions(HISTORICAL_PARTITION_NAME_RE).items()), None)
+
+
+def _move_default_partition_logs(name: str, month: date) -> int:
+    """
+    Create the partition of the month from the logs in the default partition, which
+    can't be created as a partition of the table while they're there.
+    """
+    bounds = [start_of(month), start_of(add_months(month, 1))]
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS)")
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE "timestamp" >= %s AND "timestamp" < %s
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+            """,
+            bounds,
+        )
+        moved = cursor.rowcount
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)",
+            bounds,
+        )
+
+    return moved
+
+
+def create_partitions(months_ahead: int, start: date | None = None) -> list[str]:
+    """
+    Create the missing partitions from the month of `start` (default: this month)
+    up to and including `months_ahead` months after it.
+
+    The logs of these months in the default partition are moved to their partition.
+    """
+    first_month = (start or timezone.now().date()).replace(day=1)
+    existing = get_partitions()
+    historical = get_historical_partition()
+
+    created = []
+    for months in range(months_ahead + 1):
+        month = add_months(first_month, months)
+        if (name := get_partition_name(month)) in existing:
+            continue
+        # the month is part of the historical partition
+        if historical and month < historical[1]:
+            continue
+
+        bounds = [start_of(month), start_of(add_months(month, 1))]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT EXISTS (SELECT FROM {DEFAULT_PARTITION} "
+                'WHERE "timestamp" >= %s AND "timestamp" < %s)',
+                bounds,
+            )
+            (in_default_partition,) = cursor.fetchone()
+
+            if not in_default_partition:
+                cursor.execute(
+                    f"CREATE TABLE {name} PARTITION OF {TABLE} "
+                    "FOR VALUES FROM (%s) TO (%s)",
+                    bounds,
+                )
+
+        if in_default_partition:
+            moved = _move_default_partition_logs(name, month)
+            logger.warning(
+                "timeline_log_default_partition_logs_moved",
+                partition=name,
+                count=moved,
+            )
+
+        logger.info("timeline_log_partition_created", partition=name)
+        created.append(name)
+
+    return created
+
+
+def _drop_partition(name: str) -> None:
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {name}")
+        cursor.execute(f"DROP TABLE {name}")
+    logger.info("timeline_log_partition_dropped", partition=name)
+
+
+def drop_partitions(before: datetime) -> list[str]:
+    """
+    Detach & drop the partitions that only contain logs from before `before`.
+
+    The historical partition is kept as a whole until all of its logs are from before
+    `before`, since deleting rows from it would rewrite the original table. Logs from
+    before `before` in the default partition, which is normally empty, are deleted.
+    """
+    dropped = []
+    for name, month in sorted(get_partitions().items(), key=lambda item: item[1]):
+        if start_of(add_months(month, 1)) > before:
+            continue
+
+        _drop_partition(name)
+        dropped.append(name)
+
+    if (historical := get_historical_partition()) and start_of(historical[1]) <= before:
+        _drop_partition(historical[0])
+        dropped.append(historical[0])
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {DEFAULT_PARTITION} WHERE "timestamp" < %s', [before]
+        )
+
+    return dropped
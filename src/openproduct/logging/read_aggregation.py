@@ -0,0 +1,189 @@
+import atexit
+import os
+import threading
+from datetime import UTC, datetime, timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import close_old_connections, models
+from django.utils import timezone
+
+import structlog
+
+from .constants import Events
+from .models import TimelineLogProxy
+
+logger = structlog.stdlib.get_logger(__name__)
+
+__all__ = ["read_aggregator", "should_aggregate_reads"]
+
+
+def should_aggregate_reads(content_object: models.Model) -> bool:
+    return (
+        settings.AUDIT_READ_MODE == "aggregated"
+        and content_object._meta.label not in settings.AUDIT_READ_EVENT_MODELS
+    )
+
+
+class ReadAggregator:
+    """
+    Count the reads per object, acting user & period in memory and write them as
+    audit log entries with the number of reads.
+
+    The counts are written by a thread of the process every
+    `AUDIT_READ_AGGREGATION_FLUSH_INTERVAL` seconds, outside of the requests and
+    their transactions, which is also when the representations of the objects are
+    cached. They are written sooner when the number of combinations exceeds
+    `AUDIT_READ_AGGREGATION_MAX_ENTRIES`, and when the process exits. The reads of
+    a period can be written in several entries. A process that is killed loses the
+    reads since the last write, writes are always logged per event.
+
+    The counts of a failed write are kept for the next one, unless that would
+    exceed `AUDIT_READ_AGGREGATION_MAX_ENTRIES`, then they are dropped.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts: dict[tuple, int] = {}
+        self.flush_requested = threading.Event()
+        # threads don't survive a fork, so each (forked) process starts its own
+        self.flusher_pid: int | None = None
+
+    def get_period_start(self, now: datetime) -> datetime:
+        interval = settings.AUDIT_READ_AGGREGATION_INTERVAL
+        timestamp = now.timestamp() // interval * interval
+        return datetime.fromtimestamp(timestamp, tz=UTC)
+
+    def add(
+        self,
+        content_object: models.Model,
+        identifier: int | str,
+        display_name: str,
+        django_user_id: int | None,
+    ) -> None:
+        key = (
+            self.get_period_start(timezone.now()),
+            ContentType.objects.get_for_model(content_object).pk,
+            str(content_object.pk),
+            identifier,
+            display_name,
+            django_user_id,
+        )
+
+        with self.lock:
+            if self.flusher_pid != os.getpid():
+                self.flusher_pid = os.getpid()
+                self.start_flusher()
+
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+            if len(self.counts) >= settings.AUDIT_READ_AGGREGATION_MAX_ENTRIES:
+                self.flush_requested.set()
+
+    def start_flusher(self) -> None:
+        threading.Thread(
+            target=self.run_flusher, name="read-aggregation-flusher", daemon=True
+        ).start()
+
+    def run_flusher(self) -> None:
+        while True:
+            self.flush_requested.wait(settings.AUDIT_READ_AGGREGATION_FLUSH_INTERVAL)
+            self.flush_requested.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("aggregated_reads_flush_failed")
+            finally:
+                # the thread has its own database connection
+                close_old_connections()
+
+    def flush(self) -> None:
+        with self.lock:
+            counts, self.counts = self.counts, {}
+
+        if not counts:
+            return
+
+        try:
+            self.write(counts)
+        except Exception:
+            with self.lock:
+                # the memory is bounded while the counts can't be written
+                if (
+                    len(self.counts.keys() | counts.keys())
+                    > settings.AUDIT_READ_AGGREGATION_MAX_ENTRIES
+                ):
+                    logger.error(
+                        "aggregated_reads_dropped",
+                        entries=len(counts),
+                        reads=sum(counts.values()),
+                    )
+                else:
+                    for key, count in counts.items():
+                        self.counts[key] = self.counts.get(key, 0) + count
+            raise
+
+    def get_object_reprs(self, counts: dict[tuple, int]) -> dict[tuple[int, str], str]:
+        """
+        The representations of the objects of the counts by content type & object
+        id, an object that was deleted since it was read has an empty one.
+        """
+        object_ids: dict[int, set[str]] = {}
+        for _, content_type_id, object_id, *__ in counts:
+            object_ids.setdefault(content_type_id, set()).add(object_id)
+
+        object_reprs = {}
+        for content_type_id, ids in object_ids.items():
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            assert model is not None
+            objects = model._base_manager.in_bulk(ids)
+            object_reprs |= {
+                (content_type_id, str(pk)): str(obj) for pk, obj in objects.items()
+            }
+        return object_reprs
+
+    def write(self, counts: dict[tuple, int]) -> None:
+        interval = timedelta(seconds=settings.AUDIT_READ_AGGREGATION_INTERVAL)
+        object_reprs = self.get_object_reprs(counts)
+
+        TimelineLogProxy.objects.bulk_create(
+            TimelineLogProxy(
+                content_type_id=content_type_id,
+                object_id=object_id,
+                user_id=django_user_id,
+                extra_data={
+                    "event": Events.read,
+                    "acting_user": {
+                        "identifier": identifier,
+                        "display_name": display_name,
+                    },
+                    "_cached_object_repr": object_reprs.get(
+                        (content_type_id, object_id), ""
+                    ),
+                    "read_count": count,
+                    "period": {
+                        "start": period_start.isoformat(),
+                        "end": (period_start + interval).isoformat(),
+                    },
+                },
+            )
+            for (
+                period_start,
+                content_type_id,
+                object_id,
+                identifier,
+                display_name,
+                django_user_id,
+            ), count in counts.items()
+        )
+
+
+read_aggregator = ReadAggregator()
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        read_aggregator.flush()
+    except Exception:
+        logger.exception("aggregated_reads_flush_failed")
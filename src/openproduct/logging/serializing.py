@@ -1,20 +1,87 @@
+from collections.abc import Collection
+from dataclasses import dataclass
 from itertools import chain
 
 from django.db import models
 
+from .typing import JSONObject
 
-def model_to_dict(instance):
+
+@dataclass(frozen=True)
+class SnapshotPolicy:
+    """
+    Determines what is stored of an instance in the audit log.
+
+    * `fields`: the fields & relations that are serialized, all of them if `None`
+    * `max_depth`: the number of levels of reverse relations that are serialized
+    * `ids_only`: the reverse relations of which only the primary keys are serialized,
+      for relations that can have many objects
+    * `delta`: store only the fields that changed since the previous audit log entry
+      of an update
+    """
+
+    fields: Collection[str] | None = None
+    max_depth: int = 1
+    ids_only: Collection[str] = ()
+    delta: bool = False
+
+
+DEFAULT_SNAPSHOT_POLICY = SnapshotPolicy()
+
+SNAPSHOT_POLICIES = {
+    "producttypen.ProductType": SnapshotPolicy(
+        ids_only=(
+            "producten",
+            "prijzen",
+            "content_elementen",
+            "producttype_permissions",
+        ),
+        delta=True,
+    ),
+    "producttypen.Thema": SnapshotPolicy(
+        ids_only=("sub_themas", "producttypen", "content_elementen")
+    ),
+    "producttypen.UniformeProductNaam": SnapshotPolicy(ids_only=("producttypen",)),
+    "producttypen.JsonSchema": SnapshotPolicy(
+        ids_only=(
+            "producttypen_verbruiksobject_schemas",
+            "producttypen_dataobject_schemas",
+        )
+    ),
+    "producttypen.DmnConfig": SnapshotPolicy(ids_only=("acties", "prijsregels")),
+    "producttypen.ContentLabel": SnapshotPolicy(ids_only=("content_elementen",)),
+    "locaties.Locatie": SnapshotPolicy(ids_only=("producttypen",)),
+    "locaties.Organisatie": SnapshotPolicy(
+        ids_only=("producttypen", "product_contacten")
+    ),
+    "locaties.Contact": SnapshotPolicy(ids_only=("producttypen",)),
+}
+
+
+def get_snapshot_policy(model: type[models.Model] | models.Model) -> SnapshotPolicy:
+    return SNAPSHOT_POLICIES.get(model._meta.label, DEFAULT_SNAPSHOT_POLICY)
+
+
+def model_to_dict(instance, max_depth: int | None = None):
     """
     Modified version of django.forms.model_to_dict.
 
     * it doesn't skip non-editable fields
     * it serializes related objects to their PK instead of passing model instances
     * it serializers FileField objects to their filename
-    * it serializers ManyToOneRel fields recursively
+    * it serializers ManyToOneRel fields recursively, up to the `max_depth` of the
+      snapshot policy
     """
+    policy = get_snapshot_policy(instance)
+    if max_depth is None:
+        max_depth = policy.max_depth
+
     opts = instance._meta
     data = {}
     for f in chain(opts.concrete_fields, opts.private_fields, opts.many_to_many):
+        if policy.fields is not None and f.name not in policy.fields:
+            continue
+
         value = f.value_from_object(instance)
         match f:
             case models.ManyToManyField():
@@ -25,14 +92,39 @@ def model_to_dict(instance):
                 pass
         data[f.name] = value
 
+    if max_depth < 1:
+        return data
+
     for obj in opts.related_objects:
-        manager = getattr(instance, obj.related_name, None)
+        related_name = obj.get_accessor_name()
+        if policy.fields is not None and related_name not in policy.fields:
+            continue
+
+        manager = getattr(instance, related_name, None)
 
         if manager is None:
             continue
 
-        data[obj.related_name] = [
-            model_to_dict(instance) for instance in manager.iterator(chunk_size=1000)
+        # use the prefetched objects, so a batch of instances can be serialized
+        # without a query per relation
+        prefetched = getattr(instance, "_prefetched_objects_cache", {})
+
+        if related_name in policy.ids_only:
+            data[related_name] = (
+                [related.pk for related in manager.all()]
+                if related_name in prefetched
+                else list(manager.values_list("pk", flat=True))
+            )
+            continue
+
+        related = (
+            manager.all()
+            if related_name in prefetched
+            else manager.iterator(chunk_size=1000)
+        )
+
+        data[related_name] = [
+            model_to_dict(instance, max_depth=max_depth - 1) for instance in related
         ]
 
     return data
@@ -40,3 +132,14 @@ def model_to_dict(instance):
 
 def serialize_instance(instance: models.Model):
     return model_to_dict(instance)
+
+
+def get_delta(previous: JSONObject, current: JSONObject) -> JSONObject:
+    """
+    The fields of the `current` snapshot that differ from the `previous` snapshot.
+    """
+    return {
+        name: value
+        for name, value in current.items()
+        if name not in previous or previous[name] != value
+    }
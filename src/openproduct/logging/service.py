@@ -12,12 +12,16 @@ from .logevent import (
     audit_admin_delete,
     audit_admin_read,
     audit_admin_update,
+    audit_api_bulk_create,
+    audit_api_bulk_update,
     audit_api_create,
     audit_api_delete,
     audit_api_download,
     audit_api_read,
     audit_api_update,
+    audit_automation_bulk_update,
     audit_automation_update,
+    buffered_audit_events,
 )
 from .mixins import ModelOwnerMixin
 
@@ -45,8 +49,12 @@ __all__ = [
     "audit_api_update",
     "audit_api_delete",
     "audit_api_download",
+    "audit_api_bulk_create",
+    "audit_api_bulk_update",
     # * automation
     "audit_automation_update",
+    "audit_automation_bulk_update",
+    "buffered_audit_events",
     # Model
     "ModelOwnerMixin",
 ]
@@ -1,8 +1,20 @@
-from django.core.management import call_command
+from datetime import timedelta
+
+from django.utils import timezone
 
 from openproduct.celery import app
 
+from .partitions import create_partitions, drop_partitions
+
+# the number of months after the current month for which partitions are created
+PARTITION_MONTHS_AHEAD = 3
+
 
 @app.task
 def prune_logs(keep_days):
-    call_command("prune_timeline_logs", keep_days=keep_days)
+    drop_partitions(before=timezone.now() - timedelta(days=keep_days))
+
+
+@app.task
+def create_log_partitions():
+    create_partitions(months_ahead=PARTITION_MONTHS_AHEAD)
@@ -1,9 +1,19 @@
+from unittest.mock import patch
+
 from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import exceptions, status
 
+from openproduct.accounts.models import User
 from openproduct.accounts.tests.factories import UserFactory
+from openproduct.producten.tests.factories import ProductFactory
+from openproduct.producttypen.tests.factories import ThemaFactory
+from openproduct.utils.tests.cases import BaseApiTestCase
 
 from ..constants import Events
-from ..logevent import _audit_event
+from ..logevent import _audit_event, audit_api_update, buffered_audit_events
+from ..models import TimelineLogProxy
 
 
 class LogEventTests(TestCase):
@@ -45,3 +55,123 @@ class LogEventTests(TestCase):
                 user_id="",
                 user_display="bar",
             )
+
+
+class BufferedAuditEventsTests(TestCase):
+    def audit_read(self, content_object):
+        _audit_event(
+            content_object=content_object,
+            event=Events.read,
+            user_id="123",
+            user_display="Foo",
+        )
+
+    def test_events_are_written_at_the_end_of_the_block(self):
+        users = UserFactory.create_batch(3)
+
+        with buffered_audit_events():
+            for user in users:
+                self.audit_read(user)
+
+            self.assertFalse(TimelineLogProxy.objects.exists())
+
+        self.assertEqual(TimelineLogProxy.objects.count(), 3)
+
+    def test_events_are_written_with_one_query(self):
+        users = UserFactory.create_batch(3)
+
+        with self.assertNumQueries(3):  # savepoint, insert & release
+            with buffered_audit_events():
+                for user in users:
+                    self.audit_read(user)
+
+    def test_events_are_not_written_if_the_block_fails(self):
+        user = UserFactory.create()
+
+        with self.assertRaises(RuntimeError), buffered_audit_events():
+            self.audit_read(user)
+            raise RuntimeError
+
+        self.assertFalse(TimelineLogProxy.objects.exists())
+
+    def test_events_are_validated_when_they_are_logged(self):
+        user = UserFactory.create()
+
+        with buffered_audit_events(), self.assertRaises(ValueError):
+            _audit_event(
+                content_object=user, event="unknown", user_id="1", user_display="a"
+            )
+
+    def test_object_repr_is_cached_once_per_object_when_written(self):
+        user = UserFactory.create(username="before")
+
+        with (
+            patch.object(
+                User, "__str__", autospec=True, side_effect=lambda user: user.username
+            ) as mock_str,
+            buffered_audit_events(),
+        ):
+            self.audit_read(user)
+            user.username = "after"
+            user.save()
+            self.audit_read(user)
+
+            mock_str.assert_not_called()
+
+        mock_str.assert_called_once()
+        self.assertEqual(
+            [log.get_related_object_repr() for log in TimelineLogProxy.objects.all()],
+            ["after", "after"],
+        )
+
+    def test_object_repr_of_deleted_object(self):
+        user = UserFactory.create(username="deleted")
+
+        with buffered_audit_events():
+            self.audit_read(user)
+            user.delete()
+
+        self.assertEqual(
+            TimelineLogProxy.objects.get().get_related_object_repr(), "deleted"
+        )
+
+
+class AuditTrailViewSetTests(BaseApiTestCase):
+    is_superuser = True
+
+    def test_only_requests_that_change_data_are_buffered(self):
+        product = ProductFactory.create()
+        path = reverse("product-detail", args=(product.uuid,))
+
+        with patch(
+            "openproduct.logging.api_tools.buffered_audit_events",
+            wraps=buffered_audit_events,
+        ) as mock_buffered:
+            response = self.client.get(path)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            mock_buffered.assert_not_called()
+
+            response = self.client.delete(path)
+
+            self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+            mock_buffered.assert_called_once()
+
+    def test_changes_and_events_are_rolled_back_if_the_request_fails(self):
+        thema = ThemaFactory.create(naam="before")
+        path = reverse("thema-detail", args=(thema.uuid,))
+
+        def audit_and_fail(**kwargs):
+            audit_api_update(**kwargs)
+            raise exceptions.APIException("failed after logging")
+
+        with patch(
+            "openproduct.logging.api_tools.audit_api_update",
+            side_effect=audit_and_fail,
+        ):
+            response = self.client.patch(path, {"naam": "after"})
+
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertFalse(TimelineLogProxy.objects.exists())
+        thema.refresh_from_db()
+        self.assertEqual(thema.naam, "before")
@@ -0,0 +1,158 @@
+from datetime import UTC, date, datetime
+from importlib import import_module
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.test import TestCase
+
+from freezegun import freeze_time
+from structlog.testing import capture_logs
+
+from openproduct.accounts.tests.factories import UserFactory
+
+from ..constants import Events
+from ..logevent import audit_admin_read
+from ..models import TimelineLogProxy
+from ..partitions import (
+    DEFAULT_PARTITION,
+    TABLE,
+    create_partitions,
+    drop_partitions,
+    get_historical_partition,
+    get_partition_name,
+    get_partitions,
+)
+from ..tasks import prune_logs
+
+partition_migration = import_module(
+    "openproduct.logging.migrations.0002_partition_timelinelog"
+)
+
+
+def get_partition_of_log(log: TimelineLogProxy) -> str:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT tableoid::regclass::text FROM {TABLE} WHERE id = %s", [log.pk]
+        )
+        return cursor.fetchone()[0]
+
+
+class PartitionTests(TestCase):
+    def test_timeline_logger_migrations_are_known(self):
+        # a new migration of the package must be checked against the partitioned
+        # table, see the partitioning migration
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+
+        self.assertEqual(
+            loader.graph.leaf_nodes("timeline_logger"),
+            [partition_migration.TIMELINE_LOGGER_MIGRATION],
+        )
+
+    def create_log(self, timestamp: datetime) -> TimelineLogProxy:
+        user = UserFactory.create()
+        with freeze_time(timestamp):
+            audit_admin_read(content_object=user, django_user=user)
+        return TimelineLogProxy.objects.order_by("pk").last()
+
+    def test_create_partitions(self):
+        created = create_partitions(2, start=date(2100, 11, 20))
+
+        self.assertEqual(
+            created,
+            [f"{TABLE}_p210011", f"{TABLE}_p210012", f"{TABLE}_p210101"],
+        )
+        self.assertEqual(get_partitions()[f"{TABLE}_p210012"], date(2100, 12, 1))
+        self.assertEqual(create_partitions(2, start=date(2100, 11, 1)), [])
+
+    def test_logs_are_stored_in_the_partition_of_their_month(self):
+        create_partitions(1, start=date(2100, 1, 1))
+
+        log = self.create_log(datetime(2100, 1, 31, 23, 59, tzinfo=UTC))
+        other_log = self.create_log(datetime(2100, 2, 1, tzinfo=UTC))
+        default_log = self.create_log(datetime(2099, 12, 31, tzinfo=UTC))
+
+        self.assertEqual(get_partition_of_log(log), f"{TABLE}_p210001")
+        self.assertEqual(get_partition_of_log(other_log), f"{TABLE}_p210002")
+        self.assertEqual(get_partition_of_log(default_log), DEFAULT_PARTITION)
+        self.assertEqual(log.event, Events.read)
+
+    def test_logs_before_the_partitioning_are_stored_in_the_historical_partition(self):
+        historical, end = get_historical_partition()
+        log = self.create_log(datetime(2020, 1, 1, tzinfo=UTC))
+
+        self.assertEqual(get_partition_of_log(log), historical)
+        # the monthly partitions start at the end of the historical partition
+        self.assertNotIn(get_partition_name(date(2020, 1, 1)), get_partitions())
+        self.assertEqual(create_partitions(0, start=date(2020, 1, 1)), [])
+        self.assertIn(get_partition_name(end), get_partitions())
+
+    def test_create_partitions_moves_the_logs_in_the_default_partition(self):
+        log = self.create_log(datetime(2100, 1, 15, tzinfo=UTC))
+        other_log = self.create_log(datetime(2100, 2, 15, tzinfo=UTC))
+
+        with capture_logs() as logs:
+            create_partitions(0, start=date(2100, 1, 1))
+
+        self.assertEqual(get_partition_of_log(log), f"{TABLE}_p210001")
+        self.assertEqual(get_partition_of_log(other_log), DEFAULT_PARTITION)
+        self.assertEqual(set(TimelineLogProxy.objects.all()), {log, other_log})
+        self.assertIn(
+            {
+                "event": "timeline_log_default_partition_logs_moved",
+                "partition": f"{TABLE}_p210001",
+                "count": 1,
+                "log_level": "warning",
+            },
+            logs,
+        )
+
+    def test_drop_partitions_keeps_the_historical_partition(self):
+        old_log = self.create_log(datetime(2020, 1, 15, tzinfo=UTC))
+        log = self.create_log(datetime(2020, 3, 15, tzinfo=UTC))
+
+        self.assertEqual(drop_partitions(datetime(2020, 2, 1, tzinfo=UTC)), [])
+
+        self.assertIsNotNone(get_historical_partition())
+        self.assertEqual(set(TimelineLogProxy.objects.all()), {old_log, log})
+
+    @freeze_time("2100-04-10")
+    def test_prune_logs_drops_expired_partitions(self):
+        create_partitions(3, start=date(2100, 1, 1))
+        self.create_log(datetime(2020, 1, 1, tzinfo=UTC))
+        self.create_log(datetime(2099, 12, 1, tzinfo=UTC))
+        self.create_log(datetime(2100, 1, 15, tzinfo=UTC))
+        february_log = self.create_log(datetime(2100, 2, 15, tzinfo=UTC))
+        march_log = self.create_log(datetime(2100, 3, 15, tzinfo=UTC))
+
+        # a partition with pending foreign key checks can't be dropped
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+        # keep everything after 2100-02-10
+        prune_logs(keep_days=60)
+
+        partitions = get_partitions()
+        self.assertNotIn(f"{TABLE}_p210001", partitions)
+        self.assertIsNone(get_historical_partition())
+        self.assertIn(f"{TABLE}_p210002", partitions)
+        self.assertEqual(set(TimelineLogProxy.objects.all()), {february_log, march_log})
+
+    def test_create_log_partitions_command(self):
+        stdout = StringIO()
+
+        call_command(
+            "create_log_partitions",
+            "--months-ahead=1",
+            "--start=2100-05-01",
+            stdout=stdout,
+        )
+
+        self.assertEqual(
+            stdout.getvalue().splitlines(),
+            [
+                f"Created partition {TABLE}_p210005",
+                f"Created partition {TABLE}_p210006",
+            ],
+        )
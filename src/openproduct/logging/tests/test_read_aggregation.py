@@ -0,0 +1,210 @@
+import threading
+from unittest.mock import patch
+
+from django.test import override_settings
+from django.urls import reverse
+
+from freezegun import freeze_time
+from rest_framework import status
+from structlog.testing import capture_logs
+
+from openproduct.accounts.models import User
+from openproduct.producten.tests.factories import ProductFactory
+from openproduct.producttypen.models import ProductType
+from openproduct.producttypen.tests.factories import ProductTypeFactory
+from openproduct.utils.tests.cases import BaseApiTestCase
+
+from ..constants import Events
+from ..models import TimelineLogProxy
+from ..read_aggregation import ReadAggregator, read_aggregator
+
+
+@override_settings(
+    AUDIT_READ_MODE="aggregated",
+    AUDIT_READ_AGGREGATION_INTERVAL=300,
+    AUDIT_READ_EVENT_MODELS=["producten.Product"],
+)
+class AggregatedReadsTests(BaseApiTestCase):
+    is_superuser = True
+
+    def setUp(self):
+        super().setUp()
+        read_aggregator.counts.clear()
+        read_aggregator.flush_requested.clear()
+        self.addCleanup(read_aggregator.counts.clear)
+
+        # the flusher thread would write the counts with its own connection, outside
+        # of the test transaction
+        patcher = patch.object(ReadAggregator, "start_flusher")
+        self.mock_start_flusher = patcher.start()
+        self.addCleanup(patcher.stop)
+        read_aggregator.flusher_pid = None
+
+    def read_producttype(self, producttype):
+        response = self.client.get(
+            reverse("producttype-detail", args=(producttype.uuid,))
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_reads_are_counted_per_period(self):
+        producttype = ProductTypeFactory.create()
+        other_producttype = ProductTypeFactory.create()
+
+        with freeze_time("2025-01-01T10:00:00Z"):
+            self.read_producttype(producttype)
+            self.read_producttype(producttype)
+            self.read_producttype(other_producttype)
+
+        with freeze_time("2025-01-01T10:04:59Z"):
+            self.read_producttype(producttype)
+
+        with freeze_time("2025-01-01T10:05:00Z"):
+            self.read_producttype(producttype)
+
+        self.assertFalse(TimelineLogProxy.objects.exists())
+        self.mock_start_flusher.assert_called_once()
+
+        read_aggregator.flush()
+
+        logs = TimelineLogProxy.objects.order_by(
+            "extra_data__period__start", "extra_data__read_count"
+        )
+        self.assertEqual(
+            [(log.content_object, log.extra_data["read_count"]) for log in logs],
+            [(other_producttype, 1), (producttype, 3), (producttype, 1)],
+        )
+
+        log = logs[1]
+        user = User.objects.get()
+        self.assertEqual(log.event, Events.read)
+        self.assertEqual(
+            log.extra_data["acting_user"],
+            {"identifier": user.id, "display_name": user.username},
+        )
+        self.assertEqual(
+            log.extra_data["period"],
+            {"start": "2025-01-01T10:00:00+00:00", "end": "2025-01-01T10:05:00+00:00"},
+        )
+        self.assertEqual(log.get_related_object_repr(), str(producttype))
+        self.assertEqual(read_aggregator.counts, {})
+
+    @override_settings(AUDIT_READ_AGGREGATION_MAX_ENTRIES=2)
+    def test_flush_is_requested_when_the_buffer_is_full(self):
+        producttypen = ProductTypeFactory.create_batch(2)
+
+        self.read_producttype(producttypen[0])
+        self.assertFalse(read_aggregator.flush_requested.is_set())
+        self.read_producttype(producttypen[1])
+
+        self.assertTrue(read_aggregator.flush_requested.is_set())
+        # the counts are not written in the request
+        self.assertFalse(TimelineLogProxy.objects.exists())
+
+    def test_counts_are_kept_if_the_write_fails(self):
+        producttype = ProductTypeFactory.create()
+        self.read_producttype(producttype)
+
+        with (
+            patch.object(ReadAggregator, "write", side_effect=RuntimeError),
+            self.assertRaises(RuntimeError),
+        ):
+            read_aggregator.flush()
+
+        self.read_producttype(producttype)
+        read_aggregator.flush()
+
+        self.assertEqual(TimelineLogProxy.objects.get().extra_data["read_count"], 2)
+
+    @override_settings(AUDIT_READ_AGGREGATION_MAX_ENTRIES=2)
+    def test_counts_are_dropped_if_the_write_fails_with_a_full_buffer(self):
+        producttypen = ProductTypeFactory.create_batch(3)
+        self.read_producttype(producttypen[0])
+
+        with patch.object(ReadAggregator, "write", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                read_aggregator.flush()
+            self.assertEqual(len(read_aggregator.counts), 1)
+
+            self.read_producttype(producttypen[1])
+            self.read_producttype(producttypen[2])
+
+            with capture_logs() as logs, self.assertRaises(RuntimeError):
+                read_aggregator.flush()
+
+        self.assertEqual(read_aggregator.counts, {})
+        self.assertEqual(
+            logs,
+            [
+                {
+                    "event": "aggregated_reads_dropped",
+                    "entries": 3,
+                    "reads": 3,
+                    "log_level": "error",
+                }
+            ],
+        )
+
+    def test_object_repr_is_cached_when_written(self):
+        producttype, deleted_producttype = ProductTypeFactory.create_batch(2)
+
+        with patch.object(
+            ProductType, "__str__", autospec=True, return_value="producttype"
+        ) as mock_str:
+            self.read_producttype(producttype)
+            self.read_producttype(deleted_producttype)
+            deleted_producttype.delete()
+
+            mock_str.assert_not_called()
+
+            read_aggregator.flush()
+
+        mock_str.assert_called_once()
+        self.assertEqual(
+            sorted(
+                log.extra_data["_cached_object_repr"]
+                for log in TimelineLogProxy.objects.filter(
+                    extra_data__read_count__isnull=False
+                )
+            ),
+            ["", "producttype"],
+        )
+
+    @override_settings(AUDIT_READ_AGGREGATION_FLUSH_INTERVAL=0.01)
+    def test_flusher_thread_keeps_flushing_after_a_failure(self):
+        aggregator = ReadAggregator()
+        flushed = threading.Event()
+
+        def flush():
+            if not mock_flush.call_count > 1:
+                raise RuntimeError
+            flushed.set()
+
+        with (
+            patch.object(aggregator, "flush", side_effect=flush) as mock_flush,
+            patch("openproduct.logging.read_aggregation.close_old_connections"),
+        ):
+            threading.Thread(target=aggregator.run_flusher, daemon=True).start()
+
+            self.assertTrue(flushed.wait(timeout=5))
+
+    def test_every_read_of_event_models_is_logged(self):
+        product = ProductFactory.create()
+
+        response = self.client.get(reverse("product-detail", args=(product.uuid,)))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        log = TimelineLogProxy.objects.get()
+        self.assertEqual(log.content_object, product)
+        self.assertNotIn("read_count", log.extra_data)
+        self.assertEqual(read_aggregator.counts, {})
+
+    def test_writes_are_logged_per_event(self):
+        producttype = ProductTypeFactory.create()
+
+        response = self.client.patch(
+            reverse("producttype-detail", args=(producttype.uuid,)),
+            {"naam": "update"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(TimelineLogProxy.objects.get().event, Events.update)
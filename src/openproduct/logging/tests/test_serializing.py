@@ -0,0 +1,160 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from openproduct.producten.tests.factories import EigenaarFactory, ProductFactory
+from openproduct.producttypen.tests.factories import (
+    PrijsFactory,
+    PrijsOptieFactory,
+    ProductTypeFactory,
+    ThemaFactory,
+)
+
+from ..constants import Events
+from ..logevent import audit_api_create, audit_api_update, buffered_audit_events
+from ..models import TimelineLogProxy
+from ..serializing import SNAPSHOT_POLICIES, SnapshotPolicy, serialize_instance
+
+
+class SnapshotPolicyTests(TestCase):
+    def test_relations_are_serialized_up_to_max_depth(self):
+        prijs = PrijsFactory.create()
+        optie = PrijsOptieFactory.create(prijs=prijs)
+
+        data = serialize_instance(prijs)
+
+        self.assertEqual(data["prijsopties"][0]["uuid"], optie.uuid)
+
+        with patch.dict(
+            SNAPSHOT_POLICIES, {"producttypen.Prijs": SnapshotPolicy(max_depth=0)}
+        ):
+            data = serialize_instance(prijs)
+
+        self.assertNotIn("prijsopties", data)
+        self.assertEqual(data["uuid"], prijs.uuid)
+
+    def test_nested_relations_are_not_serialized(self):
+        thema = ThemaFactory.create()
+        sub_thema = ThemaFactory.create(hoofd_thema=thema)
+        ThemaFactory.create(hoofd_thema=sub_thema)
+
+        with patch.dict(SNAPSHOT_POLICIES, {"producttypen.Thema": SnapshotPolicy()}):
+            data = serialize_instance(thema)
+
+        self.assertEqual(data["sub_themas"][0]["uuid"], sub_thema.uuid)
+        self.assertNotIn("sub_themas", data["sub_themas"][0])
+
+    def test_ids_only(self):
+        producttype = ProductTypeFactory.create()
+        products = ProductFactory.create_batch(2, producttype=producttype)
+
+        data = serialize_instance(producttype)
+
+        self.assertEqual(
+            sorted(data["producten"]), sorted(product.pk for product in products)
+        )
+
+    def test_fields(self):
+        product = ProductFactory.create()
+        EigenaarFactory.create(product=product, bsn="111222333")
+
+        with patch.dict(
+            SNAPSHOT_POLICIES,
+            {"producten.Product": SnapshotPolicy(fields=("uuid", "eigenaren"))},
+        ):
+            data = serialize_instance(product)
+
+        self.assertEqual(set(data.keys()), {"uuid", "eigenaren"})
+        self.assertEqual(data["eigenaren"][0]["bsn"], "111222333")
+
+
+class DeltaSnapshotTests(TestCase):
+    def audit_update(self, producttype):
+        audit_api_update(
+            content_object=producttype,
+            user_id="123",
+            user_display="Foo",
+            object_data=serialize_instance(producttype),
+            remarks="",
+        )
+        return TimelineLogProxy.objects.order_by("pk").last().extra_data
+
+    def test_update_stores_the_changed_fields(self):
+        producttype = ProductTypeFactory.create(code="A")
+        audit_api_create(
+            content_object=producttype,
+            user_id="123",
+            user_display="Foo",
+            object_data=serialize_instance(producttype),
+            remarks="",
+        )
+
+        producttype.code = "B"
+        producttype.save()
+        extra_data = self.audit_update(producttype)
+
+        self.assertEqual(extra_data["event"], Events.update)
+        self.assertTrue(extra_data["delta"])
+        self.assertEqual(extra_data["object_data"]["code"], "B")
+        self.assertNotIn("uuid", extra_data["object_data"])
+
+        producttype.code = "C"
+        producttype.save()
+        extra_data = self.audit_update(producttype)
+
+        self.assertEqual(extra_data["object_data"]["code"], "C")
+
+        producttype.code = "B"
+        producttype.save()
+        extra_data = self.audit_update(producttype)
+
+        self.assertEqual(extra_data["object_data"]["code"], "B")
+
+    def test_update_without_previous_snapshot_stores_a_full_snapshot(self):
+        producttype = ProductTypeFactory.create()
+
+        extra_data = self.audit_update(producttype)
+
+        self.assertNotIn("delta", extra_data)
+        self.assertEqual(extra_data["object_data"]["uuid"], str(producttype.uuid))
+
+    @patch("openproduct.logging.logevent.FULL_SNAPSHOT_INTERVAL", 2)
+    def test_full_snapshot_after_interval(self):
+        producttype = ProductTypeFactory.create()
+
+        self.assertNotIn("delta", self.audit_update(producttype))
+        self.assertTrue(self.audit_update(producttype)["delta"])
+        self.assertTrue(self.audit_update(producttype)["delta"])
+        self.assertNotIn("delta", self.audit_update(producttype))
+
+    def test_deltas_include_the_buffered_entries(self):
+        producttype = ProductTypeFactory.create(code="A")
+
+        with buffered_audit_events():
+            audit_api_create(
+                content_object=producttype,
+                user_id="123",
+                user_display="Foo",
+                object_data=serialize_instance(producttype),
+                remarks="",
+            )
+
+            for code in ["B", "A"]:
+                producttype.code = code
+                audit_api_update(
+                    content_object=producttype,
+                    user_id="123",
+                    user_display="Foo",
+                    object_data=serialize_instance(producttype),
+                    remarks="",
+                )
+
+        create, *updates = TimelineLogProxy.objects.order_by("pk")
+
+        self.assertNotIn("delta", create.extra_data)
+        self.assertEqual(create.extra_data["object_data"]["code"], "A")
+        self.assertEqual(
+            [update.extra_data["object_data"] for update in updates],
+            [{"code": "B"}, {"code": "A"}],
+        )
+        self.assertTrue(all(update.extra_data["delta"] for update in updates))
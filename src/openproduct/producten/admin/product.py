@@ -19,7 +19,10 @@ from openproduct.producttypen.models.enums import ProductStateChoices
 from openproduct.producttypen.models.producttype import ProductType
 
 from ...producttypen.models import ProductTypePermission
-from ...producttypen.models.producttypepermission import PermissionModes
+from ...producttypen.models.producttypepermission import (
+    PermissionModes,
+    get_producttype_permissions,
+)
 from ...urn.validators import validate_urn_or_url
 from .document import DocumentInline
 from .eigenaar import EigenaarInline
@@ -64,6 +67,11 @@ class ProductAdminForm(forms.ModelForm):
             ),
             widget=forms.Select,
         )
+        # the schemas are used to validate the verbruiksobject & dataobject
+        if "producttype" in self.fields:
+            self.fields["producttype"].queryset = self.fields[
+                "producttype"
+            ].queryset.select_related("dataobject_schema", "verbruiksobject_schema")
 
     def clean(self):
         """
@@ -148,16 +156,11 @@ class ProductAdmin(AdminAuditLogMixin, CompareVersionAdmin):
         )
 
     def _has_permission(
-        self, user, permission: bool, obj=None, producttype=None, write=True
+        self, request, permission: bool, obj=None, producttype=None, write=True
     ):
-        if (obj or producttype) and not user.is_superuser:
-            return (
-                permission
-                and ProductTypePermission.objects.filter(
-                    user=user,
-                    producttype=producttype if producttype else obj.producttype,
-                    **({"mode": PermissionModes.read_and_write} if write else {}),
-                ).exists()
+        if (obj or producttype) and not request.user.is_superuser:
+            return permission and get_producttype_permissions(request).has_permission(
+                producttype.pk if producttype else obj.producttype_id, write=write
             )
         return permission
 
@@ -180,17 +183,17 @@ class ProductAdmin(AdminAuditLogMixin, CompareVersionAdmin):
 
     def has_change_permission(self, request, obj=None):
         return self._has_permission(
-            request.user, super().has_change_permission(request, obj), obj
+            request, super().has_change_permission(request, obj), obj
         )
 
     def has_view_permission(self, request, obj=None):
         return self._has_permission(
-            request.user, super().has_view_permission(request, obj), obj, write=False
+            request, super().has_view_permission(request, obj), obj, write=False
         )
 
     def has_delete_permission(self, request, obj=None):
         return self._has_permission(
-            request.user, super().has_delete_permission(request, obj), obj
+            request, super().has_delete_permission(request, obj), obj
         )
 
     def save_model(self, request, obj, form, change):
@@ -198,7 +201,7 @@ class ProductAdmin(AdminAuditLogMixin, CompareVersionAdmin):
             not request.user.is_superuser
             and "producttype" in form.changed_data
             and not self._has_permission(
-                request.user,
+                request,
                 super().has_change_permission(request, obj)
                 if change
                 else super().has_add_permission(request),
@@ -216,8 +219,6 @@ class ProductAdmin(AdminAuditLogMixin, CompareVersionAdmin):
 
         if not request.user.is_superuser:
             qs = qs.filter(
-                producttype__in=ProductTypePermission.objects.filter(
-                    user=request.user
-                ).values_list("producttype", flat=True)
+                producttype__in=get_producttype_permissions(request).producttype_ids()
             )
         return qs
@@ -7,3 +7,4 @@ class ProductenConfig(AppConfig):
 
     def ready(self):
         from . import metrics  # noqa
+        from . import signals  # noqa
@@ -0,0 +1,163 @@
+"""
+Expression indexes for the properties that a JsonSchema marks as indexed.
+
+For each indexed property a btree index is kept on the jsonb value of that key
+(``dataobject -> 'kenteken'``), which is the same expression the ORM generates for
+``dataobject__kenteken`` lookups. It serves the exact/in and range (gt, gte, lt,
+lte) filters of ``dataobject_attr`` & ``verbruiksobject_attr``, which the generic
+GIN index on the whole field can't do for ranges.
+
+The filters only use the key transforms for the properties of which the index
+exists and is valid, see `get_filter_indexed_attributes`.
+"""
+
+from django.core.cache import cache
+from django.db import connection, models, transaction
+from django.db.backends.utils import names_digest
+from django.db.models import F
+
+import structlog
+
+from openproduct.producten.models import Product
+from openproduct.producttypen.models import JsonSchema
+
+logger = structlog.stdlib.get_logger(__name__)
+
+INDEX_PREFIX = "product_attr_"
+
+# json field on Product -> related name of the JsonSchema foreign key on ProductType
+SCHEMA_RELATIONS = {
+    "dataobject": "producttypen_dataobject_schemas",
+    "verbruiksobject": "producttypen_verbruiksobject_schemas",
+}
+
+# the advisory lock that is held while the indexes are synced
+SYNC_LOCK_KEY = 1_000_002
+
+FILTER_INDEXED_ATTRIBUTES_CACHE_KEY = "product_attr_indexes"
+
+# the cache is cleared when the schemas or the indexes change, the timeout only
+# limits how long an index that is dropped outside of the sync is still used
+FILTER_INDEXED_ATTRIBUTES_CACHE_TIMEOUT = 60 * 10
+
+INDEXES_SQL = """
+    SELECT c.relname, i.indisvalid
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE i.indrelid = %s::regclass
+      AND c.relname LIKE %s
+"""
+
+
+def get_indexed_attributes(field_name: str) -> set[str]:
+    """
+    Return the indexed properties of the schemas that are used for ``field_name``.
+    """
+    relation = SCHEMA_RELATIONS[field_name]
+    eigenschappen = (
+        JsonSchema.objects.filter(**{f"{relation}__isnull": False})
+        .exclude(geindexeerde_eigenschappen=[])
+        .values_list("geindexeerde_eigenschappen", flat=True)
+        .distinct()
+    )
+    return {eigenschap for values in eigenschappen for eigenschap in values}
+
+
+def get_existing_indexes() -> dict[str, bool]:
+    """
+    Return the existing indexes of the indexed properties and whether they are valid.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(INDEXES_SQL, [Product._meta.db_table, f"{INDEX_PREFIX}%"])
+        return dict(cursor.fetchall())
+
+
+def get_filter_indexed_attributes(field_name: str) -> set[str]:
+    """
+    Return the indexed properties of ``field_name`` of which the index exists and is
+    valid, so a property is only filtered with key transforms once its index is built.
+    """
+    attributes = cache.get(FILTER_INDEXED_ATTRIBUTES_CACHE_KEY)
+    if attributes is None:
+        valid = {name for name, is_valid in get_existing_indexes().items() if is_valid}
+        attributes = {
+            name: [
+                variable
+                for variable in get_indexed_attributes(name)
+                if get_index_name(name, variable) in valid
+            ]
+            for name in SCHEMA_RELATIONS
+        }
+        cache.set(
+            FILTER_INDEXED_ATTRIBUTES_CACHE_KEY,
+            attributes,
+            FILTER_INDEXED_ATTRIBUTES_CACHE_TIMEOUT,
+        )
+
+    return set(attributes[field_name])
+
+
+def clear_filter_indexed_attributes_cache() -> None:
+    """
+    Clear the cached indexed properties now & when the transaction is committed, so
+    the properties cached during the transaction are cleared as well.
+    """
+    cache.delete(FILTER_INDEXED_ATTRIBUTES_CACHE_KEY)
+    transaction.on_commit(lambda: cache.delete(FILTER_INDEXED_ATTRIBUTES_CACHE_KEY))
+
+
+def get_index_name(field_name: str, variable: str) -> str:
+    return f"{INDEX_PREFIX}{field_name}_{names_digest(variable, length=8)}"
+
+
+def get_data_attr_indexes() -> list[models.Index]:
+    return [
+        models.Index(
+            F(f"{field_name}__{variable}"), name=get_index_name(field_name, variable)
+        )
+        for field_name in SCHEMA_RELATIONS
+        for variable in sorted(get_indexed_attributes(field_name))
+    ]
+
+
+def sync_data_attr_indexes() -> None:
+    """
+    Create the missing indexes and drop the ones that are no longer used.
+
+    The indexes are created concurrently, so this can't run inside a transaction.
+    Concurrent syncs are serialized by an advisory lock, so they don't build or
+    drop the same indexes at the same time.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s)", [SYNC_LOCK_KEY])
+
+    try:
+        _sync_data_attr_indexes()
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [SYNC_LOCK_KEY])
+
+        clear_filter_indexed_attributes_cache()
+
+
+def _sync_data_attr_indexes() -> None:
+    indexes = {index.name: index for index in get_data_attr_indexes()}
+    existing = get_existing_indexes()
+
+    with connection.schema_editor(atomic=False) as schema_editor:
+        for name, valid in existing.items():
+            # an invalid index is left behind by a failed concurrent build
+            if name in indexes and valid:
+                continue
+
+            logger.info("drop_data_attr_index", index=name)
+            schema_editor.execute(
+                "DROP INDEX CONCURRENTLY IF EXISTS %s" % schema_editor.quote_name(name)
+            )
+
+        for name, index in indexes.items():
+            if existing.get(name):
+                continue
+
+            logger.info("create_data_attr_index", index=name)
+            schema_editor.add_index(Product, index, concurrently=True)
@@ -0,0 +1,46 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from openproduct.producten.revalidation import CHUNK_SIZE, revalidate_products
+from openproduct.producttypen.models import JsonSchema
+
+
+class Command(BaseCommand):
+    help = (
+        "Validate the products of the producttypen that use a json schema and write "
+        "the errors of the invalid products as csv."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("schema", help="The naam of the json schema.")
+        parser.add_argument(
+            "--processes",
+            type=int,
+            help="The number of processes that validate the products "
+            "(default: the number of CPUs).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=CHUNK_SIZE,
+            help="The number of products that are loaded & validated at once.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            schema = JsonSchema.objects.get(naam=options["schema"])
+        except JsonSchema.DoesNotExist:
+            raise CommandError(f"Json schema '{options['schema']}' does not exist.")
+
+        writer = csv.writer(self.stdout, lineterminator="\n")
+        writer.writerow(["uuid", "path", "message"])
+
+        invalid_products = set()
+        for error in revalidate_products(
+            schema, processes=options["processes"], chunk_size=options["chunk_size"]
+        ):
+            invalid_products.add(error.uuid)
+            writer.writerow([error.uuid, error.path, error.message])
+
+        self.stderr.write(f"{len(invalid_products)} invalid product(s)")
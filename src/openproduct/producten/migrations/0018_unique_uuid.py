@@ -0,0 +1,28 @@
+# Generated by Django 5.2.15 on 2026-10-18 10:18
+
+import uuid
+from django.db import migrations, models
+
+from openproduct.utils.migration_operations import AlterFieldUniqueConcurrently
+
+
+class Migration(migrations.Migration):
+    # the unique indexes are created concurrently, which can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('producten', '0017_alter_product_aanvraag_zaak_urn'),
+    ]
+
+    operations = [
+        AlterFieldUniqueConcurrently(
+            model_name='eigenaar',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        AlterFieldUniqueConcurrently(
+            model_name='product',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+    ]
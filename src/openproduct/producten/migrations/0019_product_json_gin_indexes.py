@@ -0,0 +1,25 @@
+# Generated by Django 5.2.15 on 2026-10-18 11:02
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # the indexes are created concurrently, which can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('producten', '0018_unique_uuid'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['dataobject'], name='product_dataobject_gin', opclasses=['jsonb_path_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['verbruiksobject'], name='product_verbruiksobject_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.15 on 2026-10-18 12:04
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+from django.db.models.functions import Least
+
+START_DATUM_STATUSES = ["initieel", "in_aanvraag", "gereed"]
+EIND_DATUM_STATUSES = [*START_DATUM_STATUSES, "actief"]
+
+# the products are updated in batches of ids, so every update only locks a part of
+# the table for a short time
+BATCH_SIZE = 5000
+
+
+def set_volgende_transitie_datum(apps, schema_editor):
+    Product = apps.get_model("producten", "Product")
+
+    bounds = Product.objects.aggregate(first=models.Min("id"), last=models.Max("id"))
+    if bounds["first"] is None:
+        return
+
+    # LEAST ignores NULL values in Postgres
+    volgende_transitie_datum = Least(
+        models.Case(
+            models.When(status__in=START_DATUM_STATUSES, then=models.F("start_datum"))
+        ),
+        models.Case(
+            models.When(status__in=EIND_DATUM_STATUSES, then=models.F("eind_datum"))
+        ),
+    )
+
+    # the migration isn't atomic, so every batch is committed by itself
+    for start_id in range(bounds["first"], bounds["last"] + 1, BATCH_SIZE):
+        Product.objects.filter(
+            models.Q(start_datum__isnull=False) | models.Q(eind_datum__isnull=False),
+            id__gte=start_id,
+            id__lt=start_id + BATCH_SIZE,
+        ).update(volgende_transitie_datum=volgende_transitie_datum)
+
+
+class Migration(migrations.Migration):
+    # the index is created concurrently, which can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('producten', '0019_product_json_gin_indexes'),
+        ('producttypen', '0023_jsonschema_geindexeerde_eigenschappen'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='volgende_transitie_datum',
+            field=models.DateField(blank=True, editable=False, help_text='De datum waarop de status van dit product automatisch wordt gewijzigd op basis van de start of eind datum.', null=True, verbose_name='volgende transitie datum'),
+        ),
+        migrations.RunPython(set_volgende_transitie_datum, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(condition=models.Q(('volgende_transitie_datum__isnull', False)), fields=['volgende_transitie_datum'], name='product_volgende_transitie'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from datetime import date
 from decimal import Decimal
 
+from django.contrib.postgres.indexes import GinIndex
 from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator
 from django.db import models
@@ -15,6 +16,16 @@ from openproduct.producttypen.models.enums import ProductStateChoices
 from openproduct.urn.fields import UrlField, UrnField
 from openproduct.utils.models import BasePublishableModel
 
+# the statuses from which a product is set to ACTIEF once its start datum has passed
+START_DATUM_STATUSES = (
+    ProductStateChoices.INITIEEL,
+    ProductStateChoices.IN_AANVRAAG,
+    ProductStateChoices.GEREED,
+)
+
+# the statuses from which a product is set to VERLOPEN once its eind datum has passed
+EIND_DATUM_STATUSES = (*START_DATUM_STATUSES, ProductStateChoices.ACTIEF)
+
 
 class PrijsFrequentieChoices(models.TextChoices):
     EENMALIG = "eenmalig", _("Eenmalig")
@@ -125,55 +136,93 @@ class Product(BasePublishableModel):
         blank=True,
     )
 
+    volgende_transitie_datum = models.DateField(
+        _("volgende transitie datum"),
+        help_text=_(
+            "De datum waarop de status van dit product automatisch wordt gewijzigd op "
+            "basis van de start of eind datum."
+        ),
+        null=True,
+        blank=True,
+        editable=False,
+    )
+
     class Meta:
         verbose_name = _("Product")
         verbose_name_plural = _("Producten")
         ordering = ("-id",)
+        indexes = [
+            # used by the jsonpath predicates of the dataobject_attr &
+            # verbruiksobject_attr filters
+            GinIndex(
+                fields=["dataobject"],
+                opclasses=["jsonb_path_ops"],
+                name="product_dataobject_gin",
+            ),
+            GinIndex(
+                fields=["verbruiksobject"],
+                opclasses=["jsonb_path_ops"],
+                name="product_verbruiksobject_gin",
+            ),
+            # used to find the products of which the status must be updated
+            models.Index(
+                fields=["volgende_transitie_datum"],
+                condition=models.Q(volgende_transitie_datum__isnull=False),
+                name="product_volgende_transitie",
+            ),
+        ]
 
     def clean(self):
         validate_product_dates(self.start_datum, self.eind_datum)
 
     def save(self, *args, **kwargs):
+        remarks = self.update_status_from_dates()
+        super().save(*args, **kwargs)
+
+        if remarks:
+            audit_automation_update(self, remarks)
+
+    def update_status_from_dates(self) -> str | None:
+        """
+        Set the status to ACTIEF or VERLOPEN when the start or eind datum has passed,
+        returns the reason for the audit log when the status was changed.
+
+        The `volgende_transitie_datum` is updated for the (new) status.
+        """
+        remarks = None
         if self.check_start_datum():
             self.status = ProductStateChoices.ACTIEF
-            super().save(*args, **kwargs)
-            audit_automation_update(
-                self, _("Status is naar ACTIEF gezet vanwege de start datum.")
-            )
-
+            remarks = _("Status is naar ACTIEF gezet vanwege de start datum.")
         elif self.check_eind_datum():
             self.status = ProductStateChoices.VERLOPEN
-            super().save(*args, **kwargs)
-            audit_automation_update(
-                self, _("Status is naar VERLOPEN gezet vanwege de eind datum.")
-            )
-
-        else:
-            super().save(*args, **kwargs)
+            remarks = _("Status is naar VERLOPEN gezet vanwege de eind datum.")
+
+        self.volgende_transitie_datum = self.get_volgende_transitie_datum()
+        return remarks
+
+    def get_volgende_transitie_datum(self) -> date | None:
+        """
+        The first date on which `update_status_from_dates` changes the current status.
+        """
+        dates = []
+        if self.start_datum and self.status in START_DATUM_STATUSES:
+            dates.append(self.start_datum)
+        if self.eind_datum and self.status in EIND_DATUM_STATUSES:
+            dates.append(self.eind_datum)
+        return min(dates, default=None)
 
     def check_start_datum(self):
         return (
             self.start_datum
             and self.start_datum <= date.today()
-            and self.status
-            in (
-                ProductStateChoices.INITIEEL,
-                ProductStateChoices.IN_AANVRAAG,
-                ProductStateChoices.GEREED,
-            )
+            and self.status in START_DATUM_STATUSES
         )
 
     def check_eind_datum(self):
         return (
             self.eind_datum
             and self.eind_datum <= date.today()
-            and self.status
-            in (
-                ProductStateChoices.INITIEEL,
-                ProductStateChoices.IN_AANVRAAG,
-                ProductStateChoices.GEREED,
-                ProductStateChoices.ACTIEF,
-            )
+            and self.status in EIND_DATUM_STATUSES
         )
 
     def __str__(self):
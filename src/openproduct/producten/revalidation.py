@@ -0,0 +1,110 @@
+"""
+Validate the existing products against a json schema, e.g. to find the products that
+no longer validate after their dataobject or verbruiksobject schema was changed.
+"""
+
+import itertools
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from django.conf import settings
+
+from openproduct.producttypen.models import JsonSchema
+from openproduct.utils.jsonschema_validators import build_validator
+
+from .models import Product
+from .revalidation_worker import (
+    Chunk,
+    InvalidProduct,
+    init_worker,
+    validate_chunk,
+    validate_chunk_in_worker,
+)
+
+# the number of products that are loaded & validated at once
+CHUNK_SIZE = 1000
+
+# the json fields of the products and the schema of the producttype they must conform to
+SCHEMA_FIELDS = {
+    "dataobject": "dataobject_schema",
+    "verbruiksobject": "verbruiksobject_schema",
+}
+
+
+def get_products_to_revalidate(
+    schema: JsonSchema, chunk_size: int = CHUNK_SIZE, limit: int | None = None
+) -> Iterator[Chunk]:
+    """
+    Stream the uuid, field & value of the json fields that must conform to `schema`
+    in chunks, only the current chunk is loaded in memory.
+
+    With a `limit`, only the first `limit` values are streamed.
+    """
+    for field, schema_field in SCHEMA_FIELDS.items():
+        if limit is not None and limit <= 0:
+            return
+
+        queryset = (
+            Product.objects.filter(
+                **{f"producttype__{schema_field}": schema, f"{field}__isnull": False}
+            )
+            .order_by("pk")
+            .values_list("uuid", field)
+        )
+        if limit is not None:
+            queryset = queryset[:limit]
+
+        values = queryset.iterator(chunk_size=chunk_size)
+        while chunk := [
+            (uuid, field, value) for uuid, value in itertools.islice(values, chunk_size)
+        ]:
+            if limit is not None:
+                limit -= len(chunk)
+            yield chunk
+
+
+def revalidate_products(
+    schema: JsonSchema, processes: int | None = None, chunk_size: int = CHUNK_SIZE
+) -> Iterator[InvalidProduct]:
+    """
+    Validate the products of the producttypen that use `schema` and yield the
+    errors of the products that don't conform to it.
+
+    The products are selected by the id of `schema`, but they are validated with
+    its (possibly unsaved) `schema` attribute, which can be used to preview the
+    effects of a change.
+
+    The chunks are validated by a pool of `processes` (default: the number of CPUs)
+    processes, `processes=1` validates them in the current process. Only a couple
+    of chunks per process are loaded at once.
+    """
+    chunks = get_products_to_revalidate(schema, chunk_size)
+
+    processes = processes or os.cpu_count() or 1
+    # daemonic processes (e.g. the workers of a pool) can't start processes
+    if processes == 1 or multiprocessing.current_process().daemon:
+        validator = build_validator(schema.schema)
+        for chunk in chunks:
+            yield from validate_chunk(validator, chunk)
+        return
+
+    with ProcessPoolExecutor(
+        processes,
+        # forking a process with other threads (e.g. of the read aggregation or the
+        # telemetry) can deadlock the child, the spawned processes don't set up
+        # Django, they only validate json
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(schema.schema, settings.JSONSCHEMA_USE_FORMAT_CHECKER),
+    ) as executor:
+        pending: deque[Future[list[InvalidProduct]]] = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(validate_chunk_in_worker, chunk))
+            if len(pending) >= 2 * processes:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,52 @@
+"""
+The validation of the chunks of products in the worker processes of
+`openproduct.producten.revalidation`.
+
+The workers are spawned, so this module must not import the models: it's imported
+without setting up Django and only validates json.
+"""
+
+from dataclasses import dataclass
+from uuid import UUID
+
+from jsonschema import Draft202012Validator
+
+from openproduct.utils.jsonschema_validators import build_validator
+from openproduct.utils.typing import JSONObject
+
+type Chunk = list[tuple[UUID, str, JSONObject]]
+
+
+@dataclass(frozen=True)
+class InvalidProduct:
+    uuid: UUID
+    path: str
+    message: str
+
+
+def validate_chunk(
+    validator: Draft202012Validator, chunk: Chunk
+) -> list[InvalidProduct]:
+    return [
+        InvalidProduct(
+            uuid=uuid,
+            path=".".join([field, *(str(key) for key in error.absolute_path)]),
+            message=error.message,
+        )
+        for uuid, field, value in chunk
+        for error in validator.iter_errors(value)
+    ]
+
+
+# the validator of a worker process, which is compiled once per process
+_worker_validator: Draft202012Validator | None = None
+
+
+def init_worker(schema: JSONObject, use_format_checker: bool) -> None:
+    global _worker_validator
+    _worker_validator = build_validator(schema, use_format_checker)
+
+
+def validate_chunk_in_worker(chunk: Chunk) -> list[InvalidProduct]:
+    assert _worker_validator is not None
+    return validate_chunk(_worker_validator, chunk)
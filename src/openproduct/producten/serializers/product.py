@@ -1,4 +1,8 @@
+from uuid import UUID
+
 from django.db import transaction
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 from drf_spectacular.types import OpenApiTypes
@@ -10,30 +14,194 @@ from drf_spectacular.utils import (
 from rest_framework import serializers
 from vng_api_common.utils import get_help_text
 
-from openproduct.producten.models import Eigenaar, Product
-from openproduct.producten.serializers.document import (
-    DocumentSerializer,
-    NestedDocumentSerializer,
-)
+from openproduct.logging.logevent import audit_automation_bulk_update
+from openproduct.producten.models import Document, Eigenaar, Product, Taak, Zaak
+from openproduct.producten.serializers.document import NestedDocumentSerializer
 from openproduct.producten.serializers.eigenaar import EigenaarSerializer
-from openproduct.producten.serializers.taak import NestedTaakSerializer, TaakSerializer
+from openproduct.producten.serializers.taak import NestedTaakSerializer
 from openproduct.producten.serializers.validators import (
     DataObjectValidator,
     DateValidator,
     StatusValidator,
     VerbruiksObjectValidator,
 )
-from openproduct.producten.serializers.zaak import NestedZaakSerializer, ZaakSerializer
+from openproduct.producten.serializers.zaak import NestedZaakSerializer
 from openproduct.producttypen.models import ProductType, UniformeProductNaam
 from openproduct.producttypen.serializers.producttype import NestedThemaSerializer
 from openproduct.urn.serializers import UrnMappingMixin
 from openproduct.utils.drf_validators import NestedObjectsValidator
 from openproduct.utils.fields import UUIDRelatedField
 from openproduct.utils.serializers import (
-    set_nested_serializer,
+    reconcile_nested_objects,
     validate_key_value_model_keys,
 )
 
+NESTED_MODELS = {
+    "eigenaren": Eigenaar,
+    "documenten": Document,
+    "zaken": Zaak,
+    "taken": Taak,
+}
+
+# the fields used to match the nested data to the existing objects
+NESTED_MODEL_KEYS = {
+    "eigenaren": ("uuid",),
+    "documenten": ("urn", "url"),
+    "zaken": ("urn", "url"),
+    "taken": ("urn", "url"),
+}
+
+
+def pop_nested_data(validated_data: dict) -> dict[str, list[dict] | None]:
+    return {field: validated_data.pop(field, None) for field in NESTED_MODELS}
+
+
+def create_nested_objects(
+    products: list[Product], nested_data: list[dict[str, list[dict] | None]]
+) -> None:
+    """
+    Create the eigenaren, documenten, zaken & taken of new products with a query
+    per model.
+    """
+    for field, model in NESTED_MODELS.items():
+        objects = []
+        for product, data in zip(products, nested_data, strict=True):
+            for attrs in data[field] or []:
+                attrs.pop("uuid", None)
+                objects.append(model(product=product, **attrs))
+
+        model.objects.bulk_create(objects)
+
+
+def update_nested_objects(
+    products: list[Product], nested_data: list[dict[str, list[dict] | None]]
+) -> None:
+    """
+    Update the eigenaren, documenten, zaken & taken of existing products with a
+    couple of queries per model. Relations that are not in the data are unchanged.
+
+    Eigenaren are matched on their `uuid` and the documenten, zaken & taken on their
+    `urn` & `url`. Unchanged objects are kept as they are.
+    """
+    for field, model in NESTED_MODELS.items():
+        reconcile_nested_objects(
+            model,
+            "product",
+            [
+                (product, data[field])
+                for product, data in zip(products, nested_data, strict=True)
+                if data[field] is not None
+            ],
+            key_fields=NESTED_MODEL_KEYS[field],
+        )
+
+
+def audit_status_updates(
+    products: list[Product], automation_remarks: list[str | None]
+) -> None:
+    """
+    Log the automatic status changes of `Product.update_status_from_dates`, which
+    `Product.save` does for a single product.
+    """
+    updated = [
+        (product, remarks)
+        for product, remarks in zip(products, automation_remarks, strict=True)
+        if remarks
+    ]
+    if updated:
+        updated_products, remarks = zip(*updated, strict=True)
+        audit_automation_bulk_update(updated_products, remarks)
+
+
+class ProductListSerializer(serializers.ListSerializer):
+    """
+    Creates or (partially) updates multiple products with a couple of queries per
+    model instead of multiple queries per product.
+
+    When updating, `instance` contains the products that can be updated and each
+    item is matched to one of these products with its `uuid`.
+    """
+
+    @property
+    def errors(self):
+        errors = super().errors
+        # the errors of the items are keyed by their index, so the index is part of
+        # the names in the error response (e.g. `1.status`)
+        if isinstance(errors, list):
+            return {str(index): error for index, error in enumerate(errors) if error}
+        return errors
+
+    @cached_property
+    def instances_by_uuid(self) -> dict[UUID, Product]:
+        return {product.uuid: product for product in self.instance}
+
+    def to_internal_value(self, data):
+        # the products of the validated items in the same order as the items
+        self.validated_instances = []
+        return super().to_internal_value(data)
+
+    def run_child_validation(self, data):
+        if self.instance is None:
+            return super().run_child_validation(data)
+
+        instance = self.get_child_instance(data)
+        self.child.instance = instance
+        self.child.initial_data = data
+        self.validated_instances.append(instance)
+        return super().run_child_validation(data)
+
+    def get_child_instance(self, data) -> Product:
+        product_uuid = data.get("uuid") if isinstance(data, dict) else None
+        if not product_uuid:
+            raise serializers.ValidationError(
+                {"uuid": [serializers.Field.default_error_messages["required"]]},
+                code="required",
+            )
+
+        try:
+            return self.instances_by_uuid[UUID(str(product_uuid))]
+        except (ValueError, KeyError):
+            raise serializers.ValidationError(
+                {"uuid": [_("Product met uuid {} bestaat niet.").format(product_uuid)]}
+            )
+
+    @transaction.atomic()
+    def create(self, validated_data):
+        nested_data = [pop_nested_data(attrs) for attrs in validated_data]
+        products = [Product(**attrs) for attrs in validated_data]
+
+        automation_remarks = [
+            product.update_status_from_dates() for product in products
+        ]
+        Product.objects.bulk_create(products)
+        create_nested_objects(products, nested_data)
+        audit_status_updates(products, automation_remarks)
+
+        return products
+
+    @transaction.atomic()
+    def update(self, instance, validated_data):
+        products = self.validated_instances
+        nested_data = [pop_nested_data(attrs) for attrs in validated_data]
+        update_datum = timezone.now()
+        fields = {"status", "volgende_transitie_datum", "update_datum"}
+
+        automation_remarks = []
+        for product, attrs in zip(products, validated_data, strict=True):
+            # the uuid is only used to find the product
+            attrs.pop("uuid", None)
+            for attr, value in attrs.items():
+                setattr(product, attr, value)
+            fields.update(attrs)
+            product.update_datum = update_datum
+            automation_remarks.append(product.update_status_from_dates())
+
+        Product.objects.bulk_update(products, fields)
+        update_nested_objects(products, nested_data)
+        audit_status_updates(products, automation_remarks)
+
+        return products
+
 
 class NestedProductTypeSerializer(serializers.ModelSerializer):
     uniforme_product_naam = serializers.SlugRelatedField(
@@ -200,7 +368,12 @@ class ProductSerializer(UrnMappingMixin, serializers.ModelSerializer):
     )
     producttype = NestedProductTypeSerializer(read_only=True)
     producttype_uuid = UUIDRelatedField(
-        write_only=True, queryset=ProductType.objects.all(), source="producttype"
+        write_only=True,
+        # the schemas are used to validate the verbruiksobject & dataobject
+        queryset=ProductType.objects.select_related(
+            "dataobject_schema", "verbruiksobject_schema"
+        ),
+        source="producttype",
     )
     eigenaren = EigenaarSerializer(many=True)
     documenten = NestedDocumentSerializer(many=True, required=False)
@@ -208,6 +381,7 @@ class ProductSerializer(UrnMappingMixin, serializers.ModelSerializer):
     taken = NestedTaakSerializer(many=True, required=False)
 
     urn_fields = ["aanvraag_zaak"]
+    nested_fields = ("producttype", "eigenaren", "documenten", "zaken", "taken")
 
     class Meta:
         model = Product
@@ -241,6 +415,21 @@ class ProductSerializer(UrnMappingMixin, serializers.ModelSerializer):
             DataObjectValidator(),
             NestedObjectsValidator("eigenaren", Eigenaar),
         ]
+        list_serializer_class = ProductListSerializer
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        # the sparse fieldset from the `fields` & `expand` query parameters
+        requested_fields = self.context.get("requested_fields")
+        if requested_fields is None:
+            return fields
+
+        return {
+            name: field
+            for name, field in fields.items()
+            if name in requested_fields or field.write_only
+        }
 
     def validate_eigenaren(self, eigenaren: list[Eigenaar]) -> list[Eigenaar]:
         if len(eigenaren) == 0:
@@ -294,82 +483,27 @@ class ProductSerializer(UrnMappingMixin, serializers.ModelSerializer):
 
     @transaction.atomic()
     def create(self, validated_data):
-        eigenaren = validated_data.pop("eigenaren", [])
-        documenten = validated_data.pop("documenten", [])
-        zaken = validated_data.pop("zaken", [])
-        taken = validated_data.pop("taken", [])
+        nested_data = pop_nested_data(validated_data)
 
         product = super().create(validated_data)
-
-        for eigenaar in eigenaren:
-            eigenaar.pop("uuid", None)
-            EigenaarSerializer().create(eigenaar | {"product": product})
-
-        set_nested_serializer(
-            [document | {"product": product.pk} for document in documenten],
-            DocumentSerializer,
-        )
-
-        set_nested_serializer(
-            [zaak | {"product": product.pk} for zaak in zaken],
-            ZaakSerializer,
-        )
-
-        set_nested_serializer(
-            [taak | {"product": product.pk} for taak in taken],
-            TaakSerializer,
-        )
+        create_nested_objects([product], [nested_data])
 
         return product
 
     @transaction.atomic()
     def update(self, instance, validated_data):
-        eigenaren = validated_data.pop("eigenaren", None)
-        documenten = validated_data.pop("documenten", None)
-        zaken = validated_data.pop("zaken", None)
-        taken = validated_data.pop("taken", None)
+        nested_data = pop_nested_data(validated_data)
 
         product = super().update(instance, validated_data)
+        update_nested_objects([product], [nested_data])
 
-        if eigenaren is not None:
-            current_eigenaren_uuids = set(
-                product.eigenaren.values_list("uuid", flat=True)
-            )
-            seen_eigenaren_uuids = set()
-
-            for eigenaar in eigenaren:
-                eigenaar_uuid = eigenaar.pop("uuid", None)
-                if eigenaar_uuid is None:
-                    EigenaarSerializer().create(eigenaar | {"product": product})
-
-                else:
-                    existing_eigenaar = Eigenaar.objects.get(uuid=eigenaar_uuid)
-                    EigenaarSerializer().update(existing_eigenaar, eigenaar)
-                    seen_eigenaren_uuids.add(eigenaar_uuid)
-
-            product.eigenaren.filter(
-                uuid__in=(current_eigenaren_uuids - seen_eigenaren_uuids)
-            ).delete()
-
-        if documenten is not None:
-            instance.documenten.all().delete()
-            set_nested_serializer(
-                [document | {"product": instance.pk} for document in documenten],
-                DocumentSerializer,
-            )
+        return product
 
-        if zaken is not None:
-            instance.zaken.all().delete()
-            set_nested_serializer(
-                [zaak | {"product": instance.pk} for zaak in zaken],
-                ZaakSerializer,
-            )
 
-        if taken is not None:
-            instance.taken.all().delete()
-            set_nested_serializer(
-                [taak | {"product": instance.pk} for taak in taken],
-                TaakSerializer,
-            )
+class ProductBulkUpdateSerializer(ProductSerializer):
+    uuid = serializers.UUIDField(
+        help_text=_("De uuid van het product dat wordt bijgewerkt.")
+    )
 
-        return product
+    class Meta(ProductSerializer.Meta):
+        pass
@@ -0,0 +1,27 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from openproduct.producttypen.models import JsonSchema, ProductType
+
+from .indexes import clear_filter_indexed_attributes_cache
+from .tasks import sync_indexes
+
+
+@receiver(post_save, sender=JsonSchema)
+@receiver(post_delete, sender=JsonSchema)
+def sync_data_attr_indexes(sender, instance, **kwargs):
+    clear_filter_indexed_attributes_cache()
+    transaction.on_commit(sync_indexes.delay)
+
+
+@receiver(post_save, sender=ProductType)
+def sync_producttype_data_attr_indexes(sender, instance, **kwargs):
+    # a producttype can start using a schema with indexed properties, unused indexes
+    # are dropped on the next sync
+    if any(
+        schema and schema.geindexeerde_eigenschappen
+        for schema in (instance.dataobject_schema, instance.verbruiksobject_schema)
+    ):
+        clear_filter_indexed_attributes_cache()
+        transaction.on_commit(sync_indexes.delay)
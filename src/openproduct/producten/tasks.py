@@ -1,16 +1,182 @@
-from django.db import transaction
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import date
+
+from django.db import connection, transaction
+from django.db.models import Max, Min, QuerySet
+from django.utils import timezone
+
+import structlog
 
 from openproduct.celery import app
+from openproduct.logging.logevent import audit_automation_bulk_update
+from openproduct.producten.indexes import sync_data_attr_indexes
 from openproduct.producten.models import Product
+from openproduct.producten.revalidation import revalidate_products
+from openproduct.producttypen.models import JsonSchema
+
+logger = structlog.stdlib.get_logger(__name__)
+
+# the number of products that are updated & committed at once
+PRODUCT_STATES_CHUNK_SIZE = 1000
+
+# the size of the id ranges that are updated by separate tasks
+PRODUCT_STATES_SHARD_SIZE = 100_000
+
+# the first key of the advisory locks of the id ranges, the second is the range
+PRODUCT_STATES_LOCK_KEY = 1_000_001
+
+
+@contextmanager
+def _try_advisory_lock(key: int, sub_key: int) -> Iterator[bool]:
+    """
+    Hold a session level advisory lock for the block if it is available.
+
+    The lock is released when the connection is closed, so it can't outlive a
+    crashed worker.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s, %s)", [key, sub_key])
+        (acquired,) = cursor.fetchone()
+
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s, %s)", [key, sub_key])
+
+
+def get_products_to_update(today: date) -> QuerySet[Product]:
+    """
+    The products of which the status must be changed by
+    `Product.update_status_from_dates`, which uses the index of the
+    `volgende_transitie_datum`.
+    """
+    return Product.objects.filter(volgende_transitie_datum__lte=today)
+
+
+def updated_based_on_dates(
+    start_id: int | None = None, end_id: int | None = None
+) -> int:
+    """
+    Update the status of the products (with an id in [`start_id`, `end_id`)) of
+    which the start or eind datum has passed and return the number of updated
+    products.
+
+    Every chunk is updated in its own transaction. Products that are locked are
+    skipped, `Product.save` updates their status anyway.
+    """
+    products = (
+        get_products_to_update(date.today())
+        # the object representation of the audit logs contains the producttype naam
+        .select_related("producttype")
+        .prefetch_related("producttype__translations")
+        .only("status", "start_datum", "eind_datum", "producttype")
+        .order_by("pk")
+    )
+    if start_id is not None:
+        products = products.filter(pk__gte=start_id)
+    if end_id is not None:
+        products = products.filter(pk__lt=end_id)
+
+    updated = 0
+    last_id = None
+    while True:
+        with transaction.atomic():
+            chunk = list(
+                (
+                    products if last_id is None else products.filter(pk__gt=last_id)
+                ).select_for_update(of=("self",), skip_locked=True)[
+                    :PRODUCT_STATES_CHUNK_SIZE
+                ]
+            )
+            if not chunk:
+                break
 
+            now = timezone.now()
+            remarks = []
+            for product in chunk:
+                remarks.append(product.update_status_from_dates())
+                product.update_datum = now
 
-def updated_based_on_dates():
-    for product in Product.objects.iterator():
-        if product.check_start_datum() or product.check_eind_datum():
-            product.save()
+            Product.objects.bulk_update(
+                chunk, ["status", "volgende_transitie_datum", "update_datum"]
+            )
+            audit_automation_bulk_update(chunk, remarks)
+
+        last_id = chunk[-1].pk
+        updated += len(chunk)
+
+    return updated
 
 
 @app.task
-@transaction.atomic()
 def set_product_states():
-    updated_based_on_dates()
+    """
+    Split the products of which the status must be updated in id ranges, which are
+    updated by separate tasks.
+    """
+    ids = get_products_to_update(date.today()).aggregate(
+        first=Min("pk"), last=Max("pk")
+    )
+    if ids["first"] is None:
+        return
+
+    # the ranges are aligned, so overlapping runs lock the same ranges
+    first_start_id = (
+        ids["first"] // PRODUCT_STATES_SHARD_SIZE * PRODUCT_STATES_SHARD_SIZE
+    )
+    for start_id in range(first_start_id, ids["last"] + 1, PRODUCT_STATES_SHARD_SIZE):
+        set_product_states_for_range.delay(
+            start_id, start_id + PRODUCT_STATES_SHARD_SIZE
+        )
+
+
+@app.task
+def set_product_states_for_range(start_id: int, end_id: int):
+    with _try_advisory_lock(
+        PRODUCT_STATES_LOCK_KEY, start_id // PRODUCT_STATES_SHARD_SIZE
+    ) as acquired:
+        if not acquired:
+            logger.info("product_states_range_locked", start_id=start_id, end_id=end_id)
+            return
+
+        updated = updated_based_on_dates(start_id, end_id)
+
+    logger.info(
+        "product_states_updated", start_id=start_id, end_id=end_id, updated=updated
+    )
+
+
+@app.task
+def revalidate_schema_products(schema_id: int):
+    """
+    Log the products that don't conform to the (changed) json schema.
+    """
+    try:
+        schema = JsonSchema.objects.get(pk=schema_id)
+    except JsonSchema.DoesNotExist:
+        return
+
+    invalid_products = set()
+    for error in revalidate_products(schema):
+        invalid_products.add(error.uuid)
+        logger.warning(
+            "product_does_not_conform_to_schema",
+            schema=schema.naam,
+            product_uuid=str(error.uuid),
+            path=error.path,
+            message=error.message,
+        )
+
+    logger.info(
+        "schema_products_revalidated",
+        schema=schema.naam,
+        invalid_products=len(invalid_products),
+    )
+
+
+@app.task
+def sync_indexes():
+    sync_data_attr_indexes()
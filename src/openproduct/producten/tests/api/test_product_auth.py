@@ -1,12 +1,18 @@
 from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse, reverse_lazy
 
 from rest_framework import status
 
 from openproduct.accounts.models import User
 from openproduct.producten.tests.factories import ProductFactory
-from openproduct.producttypen.models.producttypepermission import PermissionModes
+from openproduct.producttypen.models.producttypepermission import (
+    PermissionModes,
+    _permissions_cache_key,
+)
 from openproduct.producttypen.tests.factories import (
     ProductTypeFactory,
     ProductTypePermissionFactory,
@@ -248,3 +254,43 @@ class TestProductAuth(BaseApiTestCase):
         permission.save()
         with self.subTest("producttype write permission"):
             self.assertStatusCode("delete", status.HTTP_204_NO_CONTENT, product)
+
+    def test_producttype_permissions_are_cached(self):
+        product = ProductFactory.create(producttype=self.producttype)
+        permission = ProductTypePermissionFactory.create(
+            producttype=self.producttype,
+            user=self.user,
+            mode=PermissionModes.read_only,
+        )
+        self.assertStatusCode("get", status.HTTP_200_OK, product)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertStatusCode("get", status.HTTP_200_OK, product)
+            response = self.assertStatusCode("get", status.HTTP_200_OK)
+            self.assertEqual(response.data["count"], 1)
+
+        self.assertFalse(
+            any(
+                "producttypen_producttypepermission" in query["sql"]
+                for query in queries.captured_queries
+            )
+        )
+
+        with self.subTest("deleted permission"):
+            permission.delete()
+
+            self.assertStatusCode("get", status.HTTP_403_FORBIDDEN, product)
+            response = self.assertStatusCode("get", status.HTTP_200_OK)
+            self.assertEqual(response.data["count"], 0)
+
+        with self.subTest("permissions cached before the commit"):
+            with self.captureOnCommitCallbacks(execute=True):
+                ProductTypePermissionFactory.create(
+                    producttype=self.producttype,
+                    user=self.user,
+                    mode=PermissionModes.read_only,
+                )
+                # e.g. by a request that doesn't see the permission yet
+                cache.set(_permissions_cache_key(self.user.pk), [])
+
+            self.assertStatusCode("get", status.HTTP_200_OK, product)
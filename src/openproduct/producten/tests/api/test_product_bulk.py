@@ -0,0 +1,444 @@
+from unittest.mock import patch
+from uuid import uuid4
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+
+from freezegun import freeze_time
+from notifications_api_common.models import NotificationsConfig
+from rest_framework import status
+from reversion.models import Version
+from vng_api_common.tests import get_validation_errors
+from zgw_consumers.constants import APITypes
+from zgw_consumers.models import Service
+
+from openproduct.accounts.models import User
+from openproduct.logging.constants import Events
+from openproduct.logging.models import TimelineLogProxy
+from openproduct.producten.models import Document, Eigenaar, Product
+from openproduct.producten.tests.factories import (
+    DocumentFactory,
+    EigenaarFactory,
+    ProductFactory,
+)
+from openproduct.producten.viewsets import ProductViewSet
+from openproduct.producttypen.models.enums import ProductStateChoices
+from openproduct.producttypen.models.producttypepermission import PermissionModes
+from openproduct.producttypen.tests.factories import (
+    ProductTypeFactory,
+    ProductTypePermissionFactory,
+)
+from openproduct.urn.models import UrnMappingConfig
+from openproduct.utils.tests.cases import BaseApiTestCase
+
+AANVRAAG_ZAAK_URN = (
+    "urn:nld:maykin:openzaak:ztc:zaak:uuid:d42613cd-ee22-4455-808c-c19c7b8442a1"
+)
+
+
+def create_urn_mapping():
+    UrnMappingConfig.objects.create(
+        urn="urn:nld:maykin:openzaak:ztc:zaak",
+        url="https://maykin.ztc.com/api/v1/zaken",
+    )
+
+
+def get_logs(product: Product, event: Events):
+    return TimelineLogProxy.objects.filter(
+        content_type=ContentType.objects.get_for_model(product),
+        object_id=product.pk,
+        extra_data__event=event,
+    )
+
+
+@freeze_time("2024-01-01")
+@override_settings(NOTIFICATIONS_DISABLED=True)
+class TestProductBulk(BaseApiTestCase):
+    is_superuser = True
+    path = reverse_lazy("product-bulk")
+
+    def setUp(self):
+        super().setUp()
+        self.producttype = ProductTypeFactory.create(
+            toegestane_statussen=["gereed", "actief"]
+        )
+        create_urn_mapping()
+
+    def get_data(self, **kwargs):
+        return {
+            "producttype_uuid": str(self.producttype.uuid),
+            "status": "initieel",
+            "eigenaren": [{"bsn": "111222333"}],
+            "documenten": [{"url": "https://gemeente-a.zgw.nl/documenten/1"}],
+            "aanvraag_zaak_urn": AANVRAAG_ZAAK_URN,
+        } | kwargs
+
+    def test_bulk_create(self):
+        data = [self.get_data(naam=f"product {i}") for i in range(3)]
+
+        response = self.client.post(self.path, data)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [product["naam"] for product in response.data],
+            ["product 0", "product 1", "product 2"],
+        )
+        self.assertEqual(Product.objects.count(), 3)
+        self.assertEqual(Eigenaar.objects.count(), 3)
+        self.assertEqual(Document.objects.count(), 3)
+
+        product = Product.objects.get(naam="product 1")
+        self.assertEqual(str(product.uuid), response.data[1]["uuid"])
+        self.assertEqual(product.eigenaren.get().bsn, "111222333")
+        self.assertEqual(
+            response.data[1]["eigenaren"],
+            [
+                {
+                    "uuid": str(product.eigenaren.get().uuid),
+                    "bsn": "111222333",
+                    "kvk_nummer": "",
+                    "vestigingsnummer": "",
+                    "klantnummer": "",
+                }
+            ],
+        )
+
+    def test_bulk_create_creates_logs_and_history(self):
+        response = self.client.post(self.path, [self.get_data(), self.get_data()])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        for product in Product.objects.all():
+            log = get_logs(product, Events.create).get()
+            self.assertEqual(len(log.extra_data["object_data"]["eigenaren"]), 1)
+            self.assertEqual(Version.objects.get_for_object(product).count(), 1)
+
+    def test_bulk_create_query_count_does_not_depend_on_the_number_of_products(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.path, [self.get_data()])
+
+        with CaptureQueriesContext(connection) as more_queries:
+            self.client.post(self.path, [self.get_data() for _ in range(5)])
+
+        def count_writes(queries):
+            return len(
+                [
+                    query
+                    for query in queries
+                    if query["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+                ]
+            )
+
+        self.assertEqual(Product.objects.count(), 6)
+        self.assertEqual(count_writes(queries), count_writes(more_queries))
+
+    def test_bulk_create_with_start_datum_changes_state_to_active(self):
+        response = self.client.post(
+            self.path, [self.get_data(start_datum="2024-01-01"), self.get_data()]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data[0]["status"], ProductStateChoices.ACTIEF)
+        self.assertEqual(response.data[1]["status"], ProductStateChoices.INITIEEL)
+
+        product = Product.objects.get(uuid=response.data[0]["uuid"])
+        self.assertEqual(get_logs(product, Events.update).count(), 1)
+
+    def test_bulk_create_with_invalid_items(self):
+        data = [
+            self.get_data(),
+            self.get_data(status="verlopen"),
+            self.get_data(eigenaren=[]),
+        ]
+
+        response = self.client.post(self.path, data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIsNotNone(get_validation_errors(response, "1.status"))
+        self.assertIsNotNone(get_validation_errors(response, "2.eigenaren"))
+        self.assertEqual(Product.objects.count(), 0)
+
+    @patch.object(ProductViewSet, "bulk_max_length", 2)
+    def test_bulk_create_too_many_items(self):
+        response = self.client.post(self.path, [self.get_data()] * 3)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Product.objects.count(), 0)
+
+    def test_bulk_update(self):
+        products = ProductFactory.create_batch(
+            2, producttype=self.producttype, aanvraag_zaak_urn=AANVRAAG_ZAAK_URN
+        )
+        other_product = ProductFactory.create(
+            producttype=self.producttype, aanvraag_zaak_urn=AANVRAAG_ZAAK_URN
+        )
+
+        response = self.client.patch(
+            self.path,
+            [
+                {"uuid": str(products[0].uuid), "naam": "eerste"},
+                {"uuid": str(products[1].uuid), "status": "gereed", "prijs": "10"},
+            ],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [product["uuid"] for product in response.data],
+            [str(products[0].uuid), str(products[1].uuid)],
+        )
+
+        products[0].refresh_from_db()
+        products[1].refresh_from_db()
+        other_product.refresh_from_db()
+        self.assertEqual(products[0].naam, "eerste")
+        self.assertEqual(products[0].status, ProductStateChoices.INITIEEL)
+        self.assertEqual(products[1].status, ProductStateChoices.GEREED)
+        self.assertEqual(str(products[1].prijs), "10.00")
+        self.assertEqual(other_product.status, ProductStateChoices.INITIEEL)
+
+        for product in products:
+            self.assertEqual(get_logs(product, Events.update).count(), 1)
+            self.assertEqual(Version.objects.get_for_object(product).count(), 1)
+
+    def test_bulk_update_nested_objects(self):
+        product = ProductFactory.create(
+            producttype=self.producttype, aanvraag_zaak_urn=AANVRAAG_ZAAK_URN
+        )
+        kept_eigenaar = EigenaarFactory.create(product=product, bsn="111222333")
+        EigenaarFactory.create(product=product, klantnummer="1234")
+        DocumentFactory.create(product=product)
+        untouched_product = ProductFactory.create(
+            producttype=self.producttype, aanvraag_zaak_urn=AANVRAAG_ZAAK_URN
+        )
+        untouched_eigenaar = EigenaarFactory.create(
+            product=untouched_product, bsn="111222333"
+        )
+
+        response = self.client.patch(
+            self.path,
+            [
+                {
+                    "uuid": str(product.uuid),
+                    "eigenaren": [
+                        {"uuid": str(kept_eigenaar.uuid), "bsn": "123456782"},
+                        {"kvk_nummer": "12345678"},
+                    ],
+                    "documenten": [],
+                },
+                {"uuid": str(untouched_product.uuid), "naam": "test"},
+            ],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(product.eigenaren.values_list("bsn", "kvk_nummer")),
+            {("123456782", ""), ("", "12345678")},
+        )
+        self.assertTrue(product.eigenaren.filter(uuid=kept_eigenaar.uuid).exists())
+        self.assertFalse(product.documenten.exists())
+        self.assertEqual(list(untouched_product.eigenaren.all()), [untouched_eigenaar])
+
+    def test_bulk_update_with_eigenaar_of_other_product(self):
+        product = ProductFactory.create(
+            producttype=self.producttype, aanvraag_zaak_urn=AANVRAAG_ZAAK_URN
+        )
+        other_eigenaar = EigenaarFactory.create()
+
+        response = self.client.patch(
+            self.path,
+            [
+                {
+                    "uuid": str(product.uuid),
+                    "eigenaren": [
+                        {"uuid": str(other_eigenaar.uuid), "bsn": "111222333"}
+                    ],
+                },
+            ],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIsNotNone(get_validation_errors(response, "0.eigenaren"))
+
+    def test_bulk_update_with_unknown_or_missing_uuid(self):
+        product = ProductFactory.create(
+            producttype=self.producttype, aanvraag_zaak_urn=AANVRAAG_ZAAK_URN
+        )
+
+        response = self.client.patch(
+            self.path,
+            [
+                {"uuid": str(product.uuid), "naam": "test"},
+                {"uuid": str(uuid4()), "naam": "test"},
+                {"naam": "test"},
+            ],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIsNone(get_validation_errors(response, "0.uuid"))
+        self.assertIsNotNone(get_validation_errors(response, "1.uuid"))
+        self.assertIsNotNone(get_validation_errors(response, "2.uuid"))
+
+        product.refresh_from_db()
+        self.assertEqual(product.naam, "")
+
+    def test_bulk_update_validates_each_item_with_its_product(self):
+        product = ProductFactory.create(
+            producttype=self.producttype, aanvraag_zaak_urn=AANVRAAG_ZAAK_URN
+        )
+        other_product = ProductFactory.create(
+            producttype=ProductTypeFactory.create(toegestane_statussen=["verlopen"]),
+            aanvraag_zaak_urn=AANVRAAG_ZAAK_URN,
+        )
+
+        response = self.client.patch(
+            self.path,
+            [
+                {"uuid": str(product.uuid), "status": "verlopen"},
+                {"uuid": str(other_product.uuid), "status": "verlopen"},
+            ],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIsNotNone(get_validation_errors(response, "0.status"))
+        self.assertIsNone(get_validation_errors(response, "1.status"))
+
+
+@override_settings(NOTIFICATIONS_DISABLED=False)
+class TestProductBulkNotifications(BaseApiTestCase):
+    is_superuser = True
+    path = reverse_lazy("product-bulk")
+
+    def setUp(self):
+        super().setUp()
+        service = Service.objects.create(
+            api_root="https://notificaties-api.vng.cloud/api/v1/",
+            api_type=APITypes.nrc,
+            client_id="test",
+            secret="test",
+        )
+        config = NotificationsConfig.get_solo()
+        config.notifications_api_service = service
+        config.save()
+        create_urn_mapping()
+
+    @patch("openproduct.producten.viewsets.product.send_notification.delay")
+    def test_bulk_create_sends_a_notification_per_product(self, mock_delay):
+        producttype = ProductTypeFactory.create()
+        data = {
+            "producttype_uuid": str(producttype.uuid),
+            "status": "initieel",
+            "eigenaren": [{"bsn": "111222333"}],
+            "aanvraag_zaak_urn": AANVRAAG_ZAAK_URN,
+        }
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.path, [data, data])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(mock_delay.call_count, 2)
+
+        message = mock_delay.call_args_list[1].args[0]
+        self.assertEqual(message["actie"], "create")
+        self.assertEqual(message["resourceUrl"], response.data[1]["url"])
+        self.assertEqual(
+            message["kenmerken"]["producttype.uuid"], str(producttype.uuid)
+        )
+
+    @patch("openproduct.producten.viewsets.product.send_notification.delay")
+    def test_no_notifications_when_invalid(self, mock_delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.path, [{}])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        mock_delay.assert_not_called()
+
+
+@override_settings(NOTIFICATIONS_DISABLED=True)
+class TestProductBulkAuth(BaseApiTestCase):
+    path = reverse_lazy("product-bulk")
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.get()
+        self.user.user_permissions.add(
+            *self.user.user_permissions.model.objects.filter(
+                codename__in=("add_product", "change_product")
+            )
+        )
+        self.producttype = ProductTypeFactory.create()
+        ProductTypePermissionFactory.create(
+            producttype=self.producttype,
+            user=self.user,
+            mode=PermissionModes.read_and_write,
+        )
+        create_urn_mapping()
+
+    def get_data(self, producttype):
+        return {
+            "producttype_uuid": str(producttype.uuid),
+            "status": "initieel",
+            "eigenaren": [{"bsn": "111222333"}],
+            "aanvraag_zaak_urn": AANVRAAG_ZAAK_URN,
+        }
+
+    def test_bulk_create_with_permission(self):
+        response = self.client.post(self.path, [self.get_data(self.producttype)])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_bulk_create_without_permission_for_one_producttype(self):
+        response = self.client.post(
+            self.path,
+            [
+                self.get_data(self.producttype),
+                self.get_data(ProductTypeFactory.create()),
+            ],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(Product.objects.count(), 0)
+
+    def test_bulk_update_of_product_without_permission(self):
+        product = ProductFactory.create(
+            producttype=self.producttype, aanvraag_zaak_urn=AANVRAAG_ZAAK_URN
+        )
+        read_only_producttype = ProductTypeFactory.create()
+        ProductTypePermissionFactory.create(
+            producttype=read_only_producttype,
+            user=self.user,
+            mode=PermissionModes.read_only,
+        )
+        read_only_product = ProductFactory.create(
+            producttype=read_only_producttype, aanvraag_zaak_urn=AANVRAAG_ZAAK_URN
+        )
+
+        response = self.client.patch(
+            self.path,
+            [
+                {"uuid": str(product.uuid), "naam": "test"},
+                {"uuid": str(read_only_product.uuid), "naam": "test"},
+            ],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIsNotNone(get_validation_errors(response, "1.uuid"))
+
+    def test_bulk_update_to_producttype_without_permission(self):
+        product = ProductFactory.create(
+            producttype=self.producttype, aanvraag_zaak_urn=AANVRAAG_ZAAK_URN
+        )
+
+        response = self.client.patch(
+            self.path,
+            [
+                {
+                    "uuid": str(product.uuid),
+                    "producttype_uuid": str(ProductTypeFactory.create().uuid),
+                },
+            ],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,104 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse, reverse_lazy
+
+from rest_framework import status
+
+from openproduct.producten.tests.factories import (
+    DocumentFactory,
+    EigenaarFactory,
+    ProductFactory,
+)
+from openproduct.utils.tests.cases import BaseApiTestCase
+
+
+class TestProductSparseFieldsets(BaseApiTestCase):
+    is_superuser = True
+    path = reverse_lazy("product-list")
+
+    def setUp(self):
+        super().setUp()
+        self.product = ProductFactory.create(dataobject={"kenteken": "AA-111-B"})
+        EigenaarFactory.create(product=self.product)
+        DocumentFactory.create(product=self.product)
+
+    def test_full_representation_by_default(self):
+        response = self.client.get(self.path)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("producttype", response.data["results"][0])
+        self.assertIn("eigenaren", response.data["results"][0])
+        self.assertIn("dataobject", response.data["results"][0])
+
+    def test_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.path, {"fields": "uuid,status,start_datum"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"],
+            [
+                {
+                    "uuid": str(self.product.uuid),
+                    "status": self.product.status,
+                    "start_datum": None,
+                }
+            ],
+        )
+
+        # no prefetches and the json fields are deferred
+        product_queries = [
+            query["sql"] for query in queries if "producten_" in query["sql"]
+        ]
+        self.assertEqual(len(product_queries), 2)  # count & page
+        self.assertNotIn('"dataobject"', product_queries[-1])
+
+    def test_fields_with_nested_field(self):
+        response = self.client.get(self.path, {"fields": "uuid,eigenaren"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data["results"][0].keys()), {"uuid", "eigenaren"})
+        self.assertEqual(len(response.data["results"][0]["eigenaren"]), 1)
+
+    def test_expand(self):
+        response = self.client.get(self.path, {"expand": "documenten"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result = response.data["results"][0]
+        self.assertEqual(len(result["documenten"]), 1)
+        self.assertIn("dataobject", result)
+        self.assertNotIn("producttype", result)
+        self.assertNotIn("eigenaren", result)
+
+    def test_fields_and_expand(self):
+        response = self.client.get(
+            self.path, {"fields": "uuid,dataobject", "expand": "producttype"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result = response.data["results"][0]
+        self.assertEqual(set(result.keys()), {"uuid", "dataobject", "producttype"})
+        self.assertEqual(result["dataobject"], {"kenteken": "AA-111-B"})
+        self.assertEqual(
+            result["producttype"]["uuid"], str(self.product.producttype.uuid)
+        )
+
+    def test_retrieve_with_fields(self):
+        response = self.client.get(
+            reverse("product-detail", args=[self.product.uuid]),
+            {"fields": "uuid,naam"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data.keys()), {"uuid", "naam"})
+
+    def test_unknown_fields(self):
+        response = self.client.get(
+            self.path, {"fields": "uuid,abc,producttype_uuid", "expand": "status"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            {param["name"] for param in response.data["invalid_params"]},
+            {"fields", "expand"},
+        )
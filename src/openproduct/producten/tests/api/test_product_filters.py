@@ -2,6 +2,8 @@ from datetime import date
 from decimal import Decimal
 from uuid import uuid4
 
+from django.db import connection
+from django.http import QueryDict
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 
@@ -10,6 +12,7 @@ from rest_framework import status
 from vng_api_common.tests import get_validation_errors
 
 from openproduct.locaties.tests.factories import LocatieFactory, OrganisatieFactory
+from openproduct.producten.models import Product
 from openproduct.producten.models.product import PrijsFrequentieChoices
 from openproduct.producten.tests.factories import (
     DocumentFactory,
@@ -18,6 +21,7 @@ from openproduct.producten.tests.factories import (
     TaakFactory,
     ZaakFactory,
 )
+from openproduct.producten.viewsets.product import ProductFilterSet
 from openproduct.producttypen.models.enums import ProductStateChoices
 from openproduct.producttypen.tests.factories import (
     JsonSchemaFactory,
@@ -999,6 +1003,76 @@ class TestProductFilters(BaseApiTestCase):
         self.assertEqual(response.data["count"], 1)
         self.assertEqual(response.data["results"][0]["verbruiksobject"]["naam"], "test")
 
+    def test_dataobject_attr_nested_filters(self):
+        ProductFactory(
+            dataobject={"auto": {"kenteken": "AA-111-B", "bouwjaar": "2010"}},
+        )
+        ProductFactory(
+            dataobject={"auto": {"kenteken": "BB-222-C", "bouwjaar": 2020}},
+        )
+        ProductFactory(dataobject={"auto": [{"kenteken": "AA-111-B"}]})
+        ProductFactory(dataobject={"naam": 'quote " and backslash \\'})
+
+        with self.subTest("nested exact"):
+            response = self.client.get(
+                self.path, {"dataobject_attr": "auto__kenteken__exact__AA-111-B"}
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["count"], 1)
+
+        with self.subTest("exact on string or number"):
+            response = self.client.get(
+                self.path,
+                {
+                    "dataobject_attr": (
+                        "auto__bouwjaar__exact__2010",
+                        "auto__kenteken__icontains__aa",
+                    )
+                },
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["count"], 1)
+
+            response = self.client.get(
+                self.path, {"dataobject_attr": "auto__bouwjaar__exact__2020"}
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["count"], 1)
+
+        with self.subTest("array index"):
+            response = self.client.get(
+                self.path, {"dataobject_attr": "auto__0__kenteken__exact__AA-111-B"}
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["count"], 1)
+
+        with self.subTest("escaped value"):
+            response = self.client.get(
+                self.path,
+                {"dataobject_attr": 'naam__exact__quote " and backslash \\'},
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["count"], 1)
+
+    def test_dataobject_attr_filter_uses_gin_index(self):
+        filterset = ProductFilterSet(
+            data=QueryDict(
+                "dataobject_attr=kenteken__exact__AA-111-B"
+                "&dataobject_attr=bouwjaar__gte__2010"
+            ),
+            queryset=Product.objects.all(),
+        )
+        self.assertTrue(filterset.is_valid())
+
+        with connection.cursor() as cursor:
+            # the test table is tiny, so without this the planner always picks a
+            # sequential scan regardless of the available indexes.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        plan = filterset.qs.explain()
+
+        self.assertIn("product_dataobject_gin", plan)
+
     def test_aanvraag_zaak_urn_filter(self):
         uuid = uuid4()
 
@@ -0,0 +1,88 @@
+import json
+from unittest.mock import patch
+
+from django.urls import reverse_lazy
+
+from rest_framework import status
+
+from openproduct.accounts.models import User
+from openproduct.producten.tests.factories import ProductFactory
+from openproduct.producten.viewsets import ProductViewSet
+from openproduct.producttypen.models.enums import ProductStateChoices
+from openproduct.producttypen.models.producttypepermission import PermissionModes
+from openproduct.producttypen.tests.factories import ProductTypePermissionFactory
+from openproduct.utils.tests.cases import BaseApiTestCase
+
+
+def get_lines(response) -> list[dict]:
+    content = b"".join(response.streaming_content)
+    return [json.loads(line) for line in content.splitlines()]
+
+
+class TestProductStream(BaseApiTestCase):
+    is_superuser = True
+    path = reverse_lazy("product-stream")
+
+    @patch.object(ProductViewSet, "stream_chunk_size", 2)
+    def test_stream_all_products(self):
+        products = ProductFactory.create_batch(5)
+
+        response = self.client.get(self.path)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        lines = get_lines(response)
+        self.assertEqual(
+            [line["uuid"] for line in lines],
+            [str(product.uuid) for product in reversed(products)],
+        )
+        self.assertEqual(
+            lines[0]["producttype"]["uuid"], str(products[-1].producttype.uuid)
+        )
+
+    def test_stream_with_accept_header(self):
+        ProductFactory.create()
+
+        response = self.client.get(self.path, HTTP_ACCEPT="application/x-ndjson")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(get_lines(response)), 1)
+
+    def test_stream_with_filters(self):
+        product = ProductFactory.create(status=ProductStateChoices.GEREED)
+        ProductFactory.create(status=ProductStateChoices.INITIEEL)
+
+        response = self.client.get(self.path, {"status": ProductStateChoices.GEREED})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [line["uuid"] for line in get_lines(response)], [str(product.uuid)]
+        )
+
+    def test_stream_with_invalid_filter(self):
+        response = self.client.get(self.path, {"dataobject_attr": "naam__abc__test"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestProductStreamAuth(BaseApiTestCase):
+    path = reverse_lazy("product-stream")
+
+    def test_stream_only_products_with_producttype_permission(self):
+        product = ProductFactory.create()
+        ProductFactory.create()
+
+        ProductTypePermissionFactory.create(
+            producttype=product.producttype,
+            user=User.objects.get(),
+            mode=PermissionModes.read_only,
+        )
+
+        response = self.client.get(self.path)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [line["uuid"] for line in get_lines(response)], [str(product.uuid)]
+        )
@@ -0,0 +1,191 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.http import QueryDict
+from django.test import TransactionTestCase
+
+from openproduct.producten.indexes import (
+    INDEX_PREFIX,
+    get_filter_indexed_attributes,
+    get_index_name,
+    get_indexed_attributes,
+    sync_data_attr_indexes,
+)
+from openproduct.producten.models import Product
+from openproduct.producten.tests.factories import ProductFactory
+from openproduct.producten.viewsets.product import ProductFilterSet
+from openproduct.producttypen.models import JsonSchema
+from openproduct.producttypen.tests.factories import (
+    JsonSchemaFactory,
+    ProductTypeFactory,
+)
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "kenteken": {"type": "string", "maxLength": 10},
+        "auto": {
+            "type": "object",
+            "properties": {"bouwjaar": {"type": "number"}},
+        },
+    },
+}
+
+
+def get_index_names() -> set[str]:
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, Product._meta.db_table
+        )
+    return {name for name in constraints if name.startswith(INDEX_PREFIX)}
+
+
+@patch("openproduct.producten.signals.sync_indexes.delay")
+class TestDataAttrIndexes(TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def tearDown(self):
+        super().tearDown()
+        # the indexes are not part of the model state, so they survive the flush
+        JsonSchema.objects.update(geindexeerde_eigenschappen=[])
+        sync_data_attr_indexes()
+
+    def test_indexed_attributes_of_used_schemas(self, mock_delay):
+        schema = JsonSchemaFactory.create(
+            schema=SCHEMA, geindexeerde_eigenschappen=["kenteken", "auto__bouwjaar"]
+        )
+        JsonSchemaFactory.create(schema=SCHEMA, geindexeerde_eigenschappen=["zone"])
+
+        self.assertEqual(get_indexed_attributes("dataobject"), set())
+
+        ProductTypeFactory.create(dataobject_schema=schema)
+
+        self.assertEqual(
+            get_indexed_attributes("dataobject"), {"kenteken", "auto__bouwjaar"}
+        )
+        self.assertEqual(get_indexed_attributes("verbruiksobject"), set())
+
+    def test_sync_creates_and_drops_indexes(self, mock_delay):
+        schema = JsonSchemaFactory.create(
+            schema=SCHEMA, geindexeerde_eigenschappen=["kenteken", "auto__bouwjaar"]
+        )
+        ProductTypeFactory.create(verbruiksobject_schema=schema)
+
+        mock_delay.assert_called()
+
+        sync_data_attr_indexes()
+
+        self.assertEqual(
+            get_index_names(),
+            {
+                get_index_name("verbruiksobject", "kenteken"),
+                get_index_name("verbruiksobject", "auto__bouwjaar"),
+            },
+        )
+
+        schema.geindexeerde_eigenschappen = ["auto__bouwjaar"]
+        schema.save()
+        sync_data_attr_indexes()
+
+        self.assertEqual(
+            get_index_names(), {get_index_name("verbruiksobject", "auto__bouwjaar")}
+        )
+
+    def test_filters_only_use_existing_indexes(self, mock_delay):
+        schema = JsonSchemaFactory.create(
+            schema=SCHEMA, geindexeerde_eigenschappen=["kenteken"]
+        )
+        ProductTypeFactory.create(dataobject_schema=schema)
+
+        self.assertEqual(get_filter_indexed_attributes("dataobject"), set())
+
+        sync_data_attr_indexes()
+
+        self.assertEqual(get_filter_indexed_attributes("dataobject"), {"kenteken"})
+
+        schema.geindexeerde_eigenschappen = ["auto__bouwjaar"]
+        schema.save()
+
+        self.assertEqual(get_filter_indexed_attributes("dataobject"), set())
+
+    def test_indexed_and_unindexed_filters_match_the_same_products(self, mock_delay):
+        producttype = ProductTypeFactory.create()
+        for bouwjaar in [2010, 2020, "2020", "onbekend", None, [2020]]:
+            ProductFactory.create(
+                producttype=producttype, dataobject={"auto": {"bouwjaar": bouwjaar}}
+            )
+        ProductFactory.create(producttype=producttype, dataobject={})
+
+        for value_part in [
+            "auto__bouwjaar__gte__2015",
+            "auto__bouwjaar__lt__2015",
+            "auto__bouwjaar__gt__2000-01-01",
+            "auto__bouwjaar__exact__2020",
+            "auto__bouwjaar__in__2010|onbekend",
+        ]:
+            with self.subTest(value_part):
+                filterset = ProductFilterSet(
+                    data=QueryDict(f"dataobject_attr={value_part}"),
+                    queryset=Product.objects.all(),
+                )
+                self.assertTrue(filterset.is_valid())
+
+                unindexed = set(filterset.qs.values_list("pk", flat=True))
+                with patch(
+                    "openproduct.producten.viewsets.product."
+                    "get_filter_indexed_attributes",
+                    return_value={"auto__bouwjaar"},
+                ):
+                    filterset = ProductFilterSet(
+                        data=QueryDict(f"dataobject_attr={value_part}"),
+                        queryset=Product.objects.all(),
+                    )
+                    self.assertTrue(filterset.is_valid())
+                    indexed = set(filterset.qs.values_list("pk", flat=True))
+
+                self.assertTrue(unindexed)
+                self.assertEqual(indexed, unindexed)
+
+    def test_filters_on_indexed_attributes_use_the_index(self, mock_delay):
+        schema = JsonSchemaFactory.create(
+            schema=SCHEMA, geindexeerde_eigenschappen=["kenteken", "auto__bouwjaar"]
+        )
+        producttype = ProductTypeFactory.create(dataobject_schema=schema)
+        ProductFactory.create(
+            producttype=producttype,
+            dataobject={"kenteken": "AA-111-B", "auto": {"bouwjaar": 2010}},
+        )
+        ProductFactory.create(
+            producttype=producttype,
+            dataobject={"kenteken": "BB-222-C", "auto": {"bouwjaar": 2020}},
+        )
+        sync_data_attr_indexes()
+
+        for value_part, index in [
+            ("kenteken__exact__AA-111-B", "kenteken"),
+            ("auto__bouwjaar__gte__2015", "auto__bouwjaar"),
+            ("auto__bouwjaar__in__2010|2011", "auto__bouwjaar"),
+        ]:
+            with self.subTest(value_part):
+                filterset = ProductFilterSet(
+                    data=QueryDict(f"dataobject_attr={value_part}"),
+                    queryset=Product.objects.all(),
+                )
+                self.assertTrue(filterset.is_valid())
+
+                with connection.cursor() as cursor:
+                    # the test table is tiny, so without this the planner always
+                    # picks a sequential scan regardless of the available indexes.
+                    cursor.execute("SET enable_seqscan = off")
+                try:
+                    # without the ordering, so the primary key index isn't preferred
+                    plan = filterset.qs.order_by().explain()
+                finally:
+                    with connection.cursor() as cursor:
+                        cursor.execute("RESET enable_seqscan")
+
+                self.assertIn(get_index_name("dataobject", index), plan)
+                self.assertEqual(filterset.qs.count(), 1)
@@ -1,10 +1,18 @@
+from datetime import date
+from importlib import import_module
+from unittest.mock import patch
+
 from django.db.migrations.exceptions import IrreversibleError
 from django.test import override_settings
 
-from openproduct.producten.models import Document, Taak, Zaak
+from openproduct.producten.models import Document, Product, Taak, Zaak
 from openproduct.urn.models import UrnMappingConfig
 from openproduct.utils.tests.cases import BaseMigrationTest
 
+volgende_transitie_datum_migration = import_module(
+    "openproduct.producten.migrations.0020_product_volgende_transitie_datum"
+)
+
 
 class TestExterneVerwijzingRemovalMigrations(BaseMigrationTest):
     app = "producten"
@@ -115,3 +123,43 @@ class TestExterneVerwijzingRemovalMigrations(BaseMigrationTest):
             Document.objects.get().urn,
             "urn:nld:maykin:openzaak:drc:document:1c8cc827-d537-40cd-9558-b5731e240622",
         )
+
+
+class TestVolgendeTransitieDatumMigration(BaseMigrationTest):
+    app = "producten"
+    migrate_from = "0019_product_json_gin_indexes"
+    migrate_to = "0020_product_volgende_transitie_datum"
+
+    def test_volgende_transitie_datum_is_set(self):
+        _Product = self.old_app_state.get_model("producten", "Product")
+        _ProductType = self.old_app_state.get_model("producttypen", "ProductType")
+        producttype = _ProductType.objects.create(code="pt-0")
+
+        cases = [
+            ("initieel", date(2025, 1, 1), date(2025, 2, 1), date(2025, 1, 1)),
+            ("gereed", None, date(2025, 2, 1), date(2025, 2, 1)),
+            ("actief", date(2025, 1, 1), date(2025, 2, 1), date(2025, 2, 1)),
+            ("actief", date(2025, 1, 1), None, None),
+            ("verlopen", date(2025, 1, 1), date(2025, 2, 1), None),
+            ("initieel", None, None, None),
+        ]
+        products = [
+            _Product.objects.create(
+                producttype=producttype,
+                status=status,
+                start_datum=start_datum,
+                eind_datum=eind_datum,
+            )
+            for status, start_datum, eind_datum, _expected in cases
+        ]
+
+        # the products are updated in multiple batches
+        with patch.object(volgende_transitie_datum_migration, "BATCH_SIZE", 2):
+            self._perform_migration()
+
+        for product, (status, *__, expected) in zip(products, cases, strict=True):
+            with self.subTest(status=status, expected=expected):
+                self.assertEqual(
+                    Product.objects.get(pk=product.pk).volgende_transitie_datum,
+                    expected,
+                )
@@ -2,19 +2,29 @@ from datetime import date
 from unittest.mock import patch
 
 from django.core.exceptions import ValidationError
+from django.db import connections
 from django.test import TestCase
 from django.utils.translation import gettext as _
 
 from freezegun import freeze_time
 
+from openproduct.logging.constants import Events
+from openproduct.logging.models import TimelineLogProxy
 from openproduct.producttypen.models.enums import ProductStateChoices
 from openproduct.producttypen.tests.factories import ProductTypeFactory
 
+from ..models import Product
 from ..models.validators import (
     validate_product_eind_datum,
     validate_product_start_datum,
     validate_product_status,
 )
+from ..tasks import (
+    PRODUCT_STATES_LOCK_KEY,
+    set_product_states,
+    set_product_states_for_range,
+    updated_based_on_dates,
+)
 from .factories import ProductFactory
 
 
@@ -151,6 +161,142 @@ class TestProductStateTask(TestCase):
                 self.assertEqual(product.status, state.value)
                 mock_audit_automation_update.assert_not_called()
 
+    def test_volgende_transitie_datum_is_maintained(self):
+        product = ProductFactory.create(
+            status="initieel",
+            producttype=self.producttype,
+            start_datum=date(2024, 2, 1),
+            eind_datum=date(2024, 3, 1),
+        )
+        self.assertEqual(product.volgende_transitie_datum, date(2024, 2, 1))
+
+        with freeze_time("2024-2-1"):
+            product.save()
+
+        self.assertEqual(product.status, "actief")
+        self.assertEqual(product.volgende_transitie_datum, date(2024, 3, 1))
+
+        product.status = "ingetrokken"
+        product.save()
+
+        self.assertIsNone(product.volgende_transitie_datum)
+
+
+class TestSetProductStatesTask(TestCase):
+    def setUp(self):
+        self.producttype = ProductTypeFactory.create(
+            toegestane_statussen=["actief", "verlopen"]
+        )
+
+        with freeze_time("2024-1-1"):
+            self.to_activate = ProductFactory.create_batch(
+                3,
+                status="initieel",
+                producttype=self.producttype,
+                start_datum=date(2024, 1, 2),
+            )
+            self.to_expire = ProductFactory.create(
+                status="actief",
+                producttype=self.producttype,
+                eind_datum=date(2024, 1, 2),
+            )
+            self.both = ProductFactory.create(
+                status="gereed",
+                producttype=self.producttype,
+                start_datum=date(2024, 1, 2),
+                eind_datum=date(2024, 1, 3),
+            )
+            self.unchanged = ProductFactory.create(
+                status="verlopen",
+                producttype=self.producttype,
+                start_datum=date(2024, 1, 2),
+                eind_datum=date(2024, 1, 3),
+            )
+
+    @freeze_time("2024-1-5")
+    @patch("openproduct.producten.tasks.PRODUCT_STATES_CHUNK_SIZE", 2)
+    def test_products_are_updated_in_chunks(self):
+        # per chunk: savepoint, select, producttype translations, update, audit logs
+        # & release (3 chunks), and the savepoint, select & release of the last
+        # empty chunk
+        with self.assertNumQueries(3 * 6 + 3):
+            updated = updated_based_on_dates()
+
+        self.assertEqual(updated, 5)
+        self.assertEqual(
+            {
+                pk: (status, volgende_transitie_datum)
+                for pk, status, volgende_transitie_datum in Product.objects.values_list(
+                    "pk", "status", "volgende_transitie_datum"
+                )
+            },
+            {
+                **{product.pk: ("actief", None) for product in self.to_activate},
+                self.to_expire.pk: ("verlopen", None),
+                # the start datum takes precedence, like `Product.save`
+                self.both.pk: ("actief", date(2024, 1, 3)),
+                self.unchanged.pk: ("verlopen", None),
+            },
+        )
+
+        logs = TimelineLogProxy.objects.filter(object_id=str(self.to_expire.pk))
+        self.assertEqual(len(logs), 1)
+        self.assertEqual(logs[0].event, Events.update)
+        self.assertEqual(
+            logs[0].extra_data["remarks"],
+            "Status is naar VERLOPEN gezet vanwege de eind datum.",
+        )
+        self.assertEqual(logs[0].get_related_object_repr(), str(self.to_expire))
+
+    @freeze_time("2024-1-5")
+    def test_products_are_updated_by_id_range(self):
+        updated = updated_based_on_dates(
+            start_id=self.to_activate[1].pk, end_id=self.to_expire.pk
+        )
+
+        self.assertEqual(updated, 2)
+        self.to_activate[0].refresh_from_db()
+        self.to_expire.refresh_from_db()
+        self.assertEqual(self.to_activate[0].status, "initieel")
+        self.assertEqual(self.to_expire.status, "actief")
+
+    @freeze_time("2024-1-5")
+    @patch("openproduct.producten.tasks.PRODUCT_STATES_SHARD_SIZE", 2)
+    @patch("openproduct.producten.tasks.set_product_states_for_range.delay")
+    def test_ranges_are_updated_by_separate_tasks(self, mock_delay):
+        set_product_states()
+
+        first_id = self.to_activate[0].pk // 2 * 2
+        self.assertEqual(
+            [call.args for call in mock_delay.call_args_list],
+            [
+                (start_id, start_id + 2)
+                for start_id in range(first_id, self.both.pk + 1, 2)
+            ],
+        )
+
+    @freeze_time("2024-1-5")
+    def test_locked_ranges_are_skipped(self):
+        other_connection = connections.create_connection("default")
+        self.addCleanup(other_connection.close)
+        with other_connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_lock(%s, %s)", [PRODUCT_STATES_LOCK_KEY, 0]
+            )
+
+        set_product_states_for_range(0, 100_000)
+
+        self.to_expire.refresh_from_db()
+        self.assertEqual(self.to_expire.status, "actief")
+
+        with other_connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock_all()")
+
+        set_product_states_for_range(0, 100_000)
+
+        self.to_expire.refresh_from_db()
+        self.assertEqual(self.to_expire.status, "verlopen")
+
 
 class TestProductValidateMethods(TestCase):
     def test_validate_product_start_datum_raises_when_start_datum_is_set_and_actief_not_in_toegestane_statussen(
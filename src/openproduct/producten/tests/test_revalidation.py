@@ -0,0 +1,247 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from django_webtest import WebTest
+from maykin_2fa.test import disable_admin_mfa
+from structlog.testing import capture_logs
+
+from openproduct.accounts.tests.factories import UserFactory
+from openproduct.producttypen.tests.factories import (
+    JsonSchemaFactory,
+    ProductTypeFactory,
+)
+
+from ..revalidation import (
+    InvalidProduct,
+    get_products_to_revalidate,
+    revalidate_products,
+)
+from ..tasks import revalidate_schema_products
+from .factories import ProductFactory
+
+SCHEMA = {
+    "type": "object",
+    "properties": {"uren": {"type": "integer"}},
+    "required": ["uren"],
+}
+
+
+class RevalidateProductsTests(TestCase):
+    def setUp(self):
+        self.schema = JsonSchemaFactory.create(schema=SCHEMA)
+        dataobject_producttype = ProductTypeFactory.create(
+            dataobject_schema=self.schema
+        )
+        verbruiksobject_producttype = ProductTypeFactory.create(
+            verbruiksobject_schema=self.schema
+        )
+
+        self.valid = ProductFactory.create(
+            producttype=dataobject_producttype, dataobject={"uren": 1}
+        )
+        self.invalid_dataobject = ProductFactory.create(
+            producttype=dataobject_producttype, dataobject={"uren": "1"}
+        )
+        self.invalid_verbruiksobject = ProductFactory.create(
+            producttype=verbruiksobject_producttype,
+            verbruiksobject={},
+            # not validated with this schema
+            dataobject={},
+        )
+        # not validated without data
+        ProductFactory.create(producttype=dataobject_producttype, dataobject=None)
+        # not validated with another schema
+        ProductFactory.create(dataobject={})
+
+        self.expected = {
+            InvalidProduct(
+                self.invalid_dataobject.uuid,
+                "dataobject.uren",
+                "'1' is not of type 'integer'",
+            ),
+            InvalidProduct(
+                self.invalid_verbruiksobject.uuid,
+                "verbruiksobject",
+                "'uren' is a required property",
+            ),
+        }
+
+    def test_revalidate_in_current_process(self):
+        self.assertEqual(
+            set(revalidate_products(self.schema, processes=1, chunk_size=1)),
+            self.expected,
+        )
+
+    def test_revalidate_in_process_pool(self):
+        self.assertEqual(
+            set(revalidate_products(self.schema, processes=2, chunk_size=1)),
+            self.expected,
+        )
+
+    def test_revalidate_with_unsaved_schema(self):
+        self.schema.schema = {"type": "object"}
+
+        self.assertEqual(list(revalidate_products(self.schema, processes=1)), [])
+
+    def test_limit(self):
+        def get_values(limit):
+            return [
+                (uuid, field)
+                for chunk in get_products_to_revalidate(
+                    self.schema, chunk_size=1, limit=limit
+                )
+                for uuid, field, value in chunk
+            ]
+
+        self.assertEqual(
+            get_values(2),
+            [
+                (self.valid.uuid, "dataobject"),
+                (self.invalid_dataobject.uuid, "dataobject"),
+            ],
+        )
+        self.assertEqual(
+            get_values(3)[2], (self.invalid_verbruiksobject.uuid, "verbruiksobject")
+        )
+        self.assertEqual(len(get_values(None)), 3)
+
+    def test_command(self):
+        stdout = StringIO()
+        stderr = StringIO()
+
+        call_command(
+            "revalidate_products",
+            self.schema.naam,
+            "--processes=1",
+            stdout=stdout,
+            stderr=stderr,
+        )
+
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual(lines[0], "uuid,path,message")
+        self.assertCountEqual(
+            lines[1:],
+            [
+                f"{self.invalid_dataobject.uuid},dataobject.uren,'1' is not of type "
+                "'integer'",
+                f"{self.invalid_verbruiksobject.uuid},verbruiksobject,'uren' is a "
+                "required property",
+            ],
+        )
+        self.assertEqual(stderr.getvalue().strip(), "2 invalid product(s)")
+
+    def test_task_logs_the_invalid_products(self):
+        with capture_logs() as logs:
+            revalidate_schema_products(self.schema.pk)
+
+        self.assertCountEqual(
+            [
+                (log["product_uuid"], log["path"])
+                for log in logs
+                if log["event"] == "product_does_not_conform_to_schema"
+            ],
+            [
+                (str(self.invalid_dataobject.uuid), "dataobject.uren"),
+                (str(self.invalid_verbruiksobject.uuid), "verbruiksobject"),
+            ],
+        )
+        self.assertEqual(logs[-1]["event"], "schema_products_revalidated")
+        self.assertEqual(logs[-1]["invalid_products"], 2)
+
+
+@override_settings(LANGUAGE_CODE="en")
+@disable_admin_mfa()
+class RevalidationPreviewAdminTests(WebTest):
+    def setUp(self):
+        self.superuser = UserFactory.create(superuser=True)
+        self.schema = JsonSchemaFactory.create(schema={"type": "object"})
+        self.product = ProductFactory.create(
+            producttype=ProductTypeFactory.create(dataobject_schema=self.schema),
+            dataobject={"uren": "1"},
+        )
+
+    @patch("openproduct.producttypen.admin.jsonschema.revalidate_schema_products.delay")
+    def test_validate_products_action(self, mock_delay):
+        changelist = self.app.get(
+            reverse("admin:producttypen_jsonschema_changelist"), user=self.superuser
+        )
+        form = changelist.forms["changelist-form"]
+        form["action"] = "validate_products"
+        form["_selected_action"] = [self.schema.pk]
+
+        form.submit().follow()
+
+        mock_delay.assert_called_once_with(self.schema.pk)
+
+    def test_preview_does_not_save_the_schema(self):
+        change_page = self.app.get(
+            reverse("admin:producttypen_jsonschema_change", args=(self.schema.pk,)),
+            user=self.superuser,
+        )
+        preview_page = change_page.click(description="Voorbeeld validatie producten")
+
+        with self.subTest("valid"):
+            response = preview_page.forms["revalidation-preview-form"].submit()
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.pyquery("#revalidation-valid")), 1)
+
+        with self.subTest("invalid"):
+            form = preview_page.forms["revalidation-preview-form"]
+            form["schema"] = '{"type": "object", "required": ["naam"]}'
+            response = form.submit()
+
+            self.assertEqual(response.status_code, 200)
+            rows = response.pyquery("#revalidation-errors tbody tr")
+            self.assertEqual(len(rows), 1)
+            self.assertIn(str(self.product.uuid), rows.text())
+            self.assertIn("'naam' is a required property", rows.text())
+
+            self.schema.refresh_from_db()
+            self.assertEqual(self.schema.schema, {"type": "object"})
+
+        with self.subTest("invalid schema"):
+            form = preview_page.forms["revalidation-preview-form"]
+            form["schema"] = '{"type": "unknown"}'
+            response = form.submit()
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.pyquery("#revalidation-errors")), 0)
+            self.assertEqual(len(response.pyquery(".errorlist")), 1)
+
+    @patch(
+        "openproduct.producttypen.admin.jsonschema.REVALIDATION_PREVIEW_SAMPLE_SIZE", 1
+    )
+    def test_preview_validates_a_sample_of_the_products(self):
+        ProductFactory.create(
+            producttype=self.product.producttype, dataobject={"uren": "2"}
+        )
+        preview_page = self.app.get(
+            reverse(
+                "admin:producttypen_jsonschema_revalidation_preview",
+                args=(self.schema.pk,),
+            ),
+            user=self.superuser,
+        )
+        form = preview_page.forms["revalidation-preview-form"]
+
+        with self.subTest("invalid"):
+            form["schema"] = '{"type": "object", "required": ["naam"]}'
+            response = form.submit()
+
+            self.assertEqual(len(response.pyquery("#revalidation-errors tbody tr")), 1)
+            self.assertIn(
+                "ten minste 1 product ongeldig is",
+                response.pyquery("#revalidation-sampled").text(),
+            )
+
+        with self.subTest("valid"):
+            form["schema"] = '{"type": "object"}'
+            response = form.submit()
+
+            self.assertEqual(len(response.pyquery("#revalidation-valid")), 0)
+            self.assertEqual(len(response.pyquery("#revalidation-sampled")), 1)
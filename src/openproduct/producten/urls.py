@@ -23,6 +23,8 @@ De Producten API heeft 1 endpoint `producten`. Hiermee kunnen producten zelf, de
 Een product is een instantie van een producttype (zie producttypen API), in een product worden onder andere de gegevens van de eigenaar, de benodigde data voor het product en bijvoorbeeld de status vastgelegd.
 Specifieke product data kan worden opgeslagen in de JSON velden `dataobject` en `verbruiksobject`. Deze velden worden gevalideerd door de `verbruiksobject_schema` & `dataobject_schema` velden van het producttype ([zie jsonschema](https://json-schema.org)).
 De status van een product kan alleen worden veranderd naar de een van de `toegestane statussen` gedefineerd op het producttype.
+Om grote aantallen producten op te halen kan `producten/stream` worden gebruikt. Deze geeft alle producten die aan de filters voldoen als NDJSON (één product per regel) zonder paginering.
+Met `producten/bulk` kunnen meerdere producten in één request worden aangemaakt (`POST`) of deels bijgewerkt (`PATCH`, op basis van de `uuid`).
 
 ### Eigenaar
 Aan een product kunnen één of meerdere eigenaren worden gelinkt. Een eigenaar kan een Klant/Partij (Klantinteracties API), natuurlijk of niet natuurlijke persoon zijn.
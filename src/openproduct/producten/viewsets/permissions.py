@@ -1,27 +1,41 @@
+from uuid import UUID
+
 from rest_framework.permissions import BasePermission
 
 from openproduct.producttypen.models.producttypepermission import (
-    PermissionModes,
-    ProductTypePermission,
+    get_producttype_permissions,
 )
 
 
 class ProductTypeObjectPermission(BasePermission):
-    def user_has_rw_perm_for_producttype_uuid(self, user, producttype_uuid: str):
-        return ProductTypePermission.objects.filter(
-            user=user,
-            producttype__uuid=producttype_uuid,
-            mode=PermissionModes.read_and_write,
-        ).exists()
+    def get_bulk_producttype_uuids(self, data) -> set[UUID]:
+        producttype_uuids = set()
+        for item in data if isinstance(data, list) else []:
+            try:
+                producttype_uuids.add(UUID(str(item["producttype_uuid"])))
+            except (TypeError, KeyError, ValueError):
+                # invalid items are rejected by the serializer
+                continue
+        return producttype_uuids
 
     def has_permission(self, request, view):
         if request.user.is_superuser:
             return True
 
+        permissions = get_producttype_permissions(request)
+
         if view.action == "create":
-            producttype_uuid = request.data.get("producttype_uuid")
-            if not self.user_has_rw_perm_for_producttype_uuid(
-                request.user, producttype_uuid
+            if not permissions.has_permission_for_uuid(
+                request.data.get("producttype_uuid"), write=True
+            ):
+                return False
+
+        # the permissions of the current producttypes of bulk updated products are
+        # checked when they are retrieved
+        if view.action in ("bulk_create", "bulk_update"):
+            if not all(
+                permissions.has_permission_for_uuid(producttype_uuid, write=True)
+                for producttype_uuid in self.get_bulk_producttype_uuids(request.data)
             ):
                 return False
 
@@ -31,22 +45,16 @@ class ProductTypeObjectPermission(BasePermission):
         if request.user.is_superuser:
             return True
 
+        permissions = get_producttype_permissions(request)
+
         # check permission for new producttype passed in update
-        if new_producttype_id := request.data.get("producttype_uuid"):
-            if new_producttype_id != obj.producttype.uuid:
-                if not self.user_has_rw_perm_for_producttype_uuid(
-                    request.user, new_producttype_id
+        if new_producttype_uuid := request.data.get("producttype_uuid"):
+            if str(new_producttype_uuid) != str(obj.producttype.uuid):
+                if not permissions.has_permission_for_uuid(
+                    new_producttype_uuid, write=True
                 ):
                     return False
 
-        obj_producttype_perm = ProductTypePermission.objects.filter(
-            user=request.user, producttype=obj.producttype
-        ).first()
-
-        if not obj_producttype_perm:
-            return False
-
-        if view.action == "retrieve":
-            return True
-
-        return obj_producttype_perm.mode == PermissionModes.read_and_write
+        return permissions.has_permission(
+            obj.producttype_id, write=view.action != "retrieve"
+        )
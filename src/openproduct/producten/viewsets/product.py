@@ -1,23 +1,48 @@
 from datetime import date
+from uuid import UUID
 
 from django.db import transaction
 from django.db.models import Prefetch, Q
+from django.http import StreamingHttpResponse
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 import django_filters
+import reversion
 import structlog
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from notifications_api_common.models import NotificationsConfig
+from notifications_api_common.settings import get_setting
+from notifications_api_common.tasks import send_notification
 from notifications_api_common.viewsets import NotificationViewSetMixin
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import DjangoModelPermissions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 from vng_api_common.utils import get_help_text
 
-from openproduct.logging.api_tools import AuditTrailViewSetMixin
+from openproduct.logging.api_tools import (
+    AuditTrailViewSetMixin,
+    extract_audit_parameters,
+)
+from openproduct.logging.logevent import audit_api_bulk_create, audit_api_bulk_update
+from openproduct.logging.serializing import serialize_instance
+from openproduct.producten.indexes import get_filter_indexed_attributes
 from openproduct.producten.kanalen import KANAAL_PRODUCTEN
 from openproduct.producten.models import Product
-from openproduct.producten.serializers.product import ProductSerializer
+from openproduct.producten.serializers.product import (
+    ProductBulkUpdateSerializer,
+    ProductSerializer,
+)
 from openproduct.producten.viewsets.permissions import ProductTypeObjectPermission
-from openproduct.producttypen.models import ProductType, ProductTypePermission, Thema
+from openproduct.producttypen.models import ProductType, Thema
+from openproduct.producttypen.models.producttypepermission import (
+    get_producttype_permissions,
+)
 from openproduct.utils.enums import Operators
 from openproduct.utils.filters import (
     CharArrayFilter,
@@ -26,9 +51,11 @@ from openproduct.utils.filters import (
     TranslationFilter,
     TranslationInFilter,
     UUIDFInFilter,
-    filter_data_attr_value_part,
+    filter_data_attr,
 )
 from openproduct.utils.helpers import display_choice_values_for_help_text
+from openproduct.utils.renderers import NDJSONRenderer
+from openproduct.utils.serializers import get_list_query_param
 from openproduct.utils.validators import validate_data_attr
 
 from ..metrics import (
@@ -62,6 +89,31 @@ Bijvoorbeeld: `dataobject_attr=kenteken__exact__AA-111-B&objectdata_attr=zone__e
 ).format(display_choice_values_for_help_text(Operators))
 
 
+SPARSE_FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        name="fields",
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        description=_(
+            "Komma gescheiden lijst van de velden die worden teruggegeven, "
+            "bijvoorbeeld `uuid,status,start_datum`. Geneste objecten "
+            "(`producttype`, `eigenaren`, `documenten`, `zaken` & `taken`) worden "
+            "alleen teruggegeven als ze in `fields` of `expand` staan."
+        ),
+    ),
+    OpenApiParameter(
+        name="expand",
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        description=_(
+            "Komma gescheiden lijst van geneste objecten die worden teruggegeven, "
+            "bijvoorbeeld `producttype,eigenaren`. Zonder `fields` worden alle "
+            "andere velden ook teruggegeven."
+        ),
+    ),
+]
+
+
 class ProductFilterSet(FilterSet):
     uniforme_product_naam = django_filters.CharFilter(
         field_name="producttype__uniforme_product_naam__naam",
@@ -155,18 +207,17 @@ class ProductFilterSet(FilterSet):
         return queryset.filter(filter_expr) if value else queryset.exclude(filter_expr)
 
     def filter_dataobject_attr(self, queryset, name, value: list):
-        for value_part in value:
-            queryset = filter_data_attr_value_part(value_part, "dataobject", queryset)
-
-        return queryset
+        return filter_data_attr(
+            value, "dataobject", queryset, get_filter_indexed_attributes("dataobject")
+        )
 
     def filter_verbruiksobject_attr(self, queryset, name, value: list):
-        for value_part in value:
-            queryset = filter_data_attr_value_part(
-                value_part, "verbruiksobject", queryset
-            )
-
-        return queryset
+        return filter_data_attr(
+            value,
+            "verbruiksobject",
+            queryset,
+            get_filter_indexed_attributes("verbruiksobject"),
+        )
 
     class Meta:
         model = Product
@@ -203,9 +254,11 @@ class ProductFilterSet(FilterSet):
     list=extend_schema(
         summary="Alle PRODUCTEN opvragen.",
         description="Deze lijst kan gefilterd wordt met query-string parameters.",
+        parameters=SPARSE_FIELDSET_PARAMETERS,
     ),
     retrieve=extend_schema(
         summary="Een specifiek PRODUCT opvragen.",
+        parameters=SPARSE_FIELDSET_PARAMETERS,
     ),
     create=extend_schema(
         summary="Maak een PRODUCT aan.",
@@ -227,34 +280,275 @@ class ProductViewSet(AuditTrailViewSetMixin, NotificationViewSetMixin, ModelView
     filterset_class = ProductFilterSet
     notifications_kanaal = KANAAL_PRODUCTEN
     permission_classes = [ProductTypeObjectPermission, DjangoModelPermissions]
+    stream_chunk_size = 500
+    bulk_max_length = 500
+
+    @cached_property
+    def requested_fields(self) -> set[str] | None:
+        """
+        The fields requested with the `fields` & `expand` query parameters, `None`
+        for the full representation.
+        """
+        if self.action not in ("list", "retrieve", "stream"):
+            return None
+
+        fields = get_list_query_param(self.request, "fields")
+        expand = get_list_query_param(self.request, "expand")
+        if not fields and not expand:
+            return None
+
+        readable_fields = {
+            name
+            for name, field in self.get_serializer_class()().fields.items()
+            if not field.write_only
+        }
+        nested_fields = set(ProductSerializer.nested_fields)
+        errors = {}
+
+        if unknown := fields - readable_fields:
+            errors["fields"] = _("Onbekende velden: %(fields)s.") % {
+                "fields": ", ".join(sorted(unknown))
+            }
+        if unknown := expand - nested_fields:
+            errors["expand"] = _(
+                "Onbekende geneste objecten: %(fields)s, kies uit: %(choices)s."
+            ) % {
+                "fields": ", ".join(sorted(unknown)),
+                "choices": ", ".join(ProductSerializer.nested_fields),
+            }
+        if errors:
+            raise ValidationError(errors)
+
+        return (fields or readable_fields - nested_fields) | expand
+
+    def get_serializer_class(self):
+        if self.action == "bulk_update":
+            return ProductBulkUpdateSerializer
+        return super().get_serializer_class()
+
+    def get_serializer_context(self):
+        return super().get_serializer_context() | {
+            "requested_fields": self.requested_fields
+        }
 
     def get_queryset(self):
-        if self.action != "list" or self.request.user.is_superuser:
+        if self.action not in ("list", "stream") or self.request.user.is_superuser:
             qs = Product.objects.all()
         else:
             qs = Product.objects.filter(
-                producttype__in=ProductTypePermission.objects.filter(
-                    user=self.request.user
-                ).values("producttype")
+                producttype__in=get_producttype_permissions(
+                    self.request
+                ).producttype_ids()
             )
 
-        return qs.prefetch_related(
-            "eigenaren",
-            "documenten",
-            "taken",
-            "zaken",
-            Prefetch(
-                "producttype",
-                queryset=ProductType.objects.select_related(
-                    "uniforme_product_naam"
-                ).prefetch_related(
-                    "translations",
-                    Prefetch(
-                        "themas", queryset=Thema.objects.select_related("hoofd_thema")
+        def is_requested(field: str) -> bool:
+            return self.requested_fields is None or field in self.requested_fields
+
+        prefetches = [
+            field
+            for field in ("eigenaren", "documenten", "taken", "zaken")
+            if is_requested(field)
+        ]
+        if is_requested("producttype"):
+            producttype_related = ["uniforme_product_naam"]
+            if self.action in ("update", "partial_update", "bulk_update"):
+                # the schemas are used to validate the verbruiksobject & dataobject
+                producttype_related += ["dataobject_schema", "verbruiksobject_schema"]
+
+            prefetches.append(
+                Prefetch(
+                    "producttype",
+                    queryset=ProductType.objects.select_related(
+                        *producttype_related
+                    ).prefetch_related(
+                        "translations",
+                        Prefetch(
+                            "themas",
+                            queryset=Thema.objects.select_related("hoofd_thema"),
+                        ),
                     ),
-                ),
-            ),
+                )
+            )
+
+        # the json fields can be large
+        deferred = [
+            field
+            for field in ("verbruiksobject", "dataobject")
+            if not is_requested(field)
+        ]
+
+        return qs.defer(*deferred).prefetch_related(*prefetches)
+
+    @extend_schema(
+        summary="Alle PRODUCTEN streamen.",
+        description=(
+            "Geeft alle producten die aan de query-string parameters voldoen als "
+            "NDJSON, één product per regel, zonder paginering. Bedoeld voor het "
+            "synchroniseren van grote aantallen producten."
+        ),
+        parameters=SPARSE_FIELDSET_PARAMETERS,
+        responses={(200, "application/x-ndjson"): ProductSerializer(many=True)},
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        pagination_class=None,
+        renderer_classes=[NDJSONRenderer, JSONRenderer],
+    )
+    def stream(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        return StreamingHttpResponse(
+            self.stream_ndjson(queryset), content_type="application/x-ndjson"
+        )
+
+    def stream_ndjson(self, queryset):
+        # iterator uses a server-side cursor and does the prefetches per chunk
+        renderer = NDJSONRenderer()
+        context = self.get_serializer_context()
+
+        for product in queryset.iterator(chunk_size=self.stream_chunk_size):
+            data = self.get_serializer_class()(product, context=context).data
+            yield renderer.render(data)
+
+    @extend_schema(
+        summary="Maak meerdere PRODUCTEN aan.",
+        description=(
+            "Maakt maximaal {max_length} producten in één keer aan. Alle producten "
+            "worden gevalideerd voordat er één wordt aangemaakt, de fouten worden "
+            "per index teruggegeven (bijvoorbeeld `1.status`)."
+        ).format(max_length=bulk_max_length),
+        request=ProductSerializer(many=True),
+        responses={201: ProductSerializer(many=True)},
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk",
+        url_name="bulk",
+        filter_backends=[],
+        pagination_class=None,
+    )
+    def bulk_create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(
+            data=request.data, many=True, max_length=self.bulk_max_length
+        )
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            products = self.perform_bulk_save(serializer, audit_api_bulk_create)
+            data = self.get_serializer(products, many=True).data
+            self.notify_bulk(products, data, "create")
+
+        logger.info("products_bulk_created", count=len(products))
+        product_create_counter.add(len(products))
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary="Werk meerdere PRODUCTEN deels bij.",
+        description=(
+            "Werkt maximaal {max_length} producten in één keer deels bij, de "
+            "producten worden geïdentificeerd met de `uuid`. Alle producten worden "
+            "gevalideerd voordat er één wordt bijgewerkt, de fouten worden per index "
+            "teruggegeven (bijvoorbeeld `1.status`)."
+        ).format(max_length=bulk_max_length),
+        request=ProductBulkUpdateSerializer(many=True),
+        responses={200: ProductSerializer(many=True)},
+    )
+    @bulk_create.mapping.patch
+    def bulk_update(self, request, *args, **kwargs):
+        serializer = self.get_serializer(
+            self.get_bulk_update_instances(request.data),
+            data=request.data,
+            many=True,
+            partial=True,
+            max_length=self.bulk_max_length,
         )
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            products = self.perform_bulk_save(serializer, audit_api_bulk_update)
+            data = ProductSerializer(
+                products, many=True, context=self.get_serializer_context()
+            ).data
+            self.notify_bulk(products, data, "partial_update")
+
+        logger.info("products_bulk_updated", count=len(products))
+        product_update_counter.add(len(products))
+        return Response(data)
+
+    def get_bulk_update_instances(self, data) -> list[Product]:
+        """
+        The products of the `uuid`s in the data that the user is allowed to update.
+        """
+        uuids = []
+        if isinstance(data, list):
+            for item in data:
+                try:
+                    uuids.append(UUID(str(item["uuid"])))
+                except (TypeError, KeyError, ValueError):
+                    continue
+
+        qs = self.get_queryset().filter(uuid__in=uuids)
+        if not self.request.user.is_superuser:
+            qs = qs.filter(
+                producttype__in=get_producttype_permissions(
+                    self.request
+                ).producttype_ids(write=True)
+            )
+        return list(qs)
+
+    def perform_bulk_save(self, serializer, audit) -> list[Product]:
+        """
+        Save the products and write the audit logs & versions of all the products at
+        once. Returns the saved products with their relations prefetched.
+        """
+        saved = serializer.save()
+        products = self.get_queryset().in_bulk([product.pk for product in saved])
+        products = [products[product.pk] for product in saved]
+
+        user_id, user_repr, remarks = extract_audit_parameters(self.request)
+        audit(
+            content_objects=products,
+            user_id=user_id,
+            user_display=user_repr,
+            object_data=[serialize_instance(product) for product in products],
+            remarks=remarks,
+        )
+
+        # bulk_create & bulk_update don't send the signals that add the products to
+        # the revision of the request
+        if reversion.is_active():
+            for product in products:
+                reversion.add_to_revision(product)
+
+        return products
+
+    def notify_bulk(self, products: list[Product], data: list[dict], action: str):
+        """
+        Schedule the notifications of multiple products at once, like `notify` does
+        for a single product.
+        """
+        if get_setting("NOTIFICATIONS_DISABLED"):
+            return
+
+        if NotificationsConfig.get_client() is None:
+            if get_setting("NOTIFICATIONS_GUARANTEE_DELIVERY"):
+                raise RuntimeError(
+                    "Notifications API configuration is broken or absent."
+                )
+            return
+
+        messages = [
+            self.construct_message(item, instance=product, action=action)
+            for product, item in zip(products, data, strict=True)
+        ]
+
+        def _send():
+            for message in messages:
+                send_notification.delay(message)
+
+        transaction.on_commit(_send)
 
     @transaction.atomic
     def perform_create(self, serializer):
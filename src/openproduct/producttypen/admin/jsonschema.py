@@ -1,12 +1,31 @@
 import json
 
 from django import forms
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.utils import unquote
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.http import Http404
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils.translation import gettext as _
 
 from reversion_compare.admin import CompareVersionAdmin
 
 from openproduct.logging.admin_tools import AdminAuditLogMixin
+from openproduct.producten.revalidation import (
+    get_products_to_revalidate,
+    validate_chunk,
+)
+from openproduct.producten.tasks import revalidate_schema_products
 from openproduct.producttypen.models import JsonSchema
+from openproduct.utils.jsonschema_validators import build_validator
+
+# the maximum number of errors that are shown by the revalidation preview
+REVALIDATION_PREVIEW_LIMIT = 100
+
+# the maximum number of product values that are validated by the revalidation
+# preview, the action validates all products in the background
+REVALIDATION_PREVIEW_SAMPLE_SIZE = 1000
 
 
 class IndentedJSONEncoder(json.JSONEncoder):
@@ -22,10 +41,93 @@ class JsonSchemaAdminForm(forms.ModelForm):
         fields = "__all__"
 
 
+class RevalidationPreviewForm(forms.Form):
+    schema = forms.JSONField(
+        label=_("schema"),
+        encoder=IndentedJSONEncoder,
+        widget=forms.Textarea(attrs={"rows": 20, "cols": 80}),
+    )
+
+
 @admin.register(JsonSchema)
 class JsonSchemaAdmin(AdminAuditLogMixin, CompareVersionAdmin):
     form = JsonSchemaAdminForm
     search_fields = ["naam"]
+    actions = ["validate_products"]
+
+    @admin.action(description=_("Producten valideren"))
+    def validate_products(self, request, queryset):
+        for schema in queryset:
+            revalidate_schema_products.delay(schema.pk)
+
+        self.message_user(
+            request,
+            _("De producten worden gevalideerd, de ongeldige producten worden gelogd."),
+            level=messages.SUCCESS,
+        )
+
+    def get_urls(self):
+        return [
+            path(
+                "<path:object_id>/revalidation-preview/",
+                self.admin_site.admin_view(self.revalidation_preview_view),
+                name="producttypen_jsonschema_revalidation_preview",
+            ),
+            *super().get_urls(),
+        ]
+
+    def revalidation_preview_view(self, request, object_id):
+        """
+        Show the errors of the products that don't conform to the (changed) schema,
+        without saving it.
+
+        Only a sample of the products is validated during the request.
+        """
+        obj = self.get_object(request, unquote(object_id))
+        if obj is None:
+            raise Http404
+        if not self.has_change_permission(request, obj):
+            raise PermissionDenied
+
+        form = RevalidationPreviewForm(
+            request.POST or None, initial={"schema": obj.schema}
+        )
+        errors = None
+        validated = 0
+        if form.is_valid():
+            obj.schema = form.cleaned_data["schema"]
+            try:
+                obj.clean()
+            except ValidationError as exc:
+                form.add_error("schema", exc)
+            else:
+                validator = build_validator(obj.schema)
+                errors = []
+                for chunk in get_products_to_revalidate(
+                    obj, limit=REVALIDATION_PREVIEW_SAMPLE_SIZE
+                ):
+                    validated += len(chunk)
+                    errors += validate_chunk(validator, chunk)
+
+        context = {
+            **self.admin_site.each_context(request),
+            "title": _("Voorbeeld validatie producten"),
+            "opts": self.opts,
+            "original": obj,
+            "form": form,
+            "errors": errors[:REVALIDATION_PREVIEW_LIMIT] if errors else errors,
+            "truncated": errors is not None
+            and len(errors) > REVALIDATION_PREVIEW_LIMIT,
+            # the remaining products weren't validated
+            "sampled": validated >= REVALIDATION_PREVIEW_SAMPLE_SIZE,
+            "sample_size": REVALIDATION_PREVIEW_SAMPLE_SIZE,
+            "invalid_count": len({error.uuid for error in errors or []}),
+        }
+        return TemplateResponse(
+            request,
+            "admin/producttypen/jsonschema/revalidation_preview.html",
+            context,
+        )
 
     def get_changeform_initial_data(self, request):
         return {
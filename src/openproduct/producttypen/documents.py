@@ -0,0 +1,193 @@
+"""
+The producttypen api serves the `ProductTypeSerializer` representation of a
+producttype from a document per producttype & language, which is stored in the cache.
+
+The documents are removed by the signals in `openproduct.producttypen.signals` when
+the producttype or one of the related objects in its representation is changed, and
+are rebuilt when they are requested again.
+"""
+
+import json
+from collections.abc import Iterable
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch, QuerySet
+from django.utils import translation
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from openproduct.locaties.models import Contact
+
+from .models import Actie, Prijs, PrijsRegel, ProductType, Thema
+from .models.prijs import actuele_en_toekomstige_prijzen
+from .serializers import ProductTypeSerializer
+
+# increase when the representation of the ProductTypeSerializer changes, so the
+# documents of a previous version are no longer used
+DOCUMENT_VERSION = 2
+
+# the documents are removed when they change, the timeout only limits how long
+# unused documents are kept
+DOCUMENT_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+LANGUAGES = [language["code"] for language in settings.PARLER_LANGUAGES[None]]
+
+type Document = dict
+
+
+def get_producttype_queryset(alle_prijzen: bool = False) -> QuerySet[ProductType]:
+    """
+    The producttypen with the relations that are used by the
+    `ProductTypeSerializer`, with only the actuele & toekomstige prijzen unless
+    `alle_prijzen` is set.
+    """
+    prijzen = Prijs.objects.all() if alle_prijzen else actuele_en_toekomstige_prijzen()
+
+    return ProductType.objects.select_related(
+        "verbruiksobject_schema", "dataobject_schema", "uniforme_product_naam"
+    ).prefetch_related(
+        Prefetch("themas", queryset=Thema.objects.select_related("hoofd_thema")),
+        Prefetch("contacten", queryset=Contact.objects.select_related("organisatie")),
+        "locaties",
+        "organisaties",
+        "translations",
+        Prefetch("acties", queryset=Actie.objects.select_related("dmn_config")),
+        "bestanden",
+        "externe_codes",
+        Prefetch(
+            "prijzen",
+            queryset=prijzen.prefetch_related(
+                Prefetch(
+                    "prijsregels",
+                    queryset=PrijsRegel.objects.select_related("dmn_config"),
+                ),
+                "prijsopties",
+            ),
+        ),
+        "links",
+        "parameters",
+        "processen",
+        "verzoektypen",
+        "zaaktypen",
+    )
+
+
+def _document_key(producttype_id: int, language: str, alle_prijzen: bool) -> str:
+    key = f"producttype_document:v{DOCUMENT_VERSION}:{producttype_id}:{language}"
+    return f"{key}:alle_prijzen" if alle_prijzen else key
+
+
+def build_documents(
+    producttype_ids: Iterable[int], language: str, alle_prijzen: bool = False
+) -> dict[int, Document]:
+    with translation.override(language):
+        producttypen = list(
+            get_producttype_queryset(alle_prijzen).filter(pk__in=producttype_ids)
+        )
+        data = ProductTypeSerializer(producttypen, many=True).data
+
+    return {
+        producttype.pk: document
+        for producttype, document in zip(
+            producttypen, json.loads(JSONRenderer().render(data)), strict=True
+        )
+    }
+
+
+def get_documents(
+    producttypen: Iterable[ProductType], language: str, alle_prijzen: bool = False
+) -> list[Document]:
+    """
+    The (cached) documents of the producttypen, the missing documents are built
+    and cached.
+    """
+    keys = {
+        producttype.pk: _document_key(producttype.pk, language, alle_prijzen)
+        for producttype in producttypen
+    }
+    cached = cache.get_many(keys.values())
+
+    documents = {
+        producttype_id: cached[key]
+        for producttype_id, key in keys.items()
+        if key in cached
+    }
+    if missing := [
+        producttype_id for producttype_id in keys if producttype_id not in documents
+    ]:
+        built = build_documents(missing, language, alle_prijzen)
+        cache.set_many(
+            {
+                keys[producttype_id]: document
+                for producttype_id, document in built.items()
+            },
+            DOCUMENT_CACHE_TIMEOUT,
+        )
+        documents |= built
+
+    return [documents[producttype_id] for producttype_id in keys]
+
+
+def _actuele_en_toekomstige_prijzen(prijzen: list[dict], today: str) -> list[dict]:
+    # a toekomstige prijs of the document can have become the actuele prijs since it
+    # was built
+    actief_vanaf = max(
+        (prijs["actief_vanaf"] for prijs in prijzen if prijs["actief_vanaf"] <= today),
+        default=today,
+    )
+    return [prijs for prijs in prijzen if prijs["actief_vanaf"] >= actief_vanaf]
+
+
+def render_document(
+    document: Document, request: Request, alle_prijzen: bool = False
+) -> Document:
+    """
+    Add the parts of the representation that depend on the request or the current
+    date to a document.
+    """
+    today = date.today().isoformat()
+    start, eind = document["publicatie_start_datum"], document["publicatie_eind_datum"]
+
+    return document | {
+        "gepubliceerd": start is not None
+        and start <= today
+        and (not eind or eind > today),
+        "bestanden": [
+            bestand | {"bestand": request.build_absolute_uri(bestand["bestand"])}
+            if bestand["bestand"]
+            else bestand
+            for bestand in document["bestanden"]
+        ],
+        "prijzen": document["prijzen"]
+        if alle_prijzen
+        else _actuele_en_toekomstige_prijzen(document["prijzen"], today),
+    }
+
+
+def _delete_documents(producttype_ids: list[int]) -> None:
+    cache.delete_many(
+        [
+            _document_key(producttype_id, language, alle_prijzen)
+            for producttype_id in producttype_ids
+            for language in LANGUAGES
+            for alle_prijzen in (False, True)
+        ]
+    )
+
+
+def clear_documents(producttype_ids: Iterable[int]) -> None:
+    """
+    Remove the documents of the producttypen, now & when the transaction is
+    committed, so a document that was built from the previous state during the
+    transaction is removed as well.
+    """
+    producttype_ids = list(producttype_ids)
+    if not producttype_ids:
+        return
+
+    _delete_documents(producttype_ids)
+    transaction.on_commit(lambda: _delete_documents(producttype_ids))
@@ -0,0 +1,88 @@
+# Generated by Django 5.2.15 on 2026-10-18 10:18
+
+import uuid
+from django.db import migrations, models
+
+from openproduct.utils.migration_operations import AlterFieldUniqueConcurrently
+
+
+class Migration(migrations.Migration):
+    # the unique indexes are created concurrently, which can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('producttypen', '0021_alter_producttype_eigenaar'),
+    ]
+
+    operations = [
+        AlterFieldUniqueConcurrently(
+            model_name='actie',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        AlterFieldUniqueConcurrently(
+            model_name='bestand',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        AlterFieldUniqueConcurrently(
+            model_name='contentelement',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        AlterFieldUniqueConcurrently(
+            model_name='contentlabel',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        AlterFieldUniqueConcurrently(
+            model_name='dmnconfig',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        AlterFieldUniqueConcurrently(
+            model_name='externecode',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        AlterFieldUniqueConcurrently(
+            model_name='link',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        AlterFieldUniqueConcurrently(
+            model_name='parameter',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        AlterFieldUniqueConcurrently(
+            model_name='prijs',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        AlterFieldUniqueConcurrently(
+            model_name='prijsoptie',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        AlterFieldUniqueConcurrently(
+            model_name='prijsregel',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        AlterFieldUniqueConcurrently(
+            model_name='producttype',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        AlterFieldUniqueConcurrently(
+            model_name='thema',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+        AlterFieldUniqueConcurrently(
+            model_name='uniformeproductnaam',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.15 on 2026-10-18 10:34
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('producttypen', '0022_unique_uuid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jsonschema',
+            name='geindexeerde_eigenschappen',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=255), blank=True, default=list, help_text='Eigenschappen uit het schema waarvoor een index wordt bijgehouden op de producten van de producttypen die dit schema gebruiken. Geneste eigenschappen worden gescheiden door `__`, bijvoorbeeld `auto__kenteken`.', size=None, verbose_name='geïndexeerde eigenschappen'),
+        ),
+    ]
@@ -1,18 +1,40 @@
 from __future__ import annotations
 
+import hashlib
+import json
+
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 import reversion
 import structlog
+from jsonschema import Draft202012Validator
 from jsonschema.exceptions import SchemaError
 from jsonschema.validators import validator_for
 
-from openproduct.utils.jsonschema_validators import validate_jsonschema
+from openproduct.utils.jsonschema_validators import (
+    build_validator,
+    validate_with_validator,
+)
+
+from .validators import validate_geindexeerde_eigenschappen
 
 logger = structlog.stdlib.get_logger(__name__)
 
+# the compiled validators of this process by schema id, with the cache key of the
+# content of the schema they were compiled from
+_validator_cache: dict[int, tuple[tuple[str, bool], Draft202012Validator]] = {}
+
+
+def clear_validator_cache(schema_id: int | None = None) -> None:
+    if schema_id is None:
+        _validator_cache.clear()
+    else:
+        _validator_cache.pop(schema_id, None)
+
 
 @reversion.register()
 class JsonSchema(models.Model):
@@ -24,6 +46,18 @@ class JsonSchema(models.Model):
         _("schema"), help_text=_("Het schema waartegen gevalideerd kan worden.")
     )
 
+    geindexeerde_eigenschappen = ArrayField(
+        models.CharField(max_length=255),
+        verbose_name=_("geïndexeerde eigenschappen"),
+        default=list,
+        blank=True,
+        help_text=_(
+            "Eigenschappen uit het schema waarvoor een index wordt bijgehouden op de "
+            "producten van de producttypen die dit schema gebruiken. Geneste "
+            "eigenschappen worden gescheiden door `__`, bijvoorbeeld `auto__kenteken`."
+        ),
+    )
+
     class Meta:
         verbose_name = _("Json schema")
         verbose_name_plural = _("Json Schemas")
@@ -39,5 +73,30 @@ class JsonSchema(models.Model):
         except SchemaError as exc:
             raise ValidationError(exc.message)
 
+        validate_geindexeerde_eigenschappen(
+            self.schema, self.geindexeerde_eigenschappen
+        )
+
+    def get_validator(self) -> Draft202012Validator:
+        """
+        Return the compiled validator of the schema.
+
+        The validators are cached per process. The content of the schema is part of
+        the cache key, so a schema that is changed by another process is compiled
+        again.
+        """
+        if self.pk is None:
+            return build_validator(self.schema)
+
+        content_hash = hashlib.sha256(
+            json.dumps(self.schema, sort_keys=True).encode()
+        ).hexdigest()
+        key = (content_hash, settings.JSONSCHEMA_USE_FORMAT_CHECKER)
+
+        cached = _validator_cache.get(self.pk)
+        if cached is None or cached[0] != key:
+            cached = _validator_cache[self.pk] = (key, build_validator(self.schema))
+        return cached[1]
+
     def validate(self, json: dict, label: str = "instance") -> None:
-        validate_jsonschema(json, self.schema, label)
+        validate_with_validator(json, self.get_validator(), label)
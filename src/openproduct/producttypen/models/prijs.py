@@ -121,3 +121,48 @@ class PrijsRegel(BaseModel):
 
     def __str__(self):
         return f"{self.beschrijving} {self.url}"
+
+
+def actuele_en_toekomstige_prijzen(
+    peildatum: datetime.date | None = None,
+) -> models.QuerySet[Prijs]:
+    """
+    The prijzen that are active on the peildatum (default today) or after it, so
+    without the price history of the producttypen.
+    """
+    peildatum = peildatum or datetime.date.today()
+    actief_vanaf = (
+        Prijs.objects.filter(
+            producttype=models.OuterRef("producttype"), actief_vanaf__lte=peildatum
+        )
+        .order_by("-actief_vanaf")
+        .values("actief_vanaf")[:1]
+    )
+    return Prijs.objects.filter(
+        models.Q(actief_vanaf__gte=models.Subquery(actief_vanaf))
+        | models.Q(actief_vanaf__gt=peildatum)
+    )
+
+
+def prefetch_actuele_prijs(peildatum: datetime.date | None = None) -> models.Prefetch:
+    """
+    Prefetch the prijs of each producttype that is active on the peildatum (default
+    today) in one query (`DISTINCT ON`), with only the opties & regels of those
+    prijzen. It is used by `ProductType.actuele_prijs`.
+    """
+    return models.Prefetch(
+        "prijzen",
+        queryset=Prijs.objects.filter(
+            actief_vanaf__lte=peildatum or datetime.date.today()
+        )
+        .order_by("producttype_id", "-actief_vanaf")
+        .distinct("producttype_id")
+        .prefetch_related(
+            "prijsopties",
+            models.Prefetch(
+                "prijsregels",
+                queryset=PrijsRegel.objects.select_related("dmn_config"),
+            ),
+        ),
+        to_attr="_actuele_prijzen",
+    )
@@ -203,6 +203,9 @@ class ProductType(BasePublishableModel, TranslatableModel):
 
     @property
     def actuele_prijs(self):
+        if hasattr(self, "_actuele_prijzen"):  # see `prefetch_actuele_prijs`
+            return next(iter(self._actuele_prijzen), None)
+
         now = date.today()
         return (
             self.prijzen.filter(actief_vanaf__lte=now).order_by("actief_vanaf").last()
@@ -1,10 +1,21 @@
-from django.db import models
+from __future__ import annotations
+
+from dataclasses import dataclass
+from uuid import UUID
+
+from django.core.cache import cache
+from django.db import models, transaction
+from django.http import HttpRequest
 from django.utils.translation import gettext_lazy as _
 
 from openproduct.accounts.models import User
 
 from .producttype import ProductType
 
+# the permission maps are invalidated when the permissions of the user change, the
+# timeout only limits how long a map can be stale after e.g. a queryset update
+PERMISSIONS_CACHE_TIMEOUT = 60 * 60
+
 
 class PermissionModes(models.TextChoices):
     read_only = "read_only", _("Read-only")
@@ -29,3 +40,79 @@ class ProductTypePermission(models.Model):
     class Meta:
         verbose_name = _("ProductType Permission")
         unique_together = (("user", "producttype"),)
+
+
+@dataclass(frozen=True)
+class ProductTypePermissionMap:
+    """
+    The permission modes of a user by producttype id, with the ids of the
+    producttypen by uuid.
+    """
+
+    modes: dict[int, str]
+    ids: dict[UUID, int]
+
+    def has_permission(self, producttype_id: int | None, write: bool = False) -> bool:
+        if producttype_id is None or producttype_id not in self.modes:
+            return False
+        mode = self.modes[producttype_id]
+        return not write or mode == PermissionModes.read_and_write
+
+    def has_permission_for_uuid(self, producttype_uuid, write: bool = False) -> bool:
+        try:
+            producttype_id = self.ids.get(UUID(str(producttype_uuid)))
+        except ValueError:
+            return False
+        return self.has_permission(producttype_id, write)
+
+    def producttype_ids(self, write: bool = False) -> list[int]:
+        return [
+            producttype_id
+            for producttype_id in self.modes
+            if self.has_permission(producttype_id, write)
+        ]
+
+
+def _permissions_cache_key(user_id: int) -> str:
+    return f"producttype_permissions:{user_id}"
+
+
+def clear_producttype_permissions_cache(user_id: int) -> None:
+    """
+    Remove the cached permissions of the user, now & when the transaction is
+    committed, so permissions that were cached from the previous state during the
+    transaction are removed as well.
+    """
+    key = _permissions_cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def get_producttype_permissions(request: HttpRequest) -> ProductTypePermissionMap:
+    """
+    The producttype permissions of the user of the request.
+
+    The map is cached on the request and in the shared cache, so the permissions
+    are queried once per user until they are changed.
+    """
+    permissions = getattr(request, "_producttype_permissions", None)
+    if permissions is not None:
+        return permissions
+
+    user_id = request.user.pk
+    key = _permissions_cache_key(user_id)
+    rows = cache.get(key)
+    if rows is None:
+        rows = list(
+            ProductTypePermission.objects.filter(user_id=user_id).values_list(
+                "producttype_id", "producttype__uuid", "mode"
+            )
+        )
+        cache.set(key, rows, PERMISSIONS_CACHE_TIMEOUT)
+
+    permissions = ProductTypePermissionMap(
+        modes={producttype_id: mode for producttype_id, _uuid, mode in rows},
+        ids={uuid: producttype_id for producttype_id, uuid, _mode in rows},
+    )
+    request._producttype_permissions = permissions
+    return permissions
@@ -172,3 +172,66 @@ def validate_actie_url_xor_dmn(url, dmn_config, dmn_tabel_id):
             raise ValidationError(
                 _("Een actie dmn bestaat uit een dmn_config en dmn_tabel_id.")
             )
+
+
+# the json types of which the values can be kept in a btree index, optionally
+# combined with "null"
+INDEXABLE_TYPES = {"string", "number", "integer", "boolean"}
+
+# a btree index entry can't be larger than about 2700 bytes, which is at least this
+# many characters of utf-8
+MAX_INDEXED_STRING_LENGTH = 500
+
+
+def _validate_indexable_property(eigenschap: str, sub_schema) -> None:
+    types = sub_schema.get("type") if isinstance(sub_schema, dict) else None
+    if isinstance(types, str):
+        types = [types]
+
+    scalar_types = set(types or []) - {"null"}
+    if not scalar_types or not scalar_types <= INDEXABLE_TYPES:
+        raise ValidationError(
+            {
+                "geindexeerde_eigenschappen": _(
+                    "Eigenschap `%(eigenschap)s` kan niet geïndexeerd worden, alleen "
+                    "eigenschappen van het type string, number, integer of boolean "
+                    "kunnen geïndexeerd worden."
+                )
+                % {"eigenschap": eigenschap}
+            }
+        )
+
+    max_length = sub_schema.get("maxLength")
+    if "string" in scalar_types and (
+        not isinstance(max_length, int) or max_length > MAX_INDEXED_STRING_LENGTH
+    ):
+        raise ValidationError(
+            {
+                "geindexeerde_eigenschappen": _(
+                    "Eigenschap `%(eigenschap)s` kan alleen geïndexeerd worden met een "
+                    "maxLength van maximaal %(max_length)s."
+                )
+                % {"eigenschap": eigenschap, "max_length": MAX_INDEXED_STRING_LENGTH}
+            }
+        )
+
+
+def validate_geindexeerde_eigenschappen(schema: dict, eigenschappen: list[str]):
+    for eigenschap in eigenschappen:
+        sub_schema = schema
+        for key in eigenschap.split("__"):
+            properties = (
+                sub_schema.get("properties") if isinstance(sub_schema, dict) else None
+            )
+            if not isinstance(properties, dict) or key not in properties:
+                raise ValidationError(
+                    {
+                        "geindexeerde_eigenschappen": _(
+                            "Eigenschap `%(eigenschap)s` bestaat niet in het schema."
+                        )
+                        % {"eigenschap": eigenschap}
+                    }
+                )
+            sub_schema = properties[key]
+
+        _validate_indexable_property(eigenschap, sub_schema)
@@ -4,6 +4,9 @@ from jsonschema.exceptions import SchemaError
 from rest_framework import serializers
 
 from openproduct.producttypen.models import JsonSchema
+from openproduct.producttypen.serializers.validators import (
+    GeindexeerdeEigenschappenValidator,
+)
 
 
 @extend_schema_serializer(
@@ -17,6 +20,7 @@ from openproduct.producttypen.models import JsonSchema
                     "properties": {"uren": {"type": "number"}},
                     "required": ["uren"],
                 },
+                "geindexeerde_eigenschappen": ["uren"],
             },
             response_only=True,
         ),
@@ -29,6 +33,7 @@ from openproduct.producttypen.models import JsonSchema
                     "properties": {"uren": {"type": "number"}},
                     "required": ["uren"],
                 },
+                "geindexeerde_eigenschappen": ["uren"],
             },
             request_only=True,
         ),
@@ -47,4 +52,5 @@ class JsonSchemaSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = JsonSchema
-        fields = ("naam", "schema")
+        fields = ("naam", "schema", "geindexeerde_eigenschappen")
+        validators = [GeindexeerdeEigenschappenValidator()]
@@ -12,6 +12,7 @@ from vng_api_common.utils import get_help_text
 
 from ...utils.drf_validators import NestedObjectsValidator
 from ...utils.fields import UUIDRelatedField
+from ...utils.serializers import reconcile_nested_objects
 from ..models import Prijs, PrijsOptie, ProductType
 from ..models.dmn_config import DmnConfig
 from ..models.prijs import PrijsRegel
@@ -224,46 +225,14 @@ class PrijsSerializer(serializers.ModelSerializer):
         prijs = super().update(instance, validated_data)
 
         if opties is not None:
-            current_optie_uuids = set(prijs.prijsopties.values_list("uuid", flat=True))
-            seen_optie_uuids = set()
-
-            for optie in opties:
-                optie_uuid = optie.pop("uuid", None)
-                if optie_uuid is None:
-                    PrijsOptieSerializer().create(optie | {"prijs": prijs})
-
-                else:
-                    existing_optie = PrijsOptie.objects.get(uuid=optie_uuid)
-                    PrijsOptieSerializer(partial=self.partial).update(
-                        existing_optie, optie
-                    )
-                    seen_optie_uuids.add(optie_uuid)
-
-            prijs.prijsopties.filter(
-                uuid__in=(current_optie_uuids - seen_optie_uuids)
-            ).delete()
+            reconcile_nested_objects(
+                PrijsOptie, "prijs", [(prijs, opties)], key_fields=("uuid",)
+            )
 
         if regels is not None:
-            current_regel_uuids = set(
-                prijs.prijsregels.values_list("uuid", flat=True).distinct()
+            reconcile_nested_objects(
+                PrijsRegel, "prijs", [(prijs, regels)], key_fields=("uuid",)
             )
-            seen_regel_uuids = set()
-
-            for regel in regels:
-                regel_uuid = regel.pop("uuid", None)
-                if regel_uuid is None:
-                    PrijsRegelSerializer().create(regel | {"prijs": prijs})
-
-                else:
-                    existing_regel = PrijsRegel.objects.get(uuid=regel_uuid)
-                    PrijsRegelSerializer(partial=self.partial).update(
-                        existing_regel, regel
-                    )
-                    seen_regel_uuids.add(regel_uuid)
-
-            prijs.prijsregels.filter(
-                uuid__in=(current_regel_uuids - seen_regel_uuids)
-            ).delete()
 
         return prijs
 
@@ -1,5 +1,5 @@
 from django.db import transaction
-from django.utils.translation import gettext_lazy as _
+from django.utils.translation import get_language, gettext_lazy as _
 
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (
@@ -20,8 +20,22 @@ from openproduct.locaties.serializers import (
 
 from ...utils.drf_validators import DuplicateIdValidator
 from ...utils.fields import UUIDRelatedField
-from ...utils.serializers import set_nested_serializer, validate_key_value_model_keys
-from ..models import JsonSchema, ProductType, Thema, UniformeProductNaam
+from ...utils.serializers import (
+    reconcile_nested_objects,
+    set_nested_serializer,
+    validate_key_value_model_keys,
+)
+from ..models import (
+    ExterneCode,
+    JsonSchema,
+    Parameter,
+    Proces,
+    ProductType,
+    Thema,
+    UniformeProductNaam,
+    VerzoekType,
+    ZaakType,
+)
 from . import JsonSchemaSerializer
 from .actie import NestedActieSerializer
 from .bestand import NestedBestandSerializer
@@ -348,7 +362,7 @@ class ProductTypeSerializer(TranslatableModelSerializer):
     @extend_schema_field(OpenApiTypes.STR)
     def get_taal(self, obj):
         request = self.context.get("request")
-        requested_language = getattr(request, "LANGUAGE_CODE", "nl")
+        requested_language = getattr(request, "LANGUAGE_CODE", None) or get_language()
         return requested_language if obj.has_translation(requested_language) else "nl"
 
     externe_codes = NestedExterneCodeSerializer(many=True, required=False)
@@ -538,46 +552,17 @@ class ProductTypeSerializer(TranslatableModelSerializer):
         if contacten:
             instance.contacten.set(contacten)
 
-        if externe_codes is not None:
-            instance.externe_codes.all().delete()
-            set_nested_serializer(
-                [
-                    externe_code | {"producttype": instance.pk}
-                    for externe_code in externe_codes
-                ],
-                ExterneCodeSerializer,
-            )
-
-        if parameters is not None:
-            instance.parameters.all().delete()
-            set_nested_serializer(
-                [parameter | {"producttype": instance.pk} for parameter in parameters],
-                ParameterSerializer,
-            )
-
-        if zaaktypen is not None:
-            instance.zaaktypen.all().delete()
-            set_nested_serializer(
-                [zaaktype | {"producttype": instance.pk} for zaaktype in zaaktypen],
-                ZaakTypeSerializer,
-            )
-
-        if verzoektypen is not None:
-            instance.verzoektypen.all().delete()
-            set_nested_serializer(
-                [
-                    verzoektype | {"producttype": instance.pk}
-                    for verzoektype in verzoektypen
-                ],
-                VerzoekTypeSerializer,
-            )
-
-        if processen is not None:
-            instance.processen.all().delete()
-            set_nested_serializer(
-                [proces | {"producttype": instance.pk} for proces in processen],
-                ProcesSerializer,
-            )
+        for model, data, key_fields in (
+            (ExterneCode, externe_codes, ("naam",)),
+            (Parameter, parameters, ("naam",)),
+            (ZaakType, zaaktypen, ("urn", "url")),
+            (VerzoekType, verzoektypen, ("urn", "url")),
+            (Proces, processen, ("urn", "url")),
+        ):
+            if data is not None:
+                reconcile_nested_objects(
+                    model, "producttype", [(instance, data)], key_fields=key_fields
+                )
 
         instance.add_contact_organisaties()
         return instance
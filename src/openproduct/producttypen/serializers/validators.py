@@ -8,6 +8,7 @@ from ..models.validators import (
     check_for_circular_reference,
     validate_actie_url_xor_dmn,
     validate_exactly_one_producttype_or_thema,
+    validate_geindexeerde_eigenschappen,
     validate_prijs_optie_xor_regel,
     validate_publicatie_dates,
     validate_thema_gepubliceerd_state,
@@ -135,3 +136,18 @@ class ActieUrlValidator:
             validate_actie_url_xor_dmn(direct_url, dmn_config, dmn_tabel_id)
         except ValidationError as e:
             raise serializers.ValidationError(e.message)
+
+
+class GeindexeerdeEigenschappenValidator:
+    requires_context = True
+
+    def __call__(self, value, serializer):
+        schema = get_from_serializer_data_or_instance("schema", value, serializer)
+        eigenschappen = get_from_serializer_data_or_instance(
+            "geindexeerde_eigenschappen", value, serializer
+        )
+
+        try:
+            validate_geindexeerde_eigenschappen(schema, eigenschappen or [])
+        except ValidationError as e:
+            raise serializers.ValidationError(e.message_dict)
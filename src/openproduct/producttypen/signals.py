@@ -1,9 +1,154 @@
-from django.db.models.signals import post_save
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
-from .models import ProductType
+from openproduct.locaties.models import Contact, Locatie, Organisatie
+
+from .documents import clear_documents
+from .models import (
+    Actie,
+    Bestand,
+    ExterneCode,
+    JsonSchema,
+    Link,
+    Parameter,
+    Prijs,
+    Proces,
+    ProductType,
+    ProductTypePermission,
+    ProductTypeTranslation,
+    Thema,
+    UniformeProductNaam,
+    VerzoekType,
+    ZaakType,
+)
+from .models.dmn_config import DmnConfig
+from .models.jsonschema import clear_validator_cache
+from .models.producttypepermission import clear_producttype_permissions_cache
 
 
 @receiver(post_save, sender=ProductType)
 def add_contact_organisaties(sender, instance, **kwargs):
     instance.add_contact_organisaties()
+
+
+@receiver(post_save, sender=JsonSchema)
+@receiver(post_delete, sender=JsonSchema)
+def clear_json_schema_validator(sender, instance, **kwargs):
+    clear_validator_cache(instance.pk)
+
+
+@receiver(post_save, sender=ProductTypePermission)
+@receiver(post_delete, sender=ProductTypePermission)
+def clear_producttype_permissions(sender, instance, **kwargs):
+    clear_producttype_permissions_cache(instance.user_id)
+
+
+def clear_producttype_documents(producttypen: Q):
+    clear_documents(
+        ProductType.objects.filter(producttypen).values_list("pk", flat=True).distinct()
+    )
+
+
+@receiver(post_save, sender=ProductType)
+@receiver(post_delete, sender=ProductType)
+def clear_producttype_document(sender, instance, **kwargs):
+    clear_documents([instance.pk])
+
+
+@receiver(post_save, sender=ProductTypeTranslation)
+@receiver(post_delete, sender=ProductTypeTranslation)
+def clear_producttype_translation_document(sender, instance, **kwargs):
+    clear_documents([instance.master_id])
+
+
+@receiver(post_save, sender=Actie)
+@receiver(post_delete, sender=Actie)
+@receiver(post_save, sender=Bestand)
+@receiver(post_delete, sender=Bestand)
+@receiver(post_save, sender=ExterneCode)
+@receiver(post_delete, sender=ExterneCode)
+@receiver(post_save, sender=Link)
+@receiver(post_delete, sender=Link)
+@receiver(post_save, sender=Parameter)
+@receiver(post_delete, sender=Parameter)
+# the prijsopties & prijsregels are (bulk) saved together with their prijs
+@receiver(post_save, sender=Prijs)
+@receiver(post_delete, sender=Prijs)
+@receiver(post_save, sender=Proces)
+@receiver(post_delete, sender=Proces)
+@receiver(post_save, sender=VerzoekType)
+@receiver(post_delete, sender=VerzoekType)
+@receiver(post_save, sender=ZaakType)
+@receiver(post_delete, sender=ZaakType)
+def clear_related_producttype_document(sender, instance, **kwargs):
+    clear_documents([instance.producttype_id])
+
+
+# the m2m relations are removed before the post_delete signal is sent
+@receiver(post_save, sender=Thema)
+@receiver(pre_delete, sender=Thema)
+def clear_thema_producttype_documents(sender, instance, **kwargs):
+    clear_producttype_documents(Q(themas=instance))
+
+
+@receiver(post_save, sender=Locatie)
+@receiver(pre_delete, sender=Locatie)
+def clear_locatie_producttype_documents(sender, instance, **kwargs):
+    clear_producttype_documents(Q(locaties=instance))
+
+
+@receiver(post_save, sender=Contact)
+@receiver(pre_delete, sender=Contact)
+def clear_contact_producttype_documents(sender, instance, **kwargs):
+    clear_producttype_documents(Q(contacten=instance))
+
+
+@receiver(post_save, sender=Organisatie)
+@receiver(pre_delete, sender=Organisatie)
+def clear_organisatie_producttype_documents(sender, instance, **kwargs):
+    clear_producttype_documents(
+        Q(organisaties=instance) | Q(contacten__organisatie=instance)
+    )
+
+
+@receiver(post_save, sender=JsonSchema)
+def clear_json_schema_producttype_documents(sender, instance, **kwargs):
+    clear_producttype_documents(
+        Q(verbruiksobject_schema=instance) | Q(dataobject_schema=instance)
+    )
+
+
+@receiver(post_save, sender=UniformeProductNaam)
+def clear_upn_producttype_documents(sender, instance, **kwargs):
+    clear_producttype_documents(Q(uniforme_product_naam=instance))
+
+
+@receiver(post_save, sender=DmnConfig)
+def clear_dmn_config_producttype_documents(sender, instance, **kwargs):
+    clear_producttype_documents(
+        Q(acties__dmn_config=instance) | Q(prijzen__prijsregels__dmn_config=instance)
+    )
+
+
+@receiver(m2m_changed, sender=ProductType.themas.through)
+@receiver(m2m_changed, sender=ProductType.locaties.through)
+@receiver(m2m_changed, sender=ProductType.organisaties.through)
+@receiver(m2m_changed, sender=ProductType.contacten.through)
+def clear_m2m_producttype_documents(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if not reverse:
+        clear_documents([instance.pk])
+    elif action == "pre_clear":
+        # the field names of the generated through models are the model names
+        clear_documents(
+            sender.objects.filter(**{instance._meta.model_name: instance}).values_list(
+                "producttype_id", flat=True
+            )
+        )
+    else:
+        clear_documents(pk_set)
@@ -25,6 +25,7 @@ class TestProductTypeSchema(BaseApiTestCase):
                 "properties": {"uren": {"type": "number"}},
                 "required": ["uren"],
             },
+            "geindexeerde_eigenschappen": [],
         }
         self.schema = JsonSchemaFactory.create(schema=self.data["schema"])
 
@@ -156,6 +157,95 @@ class TestProductTypeSchema(BaseApiTestCase):
             "{'schema.email': [\"'not-an-email' is not a 'email'\"]}",
         )
 
+    def test_create_schema_with_geindexeerde_eigenschappen(self):
+        data = self.data | {
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "auto": {
+                        "type": "object",
+                        "properties": {"kenteken": {"type": "string", "maxLength": 10}},
+                    }
+                },
+            },
+            "geindexeerde_eigenschappen": ["auto__kenteken"],
+        }
+        response = self.client.post(self.path, data)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            JsonSchema.objects.get(naam=data["naam"]).geindexeerde_eigenschappen,
+            ["auto__kenteken"],
+        )
+
+    def test_create_schema_with_unknown_geindexeerde_eigenschap(self):
+        data = self.data | {"geindexeerde_eigenschappen": ["uren", "auto__kenteken"]}
+        response = self.client.post(self.path, data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        error = get_validation_errors(response, "geindexeerde_eigenschappen")
+        self.assertEqual(
+            error["reason"],
+            _("Eigenschap `%(eigenschap)s` bestaat niet in het schema.")
+            % {"eigenschap": "auto__kenteken"},
+        )
+
+    def test_create_schema_with_unindexable_geindexeerde_eigenschap(self):
+        data = self.data | {
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "auto": {"type": "object"},
+                    "kenteken": {"type": "string"},
+                },
+            },
+        }
+
+        for eigenschap, reason in [
+            (
+                "auto",
+                _(
+                    "Eigenschap `%(eigenschap)s` kan niet geïndexeerd worden, alleen "
+                    "eigenschappen van het type string, number, integer of boolean "
+                    "kunnen geïndexeerd worden."
+                )
+                % {"eigenschap": "auto"},
+            ),
+            (
+                "kenteken",
+                _(
+                    "Eigenschap `%(eigenschap)s` kan alleen geïndexeerd worden met een "
+                    "maxLength van maximaal %(max_length)s."
+                )
+                % {"eigenschap": "kenteken", "max_length": 500},
+            ),
+        ]:
+            with self.subTest(eigenschap):
+                response = self.client.post(
+                    self.path, data | {"geindexeerde_eigenschappen": [eigenschap]}
+                )
+
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                error = get_validation_errors(response, "geindexeerde_eigenschappen")
+                self.assertEqual(error["reason"], reason)
+
+    def test_partial_update_geindexeerde_eigenschappen_is_validated_against_schema(
+        self,
+    ):
+        response = self.client.patch(
+            self.detail_path, {"geindexeerde_eigenschappen": ["zone"]}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.patch(
+            self.detail_path, {"geindexeerde_eigenschappen": ["uren"]}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(JsonSchema.objects.get().geindexeerde_eigenschappen, ["uren"])
+
     def test_partial_update_schema(self):
         data = {"naam": "update"}
         response = self.client.patch(self.detail_path, data)
@@ -174,10 +264,12 @@ class TestProductTypeSchema(BaseApiTestCase):
             {
                 "naam": self.schema.naam,
                 "schema": self.schema.schema,
+                "geindexeerde_eigenschappen": [],
             },
             {
                 "naam": schema.naam,
                 "schema": schema.schema,
+                "geindexeerde_eigenschappen": [],
             },
         ]
         self.assertCountEqual(response.data["results"], expected_data)
@@ -190,6 +282,7 @@ class TestProductTypeSchema(BaseApiTestCase):
         expected_data = {
             "naam": self.schema.naam,
             "schema": self.schema.schema,
+            "geindexeerde_eigenschappen": [],
         }
         self.assertEqual(response.data, expected_data)
 
@@ -1,7 +1,10 @@
 import datetime
+import re
 from datetime import date
 
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse, reverse_lazy
 from django.utils.translation import gettext as _
 
@@ -505,6 +508,7 @@ class TestProducttypeViewSet(BaseApiTestCase):
                     "properties": {"uren": {"type": "number"}},
                     "required": ["uren"],
                 },
+                "geindexeerde_eigenschappen": [],
             },
             "dataobject_schema": {
                 "naam": "test",
@@ -513,6 +517,7 @@ class TestProducttypeViewSet(BaseApiTestCase):
                     "properties": {"uren": {"type": "number"}},
                     "required": ["uren"],
                 },
+                "geindexeerde_eigenschappen": [],
             },
             "toegestane_statussen": [],
             "prijzen": [],
@@ -1827,7 +1832,7 @@ class TestProductTypeActions(BaseApiTestCase):
         response = self.client.get(self.list_path)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(
-            response.data,
+            response.data["results"],
             [
                 self.expected_data,
             ],
@@ -1850,7 +1855,7 @@ class TestProductTypeActions(BaseApiTestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(
-            response.data,
+            response.data["results"],
             [
                 self.expected_data,
             ],
@@ -1868,7 +1873,7 @@ class TestProductTypeActions(BaseApiTestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(
-            response.data,
+            response.data["results"],
             [
                 self.expected_data
                 | {
@@ -1900,7 +1905,7 @@ class TestProductTypeActions(BaseApiTestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(
-            response.data,
+            response.data["results"],
             [
                 self.expected_data
                 | {
@@ -1982,6 +1987,73 @@ class TestProductTypeActions(BaseApiTestCase):
             },
         )
 
+    def test_get_actuele_prijzen_with_peildatum(self):
+        PrijsFactory.create(
+            producttype=self.producttype, actief_vanaf=datetime.date(2024, 1, 1)
+        )
+        future_prijs = PrijsFactory.create(
+            producttype=self.producttype, actief_vanaf=datetime.date(2024, 3, 1)
+        )
+
+        response = self.client.get(self.list_path, {"peildatum": "2024-03-15"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"][0]["actuele_prijs"]["uuid"],
+            str(future_prijs.uuid),
+        )
+
+        with self.subTest("before the first prijs"):
+            response = self.client.get(self.detail_path, {"peildatum": "2023-12-31"})
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIsNone(response.data["actuele_prijs"])
+
+        with self.subTest("invalid peildatum"):
+            response = self.client.get(self.list_path, {"peildatum": "01-03-2024"})
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_actuele_prijzen_with_filter(self):
+        other_producttype = ProductTypeFactory.create()
+
+        response = self.client.get(self.list_path, {"code": other_producttype.code})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(
+            response.data["results"][0]["uuid"], str(other_producttype.uuid)
+        )
+
+    def test_get_actuele_prijzen_number_of_queries(self):
+        for producttype in ProductTypeFactory.create_batch(5):
+            for actief_vanaf in (datetime.date(2023, 1, 1), datetime.date(2024, 1, 1)):
+                prijs = PrijsFactory.create(
+                    producttype=producttype, actief_vanaf=actief_vanaf
+                )
+                PrijsOptieFactory.create(prijs=prijs)
+                PrijsRegelFactory.create(prijs=prijs)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_path)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # the prijzen, prijsopties & prijsregels are fetched in one query each
+        tables = [
+            re.search(r'FROM "(\w+)"', query["sql"]).group(1)
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+        ]
+        self.assertEqual(
+            [table for table in tables if table.startswith("producttypen_prijs")],
+            [
+                "producttypen_prijs",
+                "producttypen_prijsoptie",
+                "producttypen_prijsregel",
+            ],
+        )
+        self.assertEqual(len(response.data["results"]), 6)
+
     def test_put_vertaling(self):
         path = reverse("producttype-vertaling", args=(self.producttype.uuid, "en"))
 
@@ -0,0 +1,180 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse, reverse_lazy
+
+from freezegun import freeze_time
+from rest_framework import status
+
+from openproduct.locaties.tests.factories import ContactFactory, OrganisatieFactory
+from openproduct.producttypen.tests.factories import (
+    BestandFactory,
+    PrijsFactory,
+    ProductTypeFactory,
+    ThemaFactory,
+)
+from openproduct.utils.tests.cases import BaseApiTestCase
+
+
+class TestProductTypeDocuments(BaseApiTestCase):
+    is_superuser = True
+    path = reverse_lazy("producttype-list")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+        self.thema = ThemaFactory.create(naam="thema")
+        self.producttype = ProductTypeFactory.create(
+            naam="producttype", publicatie_start_datum="2025-01-01"
+        )
+        self.producttype.themas.add(self.thema)
+        self.detail_path = reverse("producttype-detail", args=(self.producttype.uuid,))
+
+    def get(self, path=None, **kwargs):
+        response = self.client.get(path or self.detail_path, **kwargs)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_documents_are_cached(self):
+        self.get(self.path)
+
+        with CaptureQueriesContext(connection) as queries:
+            list_data = self.get(self.path)
+            detail_data = self.get()
+
+        self.assertFalse(
+            any(
+                "producttypen_prijs" in query["sql"]
+                for query in queries.captured_queries
+            )
+        )
+        self.assertEqual(list_data["results"], [detail_data])
+        self.assertEqual(detail_data["themas"][0]["naam"], "thema")
+
+    def test_documents_per_language(self):
+        self.producttype.set_current_language("en")
+        self.producttype.naam = "producttype EN"
+        self.producttype.save()
+
+        self.assertEqual(self.get()["naam"], "producttype")
+        self.assertEqual(self.get()["taal"], "nl")
+
+        data = self.get(headers={"Accept-Language": "en"})
+        self.assertEqual(data["naam"], "producttype EN")
+        self.assertEqual(data["taal"], "en")
+
+    def test_documents_are_cleared_on_change(self):
+        self.get()
+
+        with self.subTest("producttype"):
+            self.producttype.code = "PT-1"
+            self.producttype.save()
+
+            self.assertEqual(self.get()["code"], "PT-1")
+
+        with self.subTest("translation"):
+            self.client.put(
+                reverse("producttype-vertaling", args=(self.producttype.uuid, "en")),
+                {"naam": "name EN", "samenvatting": "summary EN"},
+            )
+
+            data = self.get(headers={"Accept-Language": "en"})
+            self.assertEqual(data["naam"], "name EN")
+
+        with self.subTest("thema"):
+            self.thema.naam = "ander thema"
+            self.thema.save()
+
+            self.assertEqual(self.get()["themas"][0]["naam"], "ander thema")
+
+        with self.subTest("m2m"):
+            self.thema.producttypen.remove(self.producttype)
+
+            self.assertEqual(self.get()["themas"], [])
+
+        with self.subTest("prijs"):
+            prijs = PrijsFactory.create(producttype=self.producttype)
+            self.assertEqual(len(self.get()["prijzen"]), 1)
+
+            self.client.patch(
+                reverse("prijs-detail", args=(prijs.uuid,)),
+                {"prijsopties": [{"bedrag": "10.00", "beschrijving": "spoed"}]},
+            )
+            self.assertEqual(
+                self.get()["prijzen"][0]["prijsopties"][0]["bedrag"], "10.00"
+            )
+
+        with self.subTest("organisatie of contact"):
+            organisatie = OrganisatieFactory.create(naam="organisatie")
+            self.producttype.contacten.add(
+                ContactFactory.create(organisatie=organisatie)
+            )
+            self.assertEqual(
+                self.get()["contacten"][0]["organisatie"]["naam"], "organisatie"
+            )
+
+            organisatie.naam = "andere organisatie"
+            organisatie.save()
+
+            self.assertEqual(
+                self.get()["contacten"][0]["organisatie"]["naam"],
+                "andere organisatie",
+            )
+
+        with self.subTest("deleted producttype"):
+            self.producttype.delete()
+
+            response = self.client.get(self.detail_path)
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_request_dependent_fields(self):
+        bestand = BestandFactory.create(producttype=self.producttype)
+
+        with freeze_time("2024-12-31"):
+            data = self.get()
+
+        self.assertFalse(data["gepubliceerd"])
+        self.assertEqual(
+            data["bestanden"][0]["bestand"], "http://testserver" + bestand.bestand.url
+        )
+
+        with freeze_time("2025-01-01"):
+            self.assertTrue(self.get()["gepubliceerd"])
+
+    def test_prijzen(self):
+        oude_prijs = PrijsFactory.create(
+            producttype=self.producttype, actief_vanaf="2024-01-01"
+        )
+        actuele_prijs = PrijsFactory.create(
+            producttype=self.producttype, actief_vanaf="2025-01-01"
+        )
+        toekomstige_prijs = PrijsFactory.create(
+            producttype=self.producttype, actief_vanaf="2026-01-01"
+        )
+
+        def get_prijzen(**params):
+            return [prijs["uuid"] for prijs in self.get(data=params)["prijzen"]]
+
+        with freeze_time("2025-06-01"):
+            self.assertEqual(
+                get_prijzen(),
+                [str(toekomstige_prijs.uuid), str(actuele_prijs.uuid)],
+            )
+            self.assertEqual(
+                get_prijzen(prijzen="alle"),
+                [
+                    str(toekomstige_prijs.uuid),
+                    str(actuele_prijs.uuid),
+                    str(oude_prijs.uuid),
+                ],
+            )
+
+        with self.subTest("toekomstige prijs became the actuele prijs"):
+            with freeze_time("2026-06-01"):
+                self.assertEqual(get_prijzen(), [str(toekomstige_prijs.uuid)])
+
+        with self.subTest("invalid value"):
+            response = self.client.get(self.detail_path, {"prijzen": "oud"})
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,6 +1,8 @@
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.test import TestCase, override_settings
 
+from openproduct.producttypen.models import JsonSchema
+from openproduct.producttypen.models.jsonschema import _validator_cache
 from openproduct.producttypen.tests.factories import JsonSchemaFactory
 from openproduct.utils.jsonschema_validators import (
     validate_jsonschema,
@@ -94,6 +96,27 @@ class TestJsonSchema(TestCase):
     def test_clean_with_valid_schema(self):
         self.schema.clean()
 
+    def test_clean_with_geindexeerde_eigenschappen(self):
+        # strings can only be indexed with a maxLength
+        schema = JsonSchemaFactory.build(
+            schema={
+                "type": "object",
+                "properties": {
+                    "price": {"type": "number"},
+                    "name": {"type": "string", "maxLength": 100},
+                },
+            },
+            geindexeerde_eigenschappen=["price", "name"],
+        )
+        schema.clean()
+
+        schema.geindexeerde_eigenschappen = ["price__amount"]
+        with self.assertRaisesMessage(
+            DjangoValidationError,
+            "Eigenschap `price__amount` bestaat niet in het schema.",
+        ):
+            schema.clean()
+
     def test_clean_with_draft202012_schema(self):
         self.schema.schema = {
             "$schema": "https://json-schema.org/draft/2020-12/schema",
@@ -143,6 +166,50 @@ class TestJsonSchema(TestCase):
         self.schema.validate({"email": "not-an-email"})
 
 
+class JsonSchemaValidatorCacheTests(TestCase):
+    def setUp(self):
+        self.schema = JsonSchemaFactory.create(
+            schema={"type": "object", "required": ["name"]},
+        )
+
+    def test_validator_is_compiled_once(self):
+        validator = self.schema.get_validator()
+
+        self.assertIs(JsonSchema.objects.get().get_validator(), validator)
+
+    def test_validator_is_compiled_again_when_the_schema_changes(self):
+        validator = self.schema.get_validator()
+
+        # e.g. changed by another process
+        JsonSchema.objects.update(schema={"type": "object", "required": ["price"]})
+        schema = JsonSchema.objects.get()
+
+        self.assertIsNot(schema.get_validator(), validator)
+        with self.assertRaisesMessage(
+            DjangoValidationError, "'price' is a required property"
+        ):
+            schema.validate({"name": "Eggs"})
+
+    def test_validator_is_compiled_again_when_the_format_checker_is_toggled(self):
+        with override_settings(JSONSCHEMA_USE_FORMAT_CHECKER=True):
+            validator = self.schema.get_validator()
+
+        with override_settings(JSONSCHEMA_USE_FORMAT_CHECKER=False):
+            self.assertIsNot(self.schema.get_validator(), validator)
+
+    def test_validator_is_removed_on_save_and_delete(self):
+        self.schema.get_validator()
+        self.assertIn(self.schema.pk, _validator_cache)
+
+        self.schema.save()
+        self.assertNotIn(self.schema.pk, _validator_cache)
+
+        self.schema.get_validator()
+        pk = self.schema.pk
+        self.schema.delete()
+        self.assertNotIn(pk, _validator_cache)
+
+
 class JSONSchemaFormatTests(TestCase):
     def test_color(self):
         data = {}
@@ -6,6 +6,8 @@ from django.test import SimpleTestCase, TestCase
 from freezegun import freeze_time
 
 from ...locaties.tests.factories import ContactFactory
+from ..models import ProductType
+from ..models.prijs import actuele_en_toekomstige_prijzen, prefetch_actuele_prijs
 from ..models.validators import validate_producttype_code
 from .factories import PrijsFactory, ProductTypeFactory
 
@@ -32,6 +34,46 @@ class TestProductType(TestCase):
         self.producttype = ProductTypeFactory.create()
         self.assertIsNone(self.producttype.actuele_prijs)
 
+    @freeze_time("2024-02-02")
+    def test_prefetch_actuele_prijs(self):
+        other_producttype = ProductTypeFactory.create()
+
+        with self.assertNumQueries(4):  # producttypen, prijzen, opties & regels
+            producttypen = list(
+                ProductType.objects.order_by("pk").prefetch_related(
+                    prefetch_actuele_prijs()
+                )
+            )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(producttypen[0].actuele_prijs, self.current_prijs)
+            self.assertIsNone(producttypen[1].actuele_prijs)
+
+        self.assertEqual(producttypen[1], other_producttype)
+
+        with self.subTest("peildatum"):
+            producttype = ProductType.objects.prefetch_related(
+                prefetch_actuele_prijs(date(2025, 1, 1))
+            ).get(pk=self.producttype.pk)
+
+            self.assertEqual(producttype.actuele_prijs, self.future_prijs)
+
+    @freeze_time("2024-02-02")
+    def test_actuele_en_toekomstige_prijzen(self):
+        other_producttype = ProductTypeFactory.create()
+        other_future_prijs = PrijsFactory.create(
+            producttype=other_producttype, actief_vanaf=date(2025, 1, 1)
+        )
+
+        self.assertCountEqual(
+            actuele_en_toekomstige_prijzen(),
+            [self.current_prijs, self.future_prijs, other_future_prijs],
+        )
+        self.assertCountEqual(
+            actuele_en_toekomstige_prijzen(date(2025, 1, 1)),
+            [self.future_prijs, other_future_prijs],
+        )
+
     def test_clean_with_contact_that_has_no_org(self):
         contact = ContactFactory(organisatie_id=None)
         producttype = ProductTypeFactory.create()
@@ -165,8 +165,14 @@ custom_settings = {
     - Mocht een producttype de gevraagde vertaling niet hebben, zal worden teruggevallen op Nederlands.
     - via `taal` in de response is te zien welke taal een bepaald producttype is.
 
+#### prijzen
+- Een producttype bevat standaard alleen de actuele en toekomstige prijzen, met `?prijzen=alle` worden ook de historische prijzen teruggegeven.
+- De historie van de prijzen kan ook gepagineerd worden opgehaald via `prijzen?producttype__uuid=<uuid>`.
+
 #### actuele prijs
 - Via `producttypen/actuele-prijzen` en `producttypen/<uuid>/actuele-prijs` kunnen de huidige prijzen worden opgehaald.
+- Met de `peildatum` query parameter kunnen de prijzen op een andere datum worden opgehaald.
+- De `producttypen/actuele-prijzen` lijst is gepagineerd en kan worden gefilterd met dezelfde query parameters als `producttypen`.
 
 ### prijs regel mapping
 - Met het veld `mapping` kan worden aangegeven welke velden nodig zijn voor de DMN tabel. De mapping wordt gevalideerd tegen het volgende json schema:
@@ -1,7 +1,7 @@
 from datetime import date
 
 from django.db.models import Prefetch, Q
-from django.utils.translation import activate, gettext_lazy as _
+from django.utils.translation import activate, get_language, gettext_lazy as _
 
 import django_filters
 import structlog
@@ -13,21 +13,20 @@ from drf_spectacular.utils import (
 )
 from rest_framework.decorators import action
 from rest_framework.exceptions import ParseError
+from rest_framework.mixins import ListModelMixin
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 from vng_api_common.utils import get_help_text
 
-from openproduct.locaties.models import Contact
 from openproduct.logging.api_tools import AuditTrailViewSetMixin
-from openproduct.producttypen.models import (
-    Actie,
-    ContentElement,
-    Prijs,
-    PrijsRegel,
-    ProductType,
-    Thema,
+from openproduct.producttypen.documents import (
+    get_documents,
+    get_producttype_queryset,
+    render_document,
 )
+from openproduct.producttypen.models import ContentElement, ProductType
 from openproduct.producttypen.models.enums import ProductStateChoices
+from openproduct.producttypen.models.prijs import prefetch_actuele_prijs
 from openproduct.producttypen.serializers import (
     ProductTypeActuelePrijsSerializer,
     ProductTypeSerializer,
@@ -44,6 +43,7 @@ from openproduct.utils.filters import (
     TranslationFilter,
     UUIDFInFilter,
 )
+from openproduct.utils.schema import ERRORS
 from openproduct.utils.validators import ManyRegexValidator
 from openproduct.utils.views import TranslatableViewSetMixin
 
@@ -243,6 +243,70 @@ class Meta:
     fields = ("label", "exclude_labels")
 
 
+class ProductTypeDocumentMixin:
+    """
+    Serve the list & retrieve actions from the cached producttype documents, see
+    `openproduct.producttypen.documents`.
+    """
+
+    def get_queryset(self):
+        if self.action in ("list", "retrieve"):
+            return ProductType.objects.all()
+        return super().get_queryset()
+
+    def get_alle_prijzen(self) -> bool:
+        value = self.request.query_params.get("prijzen") or "actueel"
+        if value not in ("actueel", "alle"):
+            raise ParseError(
+                _(
+                    "Ongeldige waarde voor prijzen query parameter, kies uit: actueel, alle."
+                )
+            )
+        return value == "alle"
+
+    def get_documents(self, producttypen):
+        alle_prijzen = self.get_alle_prijzen()
+        return [
+            render_document(document, self.request, alle_prijzen)
+            for document in get_documents(producttypen, get_language(), alle_prijzen)
+        ]
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_documents(page))
+
+        return Response(self.get_documents(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        (document,) = self.get_documents([self.get_object()])
+        return Response(document)
+
+
+PRIJZEN_PARAMETER = OpenApiParameter(
+    name="prijzen",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.QUERY,
+    enum=["actueel", "alle"],
+    description=(
+        "Welke prijzen worden teruggegeven: `actueel` (default) voor de actuele en "
+        "toekomstige prijzen of `alle` voor alle prijzen, inclusief de historie. De "
+        "historie kan ook per producttype worden opgehaald via `prijzen`."
+    ),
+    required=False,
+)
+
+PEILDATUM_PARAMETER = OpenApiParameter(
+    name="peildatum",
+    type=OpenApiTypes.DATE,
+    location=OpenApiParameter.QUERY,
+    description="De datum waarop de prijzen actief zijn, standaard vandaag.",
+    required=False,
+)
+
+
 @extend_schema_view(
     list=extend_schema(
         summary="Alle PRODUCTTYPEN opvragen.",
@@ -253,7 +317,8 @@ class Meta:
                 type=OpenApiTypes.STR,
                 location=OpenApiParameter.HEADER,
                 description="Optionele taal (`nl, `en`).",
-            )
+            ),
+            PRIJZEN_PARAMETER,
         ],
     ),
     retrieve=extend_schema(
@@ -264,7 +329,8 @@ class Meta:
                 type=OpenApiTypes.STR,
                 location=OpenApiParameter.HEADER,
                 description="Optionele taal (`nl, `en`).",
-            )
+            ),
+            PRIJZEN_PARAMETER,
         ],
     ),
     create=extend_schema(
@@ -282,44 +348,40 @@ class Meta:
     ),
 )
 class ProductTypeViewSet(
-    AuditTrailViewSetMixin, TranslatableViewSetMixin, ModelViewSet
+    AuditTrailViewSetMixin,
+    ProductTypeDocumentMixin,
+    TranslatableViewSetMixin,
+    ModelViewSet,
 ):
-    queryset = ProductType.objects.select_related(
-        "verbruiksobject_schema", "dataobject_schema", "uniforme_product_naam"
-    ).prefetch_related(
-        Prefetch("themas", queryset=Thema.objects.select_related("hoofd_thema")),
-        Prefetch("contacten", queryset=Contact.objects.select_related("organisatie")),
-        "locaties",
-        "organisaties",
-        "translations",
-        Prefetch("acties", queryset=Actie.objects.select_related("dmn_config")),
-        "bestanden",
+    queryset = get_producttype_queryset().prefetch_related(
         Prefetch(
             "content_elementen",
             queryset=ContentElement.objects.prefetch_related("translations"),
         ),
-        "externe_codes",
-        Prefetch(
-            "prijzen",
-            queryset=Prijs.objects.prefetch_related(
-                Prefetch(
-                    "prijsregels",
-                    queryset=PrijsRegel.objects.select_related("dmn_config"),
-                ),
-                "prijsopties",
-            ),
-        ),
-        "links",
-        "parameters",
-        "processen",
-        "verzoektypen",
-        "zaaktypen",
-        "translations",
     )
     serializer_class = ProductTypeSerializer
     lookup_field = "uuid"
     filterset_class = ProductTypeFilterSet
 
+    def get_queryset(self):
+        if self.action in ("actuele_prijzen", "actuele_prijs"):
+            return ProductType.objects.select_related(
+                "uniforme_product_naam"
+            ).prefetch_related(prefetch_actuele_prijs(self.get_peildatum()))
+        return super().get_queryset()
+
+    def get_peildatum(self) -> date:
+        value = self.request.query_params.get("peildatum")
+        if not value:
+            return date.today()
+
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise ParseError(
+                _("Ongeldig format voor peildatum query parameter, gebruik YYYY-MM-DD.")
+            )
+
     def initial(self, request, *args, **kwargs):
         # passing the translated fields to  the create call will set them for the language in the Accept-Language header.
         # but a POST/PUT/PATCH should only set the required language
@@ -368,7 +430,12 @@ class ProductTypeViewSet(
     @extend_schema(
         "actuele_prijzen",
         summary="Alle ACTUELE PRIJZEN opvragen.",
-        description="Geeft de huidige prijzen van alle PRODUCTTYPEN terug.",
+        description=(
+            "Geeft de huidige prijzen van de PRODUCTTYPEN terug, of de prijzen op de "
+            "`peildatum`. Deze lijst kan gefilterd worden met query-string parameters."
+        ),
+        parameters=[PEILDATUM_PARAMETER],
+        responses={200: ProductTypeActuelePrijsSerializer(many=True), **ERRORS},
     )
     @action(
         detail=False,
@@ -376,19 +443,23 @@ class ProductTypeViewSet(
         url_path="actuele-prijzen",
     )
     def actuele_prijzen(self, request):
-        producttypen = self.get_queryset().all()
-        serializer = ProductTypeActuelePrijsSerializer(producttypen, many=True)
-        return Response(serializer.data)
+        # the list of the ProductTypeDocumentMixin serves the producttype documents
+        return ListModelMixin.list(self, request)
 
     @extend_schema(
         "actuele_prijs",
         summary="De actuele PRIJS van een PRODUCTTYPE opvragen.",
-        description="Geeft de huidige prijzen van alle PRODUCTTYPEN terug.",
+        description=(
+            "Geeft de huidige prijs van een PRODUCTTYPE terug, of de prijs op de "
+            "`peildatum`."
+        ),
+        parameters=[PEILDATUM_PARAMETER],
     )
     @action(
         detail=True,
         serializer_class=ProductTypeActuelePrijsSerializer,
         url_path="actuele-prijs",
+        filterset_class=None,
     )
     def actuele_prijs(self, request, uuid=None):
         producttype = self.get_object()
@@ -10,3 +10,10 @@ class Operators(models.TextChoices):
     LTE = "lte", _("kleiner dan of gelijk aan")
     ICONTAINS = "icontains", _("hoofdletterongevoelige gedeeltelijke match")
     IN_LIST = "in", _("in een lijst van waarden gescheiden door `|`")
+
+
+class CountTypes(models.TextChoices):
+    EXACT = "exact", _("exact aantal")
+    CAPPED = "capped", _("aantal begrensd tot een maximum")
+    ESTIMATE = "estimate", _("schatting van de database")
+    NONE = "none", _("geen aantal")
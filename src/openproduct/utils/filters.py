@@ -1,5 +1,11 @@
+import json
+from collections.abc import Collection
+
 from django import forms
 from django.db import models
+from django.db.models import CharField, F, Func, Lookup
+from django.db.models.fields.json import compile_json_path
+from django.db.models.lookups import Exact
 
 import django_filters
 from django_filters import constants
@@ -106,14 +112,39 @@ class TranslationInFilter(django_filters.BaseInFilter, TranslationFilter):
     pass
 
 
-def filter_data_attr_value_part(
-    value_part: str, field_name: str, queryset: models.QuerySet
-) -> models.QuerySet:
+class JSONPathMatch(Lookup):
+    """
+    ``jsonb @@ jsonpath``, which can be served by a (``jsonb_path_ops``) GIN index.
+    """
+
+    lookup_name = "jsonpath_match"
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} @@ {rhs}::jsonpath", (*lhs_params, *rhs_params)
+
+
+JSONPATH_OPERATORS = {
+    Operators.GT.value: ">",
+    Operators.GTE.value: ">=",
+    Operators.LT.value: "<",
+    Operators.LTE.value: "<=",
+}
+
+
+def compile_data_attr_value_part(value_part: str, encoder) -> str:
     """
-    filter one value part for data_attr filters
+    compile one value part for data_attr filters into a jsonpath predicate
     """
     variable, operator, str_value = value_part.rsplit("__", 2)
     real_value = string_to_value(str_value)
+    path = compile_json_path(variable.split("__"))
+
+    def literal(value) -> str:
+        # values are encoded the same way as they are stored in the json field
+        return json.dumps(value, cls=encoder)
 
     match operator:
         case Operators.EXACT.value:
@@ -121,12 +152,87 @@ def filter_data_attr_value_part(
             in_vals: list = [str_value]
             if real_value != str_value:
                 in_vals.append(real_value)
-            queryset = queryset.filter(**{f"{field_name}__{variable}__in": in_vals})
-        case Operators.ICONTAINS.value:
+        case Operators.IN_LIST.value:
+            # in must be a list
+            in_vals = [string_to_value(value) for value in str_value.split("|")]
+        case _:
+            # gt, gte, lt, lte operators
+            return f"{path} {JSONPATH_OPERATORS[operator]} {literal(real_value)}"
+
+    literals = dict.fromkeys(literal(value) for value in in_vals)
+    return " || ".join(f"{path} == {value}" for value in literals)
+
+
+def filter_data_attr(
+    value: list[str],
+    field_name: str,
+    queryset: models.QuerySet,
+    indexed: Collection[str] = (),
+) -> models.QuerySet:
+    """
+    filter all value parts for data_attr filters
+
+    The value parts are compiled into a single strict jsonpath predicate so the
+    query can use the GIN index on the field. Value parts on ``indexed`` properties
+    are filtered with key transforms instead, which match the btree expression
+    indexes of those properties and can also serve range lookups. ``icontains``
+    can't be served by either index, so it is filtered on the text value of the key.
+    """
+    encoder = queryset.model._meta.get_field(field_name).encoder
+    predicates = []
+
+    for value_part in value:
+        variable, operator, str_value = value_part.rsplit("__", 2)
+
+        if operator == Operators.ICONTAINS.value:
             # icontains treats everything like strings
             queryset = queryset.filter(
                 **{f"{field_name}__{variable}__icontains": str_value}
             )
+        elif variable in indexed:
+            queryset = filter_data_attr_value_part(value_part, field_name, queryset)
+        else:
+            predicates.append(compile_data_attr_value_part(value_part, encoder))
+
+    if predicates:
+        jsonpath = "strict " + " && ".join(f"({p})" for p in predicates)
+        queryset = queryset.filter(JSONPathMatch(F(field_name), jsonpath))
+
+    return queryset
+
+
+def json_type(value) -> str:
+    """
+    the ``jsonb_typeof`` of a filter value as it is stored in the json field
+    """
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int | float):
+        return "number"
+    return "string"
+
+
+def filter_data_attr_value_part(
+    value_part: str, field_name: str, queryset: models.QuerySet
+) -> models.QuerySet:
+    """
+    filter one value part for data_attr filters with key transforms
+
+    The results are the same as those of the jsonpath predicate of
+    `compile_data_attr_value_part`: jsonb orders values of different types, where
+    jsonpath comparisons of different types never match, so the range lookups only
+    match values of the same type.
+    """
+    variable, operator, str_value = value_part.rsplit("__", 2)
+    real_value = string_to_value(str_value)
+
+    match operator:
+        case Operators.EXACT.value:
+            #  for exact operator try to filter on string and numeric values
+            in_vals: list = [str_value]
+            if real_value != str_value:
+                in_vals.append(real_value)
+            queryset = queryset.filter(**{f"{field_name}__{variable}__in": in_vals})
         case Operators.IN_LIST.value:
             # in must be a list
             values = str_value.split("|")
@@ -141,6 +247,14 @@ def filter_data_attr_value_part(
         case _:
             # gt, gte, lt, lte operators
             queryset = queryset.filter(
-                **{f"{field_name}__{variable}__{operator}": real_value}
+                Exact(
+                    Func(
+                        F(f"{field_name}__{variable}"),
+                        function="jsonb_typeof",
+                        output_field=CharField(),
+                    ),
+                    json_type(real_value),
+                ),
+                **{f"{field_name}__{variable}__{operator}": real_value},
             )
     return queryset
@@ -61,6 +61,25 @@ def is_valid_email(value: object) -> bool:
     return bool(re.match(pattern, str(value)))
 
 
+def build_validator(
+    schema: JSONObject, use_format_checker: bool | None = None
+) -> Draft202012Validator:
+    """
+    Compile the validator of *schema*, with the format checker when
+    *use_format_checker* (default: `JSONSCHEMA_USE_FORMAT_CHECKER`) is enabled.
+
+    The validator can be reused for multiple instances, which avoids compiling the
+    schema (and resolving its references) for every validation.
+    """
+    if use_format_checker is None:
+        use_format_checker = settings.JSONSCHEMA_USE_FORMAT_CHECKER
+
+    return Draft202012Validator(
+        schema,
+        format_checker=draft202012_format_checker if use_format_checker else None,
+    )
+
+
 def validate_jsonschema(
     instance: JSONObject, schema: JSONObject, label: str = "instance"
 ) -> None:
@@ -78,13 +97,16 @@ def validate_jsonschema(
         ValidationError: Raises a Django ValidationError with the first
             validation message produced by jsonschema.
     """
+    validate_with_validator(instance, build_validator(schema), label)
+
+
+def validate_with_validator(
+    instance: JSONObject, validator: Draft202012Validator, label: str = "instance"
+) -> None:
+    """
+    Validate *instance* with a compiled validator, see `validate_jsonschema`.
+    """
     try:
-        validator = Draft202012Validator(
-            schema,
-            format_checker=draft202012_format_checker
-            if settings.JSONSCHEMA_USE_FORMAT_CHECKER
-            else None,
-        )
         validator.validate(instance)
     except JSONValidationError as json_error:
         logger.exception("invalid_jsonschema")
@@ -0,0 +1,421 @@
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models
+from django.db.backends.utils import truncate_name
+from django.db.migrations.loader import MigrationLoader
+from django.urls import URLPattern, URLResolver, get_resolver
+
+from openproduct.utils.filters import FilterSet, TranslationFilter
+
+BTREE = "btree"
+TRIGRAM = "trigram"
+GIN = "gin"
+
+# lookups that a plain btree index on the (leading) column can serve
+BTREE_LOOKUPS = {"exact", "in", "gt", "gte", "lt", "lte", "range", "isnull"}
+# pattern lookups on text columns, these need a trigram index
+TRIGRAM_LOOKUPS = {
+    "contains",
+    "icontains",
+    "startswith",
+    "istartswith",
+    "endswith",
+    "iendswith",
+}
+# lookups on array/json columns, these need a GIN index
+GIN_LOOKUPS = {"overlap", "contains", "contained_by", "has_key", "has_keys"}
+
+TRIGRAM_OPCLASSES = {"gin_trgm_ops", "gist_trgm_ops"}
+
+INDEXES_SQL = """
+    SELECT
+        ic.relname,
+        am.amname,
+        ARRAY(
+            SELECT a.attname
+            FROM unnest(i.indkey) WITH ORDINALITY AS k(attnum, ord)
+            LEFT JOIN pg_attribute a
+                ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+            ORDER BY k.ord
+        ),
+        ARRAY(
+            SELECT opc.opcname
+            FROM unnest(i.indclass) WITH ORDINALITY AS o(opcoid, ord)
+            JOIN pg_opclass opc ON opc.oid = o.opcoid
+            ORDER BY o.ord
+        )
+    FROM pg_index i
+    JOIN pg_class tc ON tc.oid = i.indrelid
+    JOIN pg_class ic ON ic.oid = i.indexrelid
+    JOIN pg_am am ON am.oid = ic.relam
+    WHERE tc.relname = %s
+        AND pg_catalog.pg_table_is_visible(tc.oid)
+        AND i.indisvalid
+        AND i.indpred IS NULL
+"""
+
+MIGRATION_TEMPLATE = """\
+# Generated by the index_advisor management command
+
+{imports}
+
+
+class Migration(migrations.Migration):
+    # indexes are created concurrently, which can't run in a transaction
+    atomic = False
+
+    dependencies = [
+        {dependencies}
+    ]
+
+    operations = [
+{operations}
+    ]
+"""
+
+RUN_SQL_TEMPLATE = """\
+        migrations.RunSQL(
+            sql={sql!r},
+            reverse_sql={reverse_sql!r},
+        ),"""
+
+
+@dataclass(frozen=True)
+class ExistingIndex:
+    name: str
+    method: str
+    columns: tuple[str | None, ...]
+    opclasses: tuple[str, ...]
+
+
+@dataclass
+class IndexSuggestion:
+    model: type[models.Model]
+    column: str
+    kind: str
+    usages: set[str] = field(default_factory=set)
+
+    @property
+    def table(self) -> str:
+        return self.model._meta.db_table
+
+    @property
+    def name(self) -> str:
+        suffix = {BTREE: "idx", TRIGRAM: "trgm", GIN: "gin"}[self.kind]
+        return truncate_name(f"{self.table}_{self.column}_{suffix}", 63)
+
+    def get_sql(self) -> str:
+        name = connection.ops.quote_name(self.name)
+        table = connection.ops.quote_name(self.table)
+        column = connection.ops.quote_name(self.column)
+        if self.kind == TRIGRAM:
+            expression = f"USING gin ({column} gin_trgm_ops)"
+        elif self.kind == GIN:
+            expression = f"USING gin ({column})"
+        else:
+            expression = f"({column})"
+        return f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {expression}"
+
+    def get_reverse_sql(self) -> str:
+        return (
+            f"DROP INDEX CONCURRENTLY IF EXISTS {connection.ops.quote_name(self.name)}"
+        )
+
+    def is_covered_by(self, index: ExistingIndex) -> bool:
+        if self.kind == TRIGRAM:
+            return any(
+                column == self.column and opclass in TRIGRAM_OPCLASSES
+                for column, opclass in zip(index.columns, index.opclasses)
+            )
+        if self.kind == GIN:
+            return index.method == "gin" and self.column in index.columns
+        # btree indexes can only be used on their leading column
+        return index.method == "btree" and index.columns[:1] == (self.column,)
+
+
+def get_index_kind(model_field: models.Field, lookup: str) -> str | None:
+    if isinstance(model_field, (ArrayField, models.JSONField)):
+        return GIN if lookup in GIN_LOOKUPS else None
+
+    if lookup in TRIGRAM_LOOKUPS and isinstance(
+        model_field, (models.CharField, models.TextField)
+    ):
+        return TRIGRAM
+
+    if lookup in BTREE_LOOKUPS:
+        return BTREE
+
+    return None
+
+
+def resolve_path(
+    model: type[models.Model], path: str, lookup: str
+) -> tuple[type[models.Model], models.Field, str] | None:
+    """
+    Follow a django-filter ``field_name`` (e.g. ``producttype__themas__naam``) to the
+    model and concrete field that is eventually filtered on.
+
+    Joins are served by the indexes Django creates for foreign keys, so only the last
+    field of the path needs to be checked.
+    """
+    parts = path.split("__")
+
+    for position, part in enumerate(parts):
+        try:
+            model_field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+
+        is_last = position == len(parts) - 1
+
+        if isinstance(model_field, models.JSONField) and not is_last:
+            # key transforms on a json field
+            return model, model_field, lookup
+
+        if not model_field.is_relation:
+            if not is_last:
+                # transforms like `__date` or `__year`
+                return None
+            return model, model_field, lookup
+
+        if is_last:
+            if model_field.many_to_one or model_field.one_to_one:
+                assert isinstance(model_field, models.Field)
+                return model, model_field, lookup
+            # the join table/reverse foreign key is already indexed
+            return None
+
+        model = model_field.related_model
+
+    return None
+
+
+def get_filter_path(filter) -> str | None:
+    if getattr(filter, "method", None):
+        # custom filter methods cannot be introspected
+        return None
+
+    if isinstance(filter, TranslationFilter):
+        path = f"translations__{filter.field_name}"
+        if filter.model_field_name:
+            path = f"{filter.model_field_name}__{path}"
+        return path
+
+    return filter.field_name
+
+
+def get_all_subclasses(cls: type) -> list[type]:
+    subclasses = []
+    for subclass in cls.__subclasses__():
+        subclasses.append(subclass)
+        subclasses += get_all_subclasses(subclass)
+    return subclasses
+
+
+def get_viewsets(patterns=None) -> list[type]:
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+
+    viewsets = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            viewsets += get_viewsets(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            viewset = getattr(pattern.callback, "cls", None)
+            if viewset and getattr(viewset, "queryset", None) is not None:
+                viewsets.append(viewset)
+
+    return list(dict.fromkeys(viewsets))
+
+
+def get_existing_indexes(table: str) -> list[ExistingIndex]:
+    with connection.cursor() as cursor:
+        cursor.execute(INDEXES_SQL, [table])
+        return [
+            ExistingIndex(
+                name=name,
+                method=method,
+                columns=tuple(columns),
+                opclasses=tuple(opclasses),
+            )
+            for name, method, columns, opclasses in cursor.fetchall()
+        ]
+
+
+def collect_suggestions() -> list[IndexSuggestion]:
+    # make sure all viewsets (and thereby all filtersets) are imported
+    import_module(settings.ROOT_URLCONF)
+
+    suggestions: dict[tuple[str, str, str], IndexSuggestion] = {}
+
+    def add(model, path, lookup, usage):
+        resolved = resolve_path(model, path, lookup)
+        if resolved is None:
+            return
+
+        model, model_field, lookup = resolved
+        if not (kind := get_index_kind(model_field, lookup)):
+            return
+
+        key = (model._meta.db_table, model_field.column, kind)
+        if key not in suggestions:
+            suggestions[key] = IndexSuggestion(
+                model=model, column=model_field.column, kind=kind
+            )
+        suggestions[key].usages.add(usage)
+
+    for filterset in get_all_subclasses(FilterSet):
+        model = filterset._meta.model
+        if model is None:
+            continue
+
+        for name, filter in filterset.base_filters.items():
+            if path := get_filter_path(filter):
+                add(model, path, filter.lookup_expr, f"{filterset.__name__}.{name}")
+
+    for viewset in get_viewsets():
+        model = viewset.queryset.model
+        ordering = getattr(viewset, "ordering", None) or model._meta.ordering
+        for order in ordering or ():
+            if isinstance(order, str):
+                add(
+                    model,
+                    order.lstrip("-"),
+                    "exact",
+                    f"{viewset.__name__} ordering {order}",
+                )
+
+    return list(suggestions.values())
+
+
+def get_missing_indexes() -> list[IndexSuggestion]:
+    indexes_per_table: dict[str, list[ExistingIndex]] = {}
+    missing = []
+
+    for suggestion in collect_suggestions():
+        if suggestion.table not in indexes_per_table:
+            indexes_per_table[suggestion.table] = get_existing_indexes(suggestion.table)
+
+        if not any(
+            suggestion.is_covered_by(index)
+            for index in indexes_per_table[suggestion.table]
+        ):
+            missing.append(suggestion)
+
+    return sorted(missing, key=lambda s: (s.table, s.column, s.kind))
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the filter and ordering paths of the API that are not backed by a "
+        "database index and suggest the indexes to add."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format",
+            choices=["text", "sql", "migration"],
+            default="text",
+            help=(
+                "text: human readable report (default), sql: CREATE INDEX statements, "
+                "migration: a migration per app that creates the missing indexes."
+            ),
+        )
+        parser.add_argument(
+            "--write",
+            action="store_true",
+            help="Write the migrations to the migration folders of the apps instead "
+            "of printing them (only with --format=migration).",
+        )
+
+    def handle(self, **options):
+        output_format = options.pop("format")
+        write = options.pop("write")
+
+        if connection.vendor != "postgresql":
+            raise CommandError("The index advisor only supports PostgreSQL.")
+
+        if write and output_format != "migration":
+            raise CommandError("--write can only be used with --format=migration.")
+
+        missing = get_missing_indexes()
+
+        match output_format:
+            case "sql":
+                for suggestion in missing:
+                    self.stdout.write(f"{suggestion.get_sql()};")
+            case "migration":
+                self._handle_migrations(missing, write)
+            case _:
+                self._handle_report(missing)
+
+    def _handle_report(self, missing: list[IndexSuggestion]):
+        if not missing:
+            self.stdout.write("All filter and ordering paths are backed by an index.")
+            return
+
+        for suggestion in missing:
+            self.stdout.write(
+                f"{suggestion.table}.{suggestion.column} has no {suggestion.kind} index"
+            )
+            for usage in sorted(suggestion.usages):
+                self.stdout.write(f"    used by {usage}")
+            self.stdout.write(f"    suggestion: {suggestion.get_sql()};")
+
+        self.stdout.write(f"\n{len(missing)} missing index(es).")
+
+    def _handle_migrations(self, missing: list[IndexSuggestion], write: bool):
+        per_app: dict[str, list[IndexSuggestion]] = defaultdict(list)
+        for suggestion in missing:
+            per_app[suggestion.model._meta.app_label].append(suggestion)
+
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+
+        for app_label, suggestions in sorted(per_app.items()):
+            leaf_nodes = loader.graph.leaf_nodes(app_label)
+            dependencies = [*leaf_nodes]
+            operations = [
+                RUN_SQL_TEMPLATE.format(
+                    sql=suggestion.get_sql(),
+                    reverse_sql=suggestion.get_reverse_sql(),
+                )
+                for suggestion in suggestions
+            ]
+
+            imports = "from django.db import migrations"
+            if any(suggestion.kind == TRIGRAM for suggestion in suggestions):
+                imports = (
+                    "from django.contrib.postgres.operations import TrigramExtension\n"
+                    f"{imports}"
+                )
+                operations.insert(0, "        TrigramExtension(),")
+
+            content = MIGRATION_TEMPLATE.format(
+                imports=imports,
+                dependencies="\n        ".join(f"{dep!r}," for dep in dependencies),
+                operations="\n".join(operations),
+            )
+
+            number = int(leaf_nodes[0][1][:4]) + 1 if leaf_nodes else 1
+            migration_name = f"{number:04d}_index_advisor"
+
+            if not write:
+                self.stdout.write(f"# {app_label}/migrations/{migration_name}.py")
+                self.stdout.write(content)
+                continue
+
+            module = import_module(loader.migrations_module(app_label)[0])
+            assert module.__file__
+            path = os.path.join(
+                os.path.dirname(module.__file__), f"{migration_name}.py"
+            )
+            with open(path, "w") as f:
+                f.write(content)
+            self.stdout.write(f"Created {path}")
@@ -1,6 +1,7 @@
 import os
 
 from django.conf import settings
+from django.contrib.postgres.operations import NotInTransactionMixin
 from django.db import migrations, router
 
 
@@ -59,3 +60,101 @@ class ResetSequences(migrations.RunSQL):
 
     def database_backwards(self, *args, **kwargs) -> None:
         pass
+
+
+class AlterFieldUniqueConcurrently(NotInTransactionMixin, migrations.AlterField):
+    """
+    Alter a field to ``unique=True`` without blocking writes on the table.
+
+    The regular :class:`~django.db.migrations.AlterField` adds the unique constraint
+    with a single ``ALTER TABLE``, which builds the backing index while holding a lock
+    that blocks all writes. This operation builds the index with
+    ``CREATE UNIQUE INDEX CONCURRENTLY`` first and then attaches it as the constraint,
+    which only needs a short lock. The resulting constraint has the name Django would
+    have generated, so later migrations can alter the field as usual.
+
+    A failed run can be repeated: an invalid index that is left behind by a failed
+    build is dropped first, and a valid index or the constraint is reused.
+
+    .. note:: PostgreSQL only. The migration using this operation must set
+      ``atomic = False``.
+
+    Usage:
+
+        >>> class Migration(migrations.Migration):
+        ...     atomic = False
+        ...     dependencies = (...)
+        ...     operations = [
+        ...         AlterFieldUniqueConcurrently(
+        ...             model_name="product",
+        ...             name="uuid",
+        ...             field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ...         ),
+        ...     ]
+    """
+
+    def _get_constraint_name(self, schema_editor, model) -> tuple[str, str, str]:
+        table = model._meta.db_table
+        column = model._meta.get_field(self.name).column
+        constraint_name = schema_editor._create_index_name(
+            table, [column], suffix="_uniq"
+        )
+        return table, column, constraint_name
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state) -> None:
+        self._ensure_not_in_transaction(schema_editor)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+
+        table, column, constraint_name = self._get_constraint_name(schema_editor, model)
+        quote_name = schema_editor.quote_name
+
+        with schema_editor.connection.cursor() as cursor:
+            # the constraint exists when a previous run failed after adding it
+            cursor.execute(
+                "SELECT EXISTS (SELECT FROM pg_constraint "
+                "WHERE conrelid = %s::regclass AND conname = %s)",
+                [table, constraint_name],
+            )
+            if cursor.fetchone()[0]:
+                return
+
+            cursor.execute(
+                "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)",
+                [quote_name(constraint_name)],
+            )
+            row = cursor.fetchone()
+
+        # a failed or interrupted concurrent build (e.g. by duplicate values) leaves
+        # an invalid index behind, which is built again
+        if row is not None and not row[0]:
+            schema_editor.execute(
+                f"DROP INDEX CONCURRENTLY {quote_name(constraint_name)}"
+            )
+        schema_editor.execute(
+            f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "
+            f"{quote_name(constraint_name)} ON {quote_name(table)} ({quote_name(column)})"
+        )
+        schema_editor.execute(
+            f"ALTER TABLE {quote_name(table)} ADD CONSTRAINT "
+            f"{quote_name(constraint_name)} UNIQUE USING INDEX "
+            f"{quote_name(constraint_name)}"
+        )
+
+    def database_backwards(
+        self, app_label, schema_editor, from_state, to_state
+    ) -> None:
+        self._ensure_not_in_transaction(schema_editor)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+
+        table, _, constraint_name = self._get_constraint_name(schema_editor, model)
+        quote_name = schema_editor.quote_name
+
+        # dropping the constraint also drops the index it was created from
+        schema_editor.execute(
+            f"ALTER TABLE {quote_name(table)} DROP CONSTRAINT IF EXISTS "
+            f"{quote_name(constraint_name)}"
+        )
@@ -6,7 +6,7 @@ from django.utils.translation import gettext_lazy as _
 
 class BaseModel(models.Model):
     id = models.AutoField(primary_key=True)
-    uuid = models.UUIDField(default=uuid4, editable=False)
+    uuid = models.UUIDField(default=uuid4, editable=False, unique=True)
 
     class Meta:
         abstract = True
@@ -1,5 +1,12 @@
+import time
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 
+import jwt
+import requests
+import structlog
 from drf_spectacular.extensions import OpenApiAuthenticationExtension, _SchemaType
 from drf_spectacular.openapi import AutoSchema
 from mozilla_django_oidc_db.backends import (
@@ -7,9 +14,20 @@ from mozilla_django_oidc_db.backends import (
 )
 from mozilla_django_oidc_db.constants import OIDC_ADMIN_CONFIG_IDENTIFIER
 from mozilla_django_oidc_db.models import OIDCClient
+from rest_framework.exceptions import AuthenticationFailed
+
+from .typing import JSONObject
+
+logger = structlog.stdlib.get_logger(__name__)
 
 User = get_user_model()
 
+# the key set is refreshed by the `refresh_oidc_jwks` task before it expires
+JWKS_CACHE_TIMEOUT = 60 * 60
+
+# tokens signed with an unknown key refresh the key set at most once per interval
+JWKS_REFRESH_INTERVAL = 60
+
 
 class OIDCAuthenticationBackend(_OIDCAuthenticationBackendDB):
     """
@@ -17,12 +35,123 @@ class OIDCAuthenticationBackend(_OIDCAuthenticationBackendDB):
     The drf integration of the base package does not use this method and instead just calls the userinfo endpoint of the oidc provider.
 
     This class sets the config_class so that it is accessible in the get_userinfo method.
+
+    With `OIDC_VERIFY_ACCESS_TOKENS_LOCALLY` the claims of JWT access tokens are
+    verified with the cached key set of the provider instead of the userinfo endpoint.
+    The issuer is derived from the discovery endpoint of the provider, without it the
+    tokens are verified by the userinfo endpoint.
     """
 
+    claims: JSONObject | None = None  # set during the get_userinfo call
+
     def get_or_create_user(self, access_token: str, id_token: str, payload):
         self.config = OIDCClient.objects.resolve(OIDC_ADMIN_CONFIG_IDENTIFIER)
         return super().get_or_create_user(access_token, id_token, payload)
 
+    def get_issuer(self) -> str | None:
+        """
+        The issuer of the provider, which is the discovery endpoint without the
+        `.well-known/openid-configuration` path.
+        """
+        provider = self.config.oidc_provider if self.config else None
+        if provider is None or not provider.oidc_op_discovery_endpoint:
+            return None
+        return provider.oidc_op_discovery_endpoint.rstrip("/")
+
+    def get_userinfo(self, access_token: str, id_token: str, payload) -> JSONObject:
+        if (
+            settings.OIDC_VERIFY_ACCESS_TOKENS_LOCALLY
+            and self.OIDC_OP_JWKS_ENDPOINT
+            and self.get_issuer()
+        ):
+            try:
+                header = jwt.get_unverified_header(access_token)
+            except jwt.DecodeError:
+                # opaque tokens can only be verified by the provider
+                header = None
+
+            if header is not None:
+                self.claims = self.verify_access_token(access_token, header)
+                return self.claims
+
+        self.claims = super().get_userinfo(access_token, id_token, payload)
+        return self.claims
+
+    def verify_access_token(self, access_token: str, header: dict) -> JSONObject:
+        jwks = self.get_jwks()
+        key = _find_jwk(jwks, header)
+        if key is None and time.time() - jwks["fetched"] > JWKS_REFRESH_INTERVAL:
+            key = _find_jwk(self.refresh_jwks(), header)
+
+        try:
+            if key is None:
+                raise jwt.InvalidKeyError("No key found for the token.")
+            claims = jwt.decode(
+                access_token,
+                jwt.PyJWK(key).key,
+                algorithms=[self.OIDC_RP_SIGN_ALGO],
+                issuer=self.get_issuer(),
+                # the audience is checked below
+                options={"verify_aud": False, "require": ["exp", "iss"]},
+            )
+
+            # access tokens of e.g. Keycloak have the client as authorized party
+            # instead of as audience
+            audience = claims.get("aud") or []
+            if isinstance(audience, str):
+                audience = [audience]
+            client_id = self.OIDC_RP_CLIENT_ID
+            if client_id not in audience and claims.get("azp") != client_id:
+                raise jwt.InvalidAudienceError("Audience doesn't match")
+            return claims
+        except jwt.PyJWTError as exc:
+            logger.info("oidc_access_token_verification_failed", reason=str(exc))
+            raise AuthenticationFailed("Token verification failed")
+
+    def get_jwks(self) -> dict:
+        jwks = caches["oidc"].get(_jwks_cache_key(self.OIDC_OP_JWKS_ENDPOINT))
+        return jwks if jwks is not None else self.refresh_jwks()
+
+    def refresh_jwks(self) -> dict:
+        """
+        Fetch the key set of the provider and cache it for all processes.
+        """
+        try:
+            response = requests.get(
+                self.OIDC_OP_JWKS_ENDPOINT,
+                verify=self.get_settings("OIDC_VERIFY_SSL", True),
+                timeout=self.get_settings("OIDC_TIMEOUT", None),
+                proxies=self.get_settings("OIDC_PROXY", None),
+            )
+            response.raise_for_status()
+            keys = response.json()["keys"]
+        except (requests.RequestException, KeyError, TypeError):
+            logger.exception("oidc_jwks_refresh_failed")
+            raise AuthenticationFailed(
+                "OIDC authentication failed: the key set of the provider could not "
+                "be fetched."
+            )
+
+        jwks = {"keys": keys, "fetched": time.time()}
+        caches["oidc"].set(
+            _jwks_cache_key(self.OIDC_OP_JWKS_ENDPOINT), jwks, JWKS_CACHE_TIMEOUT
+        )
+        return jwks
+
+
+def _jwks_cache_key(endpoint: str) -> str:
+    return f"oidc_jwks:{endpoint}"
+
+
+def _find_jwk(jwks: dict, header: dict) -> dict | None:
+    for key in jwks["keys"]:
+        if key.get("kid") != header.get("kid"):
+            continue
+        if "alg" in key and key["alg"] != header.get("alg"):
+            continue
+        return key
+    return None
+
 
 class OIDCScheme(OpenApiAuthenticationExtension):
     target_class = "openproduct.utils.oidc_drf_middleware.OIDCAuthentication"
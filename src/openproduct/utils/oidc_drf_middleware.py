@@ -1,18 +1,148 @@
+import hashlib
+import time
+import uuid
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.core.cache import caches
 from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
 
+import jwt
 import structlog
 from mozilla_django_oidc.contrib.drf import OIDCAuthentication as _OIDCAuthentication
 from mozilla_django_oidc.utils import parse_www_authenticate_header
 from requests.exceptions import HTTPError
 from rest_framework.exceptions import AuthenticationFailed
 
+from .typing import JSONObject
+
 logger = structlog.stdlib.get_logger(__name__)
 
+# the users of opaque access tokens are cached for at most this number of seconds,
+# since it's unknown when they expire
+OPAQUE_TOKEN_CACHE_TIMEOUT = 60
+
+
+def _token_cache_key(access_token: str) -> str:
+    # the tokens themselves are not stored in the cache
+    return f"oidc_token:{hashlib.sha256(access_token.encode()).hexdigest()}"
+
+
+def _user_version_cache_key(user_id: int) -> str:
+    return f"oidc_user_version:{user_id}"
+
+
+def _get_user_version(user_id: int) -> str:
+    """
+    The version of the cached users of the tokens of a user, which is changed by
+    `clear_token_user_cache` to invalidate them.
+    """
+    return caches["oidc"].get_or_set(
+        _user_version_cache_key(user_id),
+        lambda: uuid.uuid4().hex,
+        settings.OIDC_TOKEN_CACHE_TIMEOUT,
+    )
+
+
+def clear_token_user_cache(user_ids: Iterable[int]) -> None:
+    """
+    Invalidate the cached users of the access tokens of the users, now & when the
+    transaction is committed, so a user that was cached from the previous state
+    during the transaction is invalidated as well.
+    """
+    cache_keys = [_user_version_cache_key(user_id) for user_id in user_ids]
+    if not cache_keys:
+        return
+
+    caches["oidc"].delete_many(cache_keys)
+    transaction.on_commit(lambda: caches["oidc"].delete_many(cache_keys))
+
+
+def get_cached_token_user(
+    access_token: str,
+) -> tuple[AbstractBaseUser, JSONObject] | None:
+    """
+    The user, including its permissions, and the claims that were resolved for the
+    access token, if they were cached and haven't expired or been invalidated.
+    """
+    if not settings.OIDC_TOKEN_CACHE_TIMEOUT:
+        return None
+
+    cached = caches["oidc"].get(_token_cache_key(access_token))
+    if cached is None:
+        return None
+
+    expires = cached["expires"]
+    if expires is not None and expires <= time.time():
+        return None
+
+    # the user was changed since it was cached
+    user = cached["user"]
+    if caches["oidc"].get(_user_version_cache_key(user.pk)) != cached["version"]:
+        return None
+
+    return user, cached["claims"]
+
+
+def get_token_expiry(access_token: str, claims: JSONObject) -> float | None:
+    """
+    The expiry of the access token, from the verified claims or otherwise from the
+    unverified payload of a JWT, which is only used to limit the caching.
+    """
+    expires = claims.get("exp")
+    if expires is None:
+        try:
+            payload = jwt.decode(access_token, options={"verify_signature": False})
+        except jwt.DecodeError:
+            return None
+        expires = payload.get("exp")
+
+    return expires if isinstance(expires, int | float) else None
+
+
+def cache_token_user(access_token: str, user, claims: JSONObject | None) -> None:
+    """
+    Cache the user & claims of the access token for `OIDC_TOKEN_CACHE_TIMEOUT`
+    seconds, or until the token expires. Opaque tokens are cached for at most
+    `OPAQUE_TOKEN_CACHE_TIMEOUT` seconds.
+
+    The cached users are invalidated when the user, its groups or its permissions
+    are changed, see `openproduct.accounts.signals`.
+    """
+    claims = claims or {}
+    timeout = settings.OIDC_TOKEN_CACHE_TIMEOUT
+    expires = get_token_expiry(access_token, claims)
+    if expires is None:
+        timeout = min(timeout, OPAQUE_TOKEN_CACHE_TIMEOUT)
+    else:
+        timeout = min(timeout, int(expires - time.time()))
+
+    if timeout <= 0 or not user.is_active:
+        return
+
+    # load the permissions, which are cached on the user by the ModelBackend
+    user.get_all_permissions()
+    caches["oidc"].set(
+        _token_cache_key(access_token),
+        {
+            "user": user,
+            "claims": claims,
+            "expires": expires,
+            "version": _get_user_version(user.pk),
+        },
+        timeout,
+    )
+
 
 class OIDCAuthentication(_OIDCAuthentication):
     """
     Original OIDCAuthentication only checks for HTTP 401 but other 4xx status codes
     are re-raised which results in an 500 error for open product.
+
+    The users & claims of the access tokens are cached, so the provider and the
+    database are only queried for unknown tokens.
     """
 
     def authenticate(self, request):
@@ -20,8 +150,13 @@ class OIDCAuthentication(_OIDCAuthentication):
         # WSGIRequest
         self.backend.request = request._request
 
+        access_token = self.get_access_token(request)
+        if access_token and (cached := get_cached_token_user(access_token)):
+            user, self.backend.claims = cached
+            return user, access_token
+
         try:
-            return super().authenticate(request)
+            result = super().authenticate(request)
         except ImproperlyConfigured:
             logger.exception("oidc_authentication_failed")
             raise AuthenticationFailed(
@@ -41,3 +176,9 @@ class OIDCAuthentication(_OIDCAuthentication):
 
             logger.exception("oidc_authentication_failed")
             raise AuthenticationFailed(msg)
+
+        if result is not None and settings.OIDC_TOKEN_CACHE_TIMEOUT:
+            user, access_token = result
+            cache_token_user(access_token, user, getattr(self.backend, "claims", None))
+
+        return result
@@ -1,7 +1,238 @@
+import json
+from math import ceil
+
+from django.core.paginator import EmptyPage, InvalidPage, Page, Paginator
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import CursorPagination as _CursorPagination
 from vng_api_common.pagination import DynamicPageSizePagination
 
+from openproduct.utils.enums import CountTypes
+
+
+class CursorPagination(_CursorPagination):
+    """
+    Keyset pagination, so deep pages don't need an OFFSET and rows that are inserted
+    while a client walks the list don't shift the pages.
+
+    The pages are ordered on the (unique) id, or on the ordering of the
+    `OrderingFilter` of the view with the id as tiebreaker.
+    """
+
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    ordering = "-id"
+
+    def get_ordering(self, request, queryset, view):
+        ordering = tuple(super().get_ordering(request, queryset, view))
+
+        fields = {field.lstrip("-") for field in ordering}
+        if fields & {"id", "pk"}:
+            return ordering
+
+        # rows with the same value of the ordering are kept in a stable order
+        tiebreaker = "-id" if ordering[0].startswith("-") else "id"
+        return (*ordering, tiebreaker)
+
+
+class UncountedPage(Page):
+    def __init__(self, object_list, number, paginator, has_next: bool):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class UncountedPaginator(Paginator):
+    """
+    Paginator that doesn't need the exact number of objects.
+
+    A page fetches one extra row to know if there is a next page, the count is
+    skipped, capped with a bounded ``COUNT(*)`` or estimated by the query planner.
+    """
+
+    def __init__(self, object_list, per_page, count_type: CountTypes, count_cap: int):
+        super().__init__(object_list, per_page)
+        self.count_type = count_type
+        self.count_cap = count_cap
+        # the pages that are known to exist from the pages that were fetched
+        self.known_pages = 1
+
+    def validate_number(self, number):
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise InvalidPage(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        objects = list(self.object_list[bottom : bottom + self.per_page + 1])
+
+        if number > 1 and not objects:
+            raise EmptyPage(self.error_messages["no_results"])
+
+        has_next = len(objects) > self.per_page
+        self.known_pages = max(self.known_pages, number + has_next)
+        return UncountedPage(objects[: self.per_page], number, self, has_next)
+
+    @cached_property
+    def counted(self) -> tuple[int | None, CountTypes]:
+        """
+        Return the count and the kind of count that was returned.
+        """
+        if self.count_type == CountTypes.NONE:
+            return None, CountTypes.NONE
+
+        if self.count_type == CountTypes.ESTIMATE:
+            # small estimates are the least reliable ones, those are counted instead
+            estimate = self.get_estimate()
+            if estimate is not None and estimate > self.count_cap:
+                return estimate, CountTypes.ESTIMATE
+
+        count = self.object_list[: self.count_cap + 1].count()
+        if count > self.count_cap:
+            return self.count_cap, CountTypes.CAPPED
+
+        return count, CountTypes.EXACT
+
+    @property
+    def count(self):
+        return self.counted[0]
+
+    @property
+    def num_pages(self):
+        """
+        The number of pages of the count, but at least the pages that are known to
+        exist, as the count can be skipped, capped or an underestimate.
+        """
+        count = self.count
+        pages = ceil(max(1, count - self.orphans) / self.per_page) if count else 1
+        return max(pages, self.known_pages)
+
+    def get_estimate(self) -> int | None:
+        # the planner estimate of the rows for the joins of distinct filters is
+        # too far off to be useful
+        if self.object_list.query.distinct:
+            return None
+
+        plan = json.loads(self.object_list.explain(format="json"))
+        return plan[0]["Plan"]["Plan Rows"]
+
 
 class Pagination(DynamicPageSizePagination):
+    """
+    Page number pagination, or cursor pagination when the `cursor` query parameter
+    is given (it can be empty for the first page).
+    """
+
     page_size = 100
     page_size_query_param = "page_size"
     max_page_size = 500
+    cursor_query_param = "cursor"
+    cursor_query_description = _(
+        "Gebruik cursor paginering in plaats van pagina nummers. Laat de waarde leeg "
+        "voor de eerste pagina en volg daarna de `next` links. In deze modus bevat "
+        "het antwoord geen `count`."
+    )
+    count_query_param = "count"
+    count_query_description = _(
+        "Het soort `count` in het antwoord: `exact` (default), `capped` (exact tot "
+        "maximaal {count_cap}), `estimate` (een schatting van de database voor "
+        "grote aantallen) of `none` (geen count). Het soort `count` dat is "
+        "teruggegeven staat in `count_type`."
+    )
+    count_cap = 10_000
+
+    cursor_pagination = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param in request.query_params:
+            self.cursor_pagination = CursorPagination()
+            return self.cursor_pagination.paginate_queryset(queryset, request, view)
+
+        count_type = self.get_count_type(request)
+        if count_type == CountTypes.EXACT:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        paginator = UncountedPaginator(queryset, page_size, count_type, self.count_cap)
+        page_number = request.query_params.get(self.page_query_param) or 1
+
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg)
+
+        return list(self.page)
+
+    def get_count_type(self, request) -> CountTypes:
+        value = request.query_params.get(self.count_query_param) or CountTypes.EXACT
+        if value not in CountTypes.values:
+            raise ValidationError(
+                {
+                    self.count_query_param: _(
+                        "`%(value)s` is geen geldige keuze, kies uit: %(choices)s."
+                    )
+                    % {"value": value, "choices": ", ".join(CountTypes.values)}
+                }
+            )
+        return CountTypes(value)
+
+    def get_paginated_response(self, data):
+        if self.cursor_pagination:
+            response = self.cursor_pagination.get_paginated_response(data)
+            response.data["count_type"] = CountTypes.NONE.value
+            return response
+
+        response = super().get_paginated_response(data)
+
+        count_type = CountTypes.EXACT
+        if isinstance(self.page.paginator, UncountedPaginator):
+            count_type = self.page.paginator.counted[1]
+
+        response.data["count_type"] = count_type.value
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count"]["nullable"] = True
+        response_schema["properties"]["count_type"] = {
+            "type": "string",
+            "enum": CountTypes.values,
+            "example": CountTypes.EXACT.value,
+        }
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.count_query_description).format(
+                    count_cap=self.count_cap
+                ),
+                "schema": {"type": "string", "enum": CountTypes.values},
+            },
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.cursor_query_description),
+                "schema": {"type": "string"},
+            },
+        ]
@@ -1,15 +1,32 @@
+from collections.abc import Sequence
 from uuid import UUID
 
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers import serialize
+from django.db import models, router
 from django.forms.models import model_to_dict
 from django.utils.translation import gettext_lazy as _
 
+import reversion
 from drf_spectacular.utils import OpenApiExample, extend_schema_serializer
 from rest_framework import serializers
 from rest_framework.serializers import Serializer
+from reversion.models import Version
 
 from .models import BaseModel
 
 
+def get_list_query_param(request, name: str) -> set[str]:
+    """
+    Return the values of a comma separated query parameter.
+
+    Uses `request.GET`, which also works for plain Django requests (e.g. the
+    viewsets that are instantiated to resolve notification resources).
+    """
+    value = request.GET.get(name, "")
+    return {part.strip() for part in value.split(",") if part.strip()}
+
+
 def get_from_serializer_data_or_instance(
     field: str, data: dict, serializer: Serializer
 ):
@@ -53,6 +70,108 @@ def set_nested_serializer(data: list[dict], serializer: type[Serializer]):
     serializer_instance.save()
 
 
+def reconcile_nested_objects(
+    model: type[models.Model],
+    parent_field: str,
+    data: Sequence[tuple[models.Model, list[dict]]],
+    key_fields: Sequence[str],
+) -> None:
+    """
+    Make the nested objects of one or more parents match the (validated) data.
+
+    `data` contains the parents with the nested objects they should have. The existing
+    objects are loaded in one query and matched on the `key_fields` (e.g. `uuid` or
+    `urn` & `url`). Matched objects are only updated when a value has changed, so
+    unchanged rows are untouched. Existing objects without a match are deleted and
+    items without a match are created. This takes at most one select, delete, update
+    and insert query.
+    """
+    if not data:
+        return
+
+    def get_key(values) -> tuple:
+        return tuple(values.get(field) for field in key_fields)
+
+    parent_attname = model._meta.get_field(parent_field).attname
+    existing = list(
+        model.objects.filter(**{f"{parent_field}__in": [parent for parent, _ in data]})
+    )
+    existing_by_key = {}
+    for obj in existing:
+        existing_by_key.setdefault(
+            (getattr(obj, parent_attname), get_key(obj.__dict__)), obj
+        )
+
+    to_create = []
+    to_update = []
+    update_fields = set()
+    matched = set()
+
+    for parent, items in data:
+        for attrs in items:
+            obj = existing_by_key.get((parent.pk, get_key(attrs)))
+            if obj is None or obj.pk in matched:
+                to_create.append(model(**attrs, **{parent_field: parent}))
+                continue
+
+            matched.add(obj.pk)
+            if changed := get_changed_fields(obj, attrs):
+                for name in changed:
+                    setattr(obj, name, attrs[name])
+                to_update.append(obj)
+                update_fields.update(changed)
+
+    to_delete = [obj for obj in existing if obj.pk not in matched]
+    in_revision = reversion.is_active() and reversion.is_registered(model)
+    if in_revision:
+        add_deleted_to_revision(to_delete)
+
+    # deleted first, so the unique constraints allow new objects with the same keys
+    model.objects.filter(pk__in=[obj.pk for obj in to_delete]).delete()
+    if to_update:
+        model.objects.bulk_update(to_update, update_fields)
+    model.objects.bulk_create(to_create)
+
+    # bulk operations don't send the signals that add the objects to the revision
+    if in_revision:
+        for obj in to_update + to_create:
+            reversion.add_to_revision(obj)
+
+
+def add_deleted_to_revision(objects: Sequence[models.Model]) -> None:
+    """
+    Add the last versions of objects that are deleted to the active revision, so they
+    can be recovered (see `Version.objects.get_deleted`).
+
+    The revision only saves the versions of the objects that still exist when it's
+    saved, so the versions are added as meta data, which is saved with the revision.
+    """
+    for obj in objects:
+        reversion.add_meta(
+            Version,
+            content_type=ContentType.objects.get_for_model(obj),
+            object_id=str(obj.pk),
+            db=router.db_for_write(type(obj), instance=obj),
+            format="json",
+            serialized_data=serialize("json", [obj]),
+            object_repr=str(obj),
+        )
+
+
+def get_changed_fields(instance: models.Model, attrs: dict) -> list[str]:
+    """
+    Relations are compared by their primary key, so the related objects are not fetched.
+    """
+    changed = []
+    for name, value in attrs.items():
+        current = getattr(instance, instance._meta.get_field(name).attname)
+        if isinstance(value, models.Model):
+            value = value.pk
+        if current != value:
+            changed.append(name)
+    return changed
+
+
 def validate_key_value_model_keys(
     data_list: list[dict], unique_field: str, error_message: str
 ):
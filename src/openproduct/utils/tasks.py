@@ -0,0 +1,27 @@
+from django.conf import settings
+
+from mozilla_django_oidc_db.constants import OIDC_ADMIN_CONFIG_IDENTIFIER
+from mozilla_django_oidc_db.models import OIDCClient
+
+from openproduct.celery import app
+
+from .oidc_backend import OIDCAuthenticationBackend
+
+
+@app.task
+def refresh_oidc_jwks():
+    """
+    Refresh the cached key set of the OIDC provider, so the access tokens can be
+    verified without fetching it during a request.
+    """
+    if not settings.OIDC_VERIFY_ACCESS_TOKENS_LOCALLY:
+        return
+
+    config = OIDCClient.objects.filter(identifier=OIDC_ADMIN_CONFIG_IDENTIFIER).first()
+    if config is None or not config.enabled:
+        return
+
+    backend = OIDCAuthenticationBackend()
+    backend.config = config
+    if backend.OIDC_OP_JWKS_ENDPOINT:
+        backend.refresh_jwks()
@@ -0,0 +1,312 @@
+import json
+import time
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import caches
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+import jwt
+import requests_mock
+from cryptography.hazmat.primitives.asymmetric import rsa
+from mozilla_django_oidc_db.tests.mixins import OIDCMixin
+from rest_framework.status import HTTP_200_OK, HTTP_401_UNAUTHORIZED
+from rest_framework.test import APITestCase
+
+from ...accounts.tests.factories import OIDCClientFactory
+from ...producttypen.tests.factories import ProductTypeFactory
+from ..oidc_drf_middleware import OPAQUE_TOKEN_CACHE_TIMEOUT, get_cached_token_user
+from ..tasks import refresh_oidc_jwks
+from .keycloak import KEYCLOAK_BASE_URL
+
+USERINFO_ENDPOINT = f"{KEYCLOAK_BASE_URL}/userinfo"
+JWKS_ENDPOINT = f"{KEYCLOAK_BASE_URL}/certs"
+ISSUER = "http://localhost:8080/realms/test"
+
+User = get_user_model()
+
+
+class StubProvider:
+    """
+    Sign access tokens with a local key and serve its key set & userinfo with
+    requests_mock.
+    """
+
+    def __init__(self, mocker: requests_mock.Mocker, kid: str = "key-1"):
+        self.mocker = mocker
+        self.rotate_key(kid)
+        self.mocker.get(USERINFO_ENDPOINT, json=self.userinfo)
+
+    def rotate_key(self, kid: str):
+        self.kid = kid
+        self.private_key = rsa.generate_private_key(
+            public_exponent=65537, key_size=2048
+        )
+        jwk = json.loads(
+            jwt.algorithms.RSAAlgorithm.to_jwk(self.private_key.public_key())
+        )
+        self.mocker.get(
+            JWKS_ENDPOINT, json={"keys": [jwk | {"kid": kid, "alg": "RS256"}]}
+        )
+
+    def userinfo(self, request, context):
+        token = request.headers["Authorization"].removeprefix("Bearer ")
+        try:
+            claims = jwt.decode(token, options={"verify_signature": False})
+        except jwt.DecodeError:
+            # an opaque token
+            return {"sub": "testuser"}
+        # the userinfo doesn't contain the claims about the token
+        return {
+            claim: value
+            for claim, value in claims.items()
+            if claim not in ("exp", "iss", "aud", "azp")
+        }
+
+    def token(self, expires_in: int = 300, **claims) -> str:
+        payload = {
+            "sub": "testuser",
+            "exp": int(time.time()) + expires_in,
+            "iss": ISSUER,
+            "azp": "testid",
+        } | claims
+        return jwt.encode(
+            payload, self.private_key, algorithm="RS256", headers={"kid": self.kid}
+        )
+
+
+@override_settings(OIDC_TOKEN_CACHE_TIMEOUT=300)
+class OIDCTokenCacheTests(OIDCMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.oidc_client = OIDCClientFactory.create(
+            with_keycloak_provider=True, with_admin=True, with_admin_options=True
+        )
+        cls.oidc_client.options["user_settings"]["claim_mappings"]["username"] = ["sub"]
+        cls.oidc_client.save()
+
+        provider = cls.oidc_client.oidc_provider
+        provider.oidc_op_discovery_endpoint = f"{ISSUER}/"
+        provider.save()
+
+    def setUp(self):
+        super().setUp()
+        ProductTypeFactory.create()
+        caches["oidc"].clear()
+
+        mocker = requests_mock.Mocker()
+        mocker.start()
+        self.addCleanup(mocker.stop)
+        self.provider = StubProvider(mocker)
+        self.requests = mocker.request_history
+
+    def get(self, token: str):
+        return self.client.get(
+            reverse("producttype-list"), headers={"Authorization": f"Bearer {token}"}
+        )
+
+    def userinfo_calls(self) -> int:
+        return sum(request.url == USERINFO_ENDPOINT for request in self.requests)
+
+    def test_user_of_token_is_cached(self):
+        token = self.provider.token()
+
+        self.assertEqual(self.get(token).status_code, HTTP_200_OK)
+        self.assertEqual(self.get(token).status_code, HTTP_200_OK)
+
+        self.assertEqual(self.userinfo_calls(), 1)
+
+        with self.subTest("other token"):
+            self.assertEqual(
+                self.get(self.provider.token(foo="bar")).status_code, HTTP_200_OK
+            )
+            self.assertEqual(self.userinfo_calls(), 2)
+
+    def test_user_and_claims_are_cached(self):
+        token = self.provider.token(foo="bar")
+        self.assertEqual(self.get(token).status_code, HTTP_200_OK)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get(token).status_code, HTTP_200_OK)
+
+        self.assertFalse(
+            any("accounts_user" in query["sql"] for query in queries.captured_queries)
+        )
+        user, claims = get_cached_token_user(token)
+        self.assertEqual(user.username, "testuser")
+        self.assertEqual(claims, {"sub": "testuser", "foo": "bar"})
+
+    def test_cache_of_changed_user_is_not_used(self):
+        token = self.provider.token()
+        self.assertEqual(self.get(token).status_code, HTTP_200_OK)
+        user = User.objects.get(username="testuser")
+
+        with self.subTest("permissions"):
+            user.user_permissions.add(Permission.objects.first())
+
+            self.get(token)
+            self.assertEqual(self.userinfo_calls(), 2)
+
+        with self.subTest("groups"):
+            user.groups.add(Group.objects.create(name="group"))
+
+            self.get(token)
+            self.assertEqual(self.userinfo_calls(), 3)
+
+        with self.subTest("deleted"):
+            user.delete()
+
+            self.assertIsNone(get_cached_token_user(token))
+
+    def test_cache_of_inactive_user_is_not_used(self):
+        token = self.provider.token()
+        self.assertEqual(self.get(token).status_code, HTTP_200_OK)
+
+        user = User.objects.get(username="testuser")
+        user.is_active = False
+        user.save()
+
+        self.get(token)
+        self.assertEqual(self.userinfo_calls(), 2)
+
+    def test_expired_token_is_not_cached(self):
+        token = self.provider.token(expires_in=-10)
+
+        self.get(token)
+        self.get(token)
+
+        self.assertEqual(self.userinfo_calls(), 2)
+
+    def test_token_is_cached_until_it_expires(self):
+        token = self.provider.token(expires_in=120)
+        self.assertEqual(self.get(token).status_code, HTTP_200_OK)
+
+        with patch("time.time", return_value=time.time() + 180):
+            self.assertEqual(self.get(token).status_code, HTTP_200_OK)
+
+        self.assertEqual(self.userinfo_calls(), 2)
+
+    def test_opaque_token_is_cached_briefly(self):
+        self.assertEqual(self.get("opaque").status_code, HTTP_200_OK)
+        self.assertEqual(self.get("opaque").status_code, HTTP_200_OK)
+        self.assertEqual(self.userinfo_calls(), 1)
+
+        later = time.time() + OPAQUE_TOKEN_CACHE_TIMEOUT + 1
+        with patch("time.time", return_value=later):
+            self.assertEqual(self.get("opaque").status_code, HTTP_200_OK)
+
+        self.assertEqual(self.userinfo_calls(), 2)
+
+    @override_settings(OIDC_TOKEN_CACHE_TIMEOUT=0)
+    def test_disabled_cache(self):
+        token = self.provider.token()
+
+        self.get(token)
+        self.get(token)
+
+        self.assertEqual(self.userinfo_calls(), 2)
+
+    @override_settings(
+        OIDC_TOKEN_CACHE_TIMEOUT=0, OIDC_VERIFY_ACCESS_TOKENS_LOCALLY=True
+    )
+    def test_verify_access_token_locally(self):
+        refresh_oidc_jwks()
+        self.requests.clear()
+
+        with self.subTest("valid token"):
+            response = self.get(self.provider.token())
+
+            self.assertEqual(response.status_code, HTTP_200_OK)
+            self.assertEqual(len(self.requests), 0)
+
+        with self.subTest("expired token"):
+            response = self.get(self.provider.token(expires_in=-10))
+
+            self.assertEqual(response.status_code, HTTP_401_UNAUTHORIZED)
+            self.assertEqual(response.data["detail"], "Token verification failed")
+
+        with self.subTest("other issuer"):
+            response = self.get(self.provider.token(iss="http://example.com"))
+
+            self.assertEqual(response.status_code, HTTP_401_UNAUTHORIZED)
+
+        with self.subTest("other audience"):
+            response = self.get(self.provider.token(azp="other", aud="other"))
+
+            self.assertEqual(response.status_code, HTTP_401_UNAUTHORIZED)
+
+        with self.subTest("client as audience"):
+            response = self.get(self.provider.token(azp=None, aud=["testid"]))
+
+            self.assertEqual(response.status_code, HTTP_200_OK)
+
+        with self.subTest("invalid signature"):
+            other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+            token = jwt.encode(
+                {
+                    "sub": "testuser",
+                    "exp": int(time.time()) + 300,
+                    "iss": ISSUER,
+                    "azp": "testid",
+                },
+                other_key,
+                algorithm="RS256",
+                headers={"kid": self.provider.kid},
+            )
+            response = self.get(token)
+
+            self.assertEqual(response.status_code, HTTP_401_UNAUTHORIZED)
+            self.assertEqual(len(self.requests), 0)
+
+        with self.subTest("rotated key"):
+            self.provider.rotate_key("key-2")
+            token = self.provider.token()
+
+            # the key set was refreshed less than JWKS_REFRESH_INTERVAL ago
+            self.assertEqual(self.get(token).status_code, HTTP_401_UNAUTHORIZED)
+            self.assertEqual(len(self.requests), 0)
+
+            with patch("openproduct.utils.oidc_backend.JWKS_REFRESH_INTERVAL", 0):
+                self.assertEqual(self.get(token).status_code, HTTP_200_OK)
+                self.assertEqual(len(self.requests), 1)
+
+        self.assertEqual(self.userinfo_calls(), 0)
+
+    @override_settings(
+        OIDC_TOKEN_CACHE_TIMEOUT=0, OIDC_VERIFY_ACCESS_TOKENS_LOCALLY=True
+    )
+    def test_key_set_can_not_be_fetched(self):
+        for name, response in (
+            ("error", {"status_code": 500}),
+            ("no key set", {"json": {}}),
+            ("invalid json", {"text": "invalid"}),
+        ):
+            with self.subTest(name):
+                caches["oidc"].clear()
+                self.provider.mocker.get(JWKS_ENDPOINT, **response)
+
+                response = self.get(self.provider.token())
+
+                self.assertEqual(response.status_code, HTTP_401_UNAUTHORIZED)
+                self.assertEqual(
+                    response.data["detail"],
+                    "OIDC authentication failed: the key set of the provider could "
+                    "not be fetched.",
+                )
+
+    @override_settings(
+        OIDC_TOKEN_CACHE_TIMEOUT=0, OIDC_VERIFY_ACCESS_TOKENS_LOCALLY=True
+    )
+    def test_verify_access_token_without_issuer(self):
+        provider = self.oidc_client.oidc_provider
+        provider.oidc_op_discovery_endpoint = ""
+        provider.save()
+
+        self.assertEqual(self.get(self.provider.token()).status_code, HTTP_200_OK)
+        self.assertEqual(self.userinfo_calls(), 1)
@@ -0,0 +1,94 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+
+class TestIndexAdvisorCommand(TestCase):
+    def call_command(self, *args, **kwargs):
+        out = StringIO()
+        call_command(
+            "index_advisor",
+            *args,
+            stdout=out,
+            stderr=StringIO(),
+            **kwargs,
+        )
+        return out.getvalue()
+
+    def test_report_filter_without_index(self):
+        output = self.call_command()
+
+        self.assertIn("producten_product.status has no btree index", output)
+        self.assertIn("used by ProductFilterSet.status", output)
+        self.assertIn(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS "producten_product_status_idx" '
+            'ON "producten_product" ("status");',
+            output,
+        )
+
+    def test_report_filter_on_join(self):
+        output = self.call_command()
+
+        self.assertIn("producten_zaak.urn has no btree index", output)
+        self.assertIn("used by ProductFilterSet.zaken__urn", output)
+        self.assertIn("producten_zaak.urn has no trigram index", output)
+        self.assertIn("used by ProductFilterSet.zaken__urn__contains", output)
+
+    def test_report_does_not_include_indexed_paths(self):
+        output = self.call_command()
+
+        # primary key (ordering) and unique uuid
+        self.assertNotIn("producten_product.id ", output)
+        self.assertNotIn("producttypen_producttype.uuid ", output)
+        # foreign key
+        self.assertNotIn("producten_product.producttype_id ", output)
+
+    def test_existing_index_is_detected(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE INDEX "test_status_idx" ON "producten_product" ("status")'
+            )
+
+        output = self.call_command()
+
+        self.assertNotIn("producten_product.status has no btree index", output)
+
+    def test_index_on_non_leading_column_is_not_used(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE INDEX "test_status_idx" ON "producten_product" ("naam", "status")'
+            )
+
+        output = self.call_command()
+
+        self.assertIn("producten_product.status has no btree index", output)
+
+    def test_sql_format(self):
+        output = self.call_command("--format", "sql")
+
+        self.assertIn(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS "producten_zaak_urn_trgm" '
+            'ON "producten_zaak" USING gin ("urn" gin_trgm_ops);',
+            output,
+        )
+        self.assertNotIn("used by", output)
+
+    def test_migration_format(self):
+        output = self.call_command("--format", "migration")
+
+        self.assertIn("# producten/migrations/", output)
+        self.assertIn("atomic = False", output)
+        self.assertIn("TrigramExtension(),", output)
+        self.assertIn(
+            "reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS "
+            '"producten_product_status_idx"\'',
+            output,
+        )
+
+    def test_write_requires_migration_format(self):
+        with self.assertRaisesMessage(
+            CommandError, "--write can only be used with --format=migration."
+        ):
+            self.call_command("--write")
@@ -0,0 +1,29 @@
+from uuid import uuid4
+
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase
+
+from ..models import BaseModel
+
+
+class BaseModelUUIDIndexTestCase(TestCase):
+    def test_uuid_lookups_use_an_index_scan(self):
+        models = [
+            model
+            for model in apps.get_models()
+            if issubclass(model, BaseModel) and not model._meta.proxy
+        ]
+        self.assertNotEqual(models, [])
+
+        with connection.cursor() as cursor:
+            # the test tables are tiny, so without this the planner always picks a
+            # sequential scan regardless of the available indexes.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        for model in models:
+            with self.subTest(model=model._meta.label):
+                plan = model._default_manager.filter(uuid=uuid4()).explain()
+
+                self.assertIn("Index", plan)
+                self.assertNotIn("Seq Scan", plan)
@@ -0,0 +1,218 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+
+from rest_framework import status
+from rest_framework.filters import OrderingFilter
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from openproduct.producten.models import Product
+from openproduct.producten.tests.factories import ProductFactory
+from openproduct.producttypen.tests.factories import ProductTypeFactory
+from openproduct.utils.enums import CountTypes
+from openproduct.utils.pagination import (
+    CursorPagination,
+    Pagination,
+    UncountedPaginator,
+)
+from openproduct.utils.tests.cases import BaseApiTestCase
+
+
+class TestCursorPagination(BaseApiTestCase):
+    is_superuser = True
+    path = reverse_lazy("product-list")
+
+    def test_page_number_pagination_is_the_default(self):
+        ProductFactory.create_batch(3)
+
+        response = self.client.get(self.path, {"page_size": 2, "page": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNone(response.data["next"])
+
+    def test_walk_all_pages(self):
+        products = ProductFactory.create_batch(5)
+
+        response = self.client.get(self.path, {"cursor": "", "page_size": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertEqual(response.data["count_type"], "none")
+        self.assertIsNone(response.data["previous"])
+
+        uuids = [product["uuid"] for product in response.data["results"]]
+        while next_url := response.data["next"]:
+            response = self.client.get(next_url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            uuids += [product["uuid"] for product in response.data["results"]]
+
+        self.assertEqual(uuids, [str(product.uuid) for product in reversed(products)])
+
+    def test_inserted_rows_do_not_shift_pages(self):
+        products = ProductFactory.create_batch(4)
+
+        response = self.client.get(self.path, {"cursor": "", "page_size": 2})
+        ProductFactory.create()
+        response = self.client.get(response.data["next"])
+
+        self.assertEqual(
+            [product["uuid"] for product in response.data["results"]],
+            [str(products[1].uuid), str(products[0].uuid)],
+        )
+
+    def test_cursor_pagination_with_filters(self):
+        producttype = ProductTypeFactory.create()
+        products = ProductFactory.create_batch(3, producttype=producttype)
+        ProductFactory.create_batch(3)
+
+        response = self.client.get(
+            self.path,
+            {"cursor": "", "page_size": 2, "producttype__uuid": producttype.uuid},
+        )
+        response = self.client.get(response.data["next"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [product["uuid"] for product in response.data["results"]],
+            [str(products[0].uuid)],
+        )
+        self.assertIsNone(response.data["next"])
+
+    def test_ordering_of_ordering_filter_with_id_tiebreaker(self):
+        class View:
+            filter_backends = [OrderingFilter]
+            ordering_fields = ["start_datum", "id"]
+
+        pagination = CursorPagination()
+        queryset = Product.objects.all()
+
+        for params, ordering in [
+            ({}, ("-id",)),
+            ({"ordering": "-start_datum"}, ("-start_datum", "-id")),
+            ({"ordering": "start_datum"}, ("start_datum", "id")),
+            ({"ordering": "start_datum,-id"}, ("start_datum", "-id")),
+        ]:
+            with self.subTest(params):
+                request = Request(APIRequestFactory().get("/", params))
+                self.assertEqual(
+                    pagination.get_ordering(request, queryset, View()), ordering
+                )
+
+
+def get_count_queries(queries) -> list[str]:
+    return [query["sql"] for query in queries if "COUNT(*)" in query["sql"]]
+
+
+@patch.object(Pagination, "count_cap", 10)
+class TestCountTypes(BaseApiTestCase):
+    is_superuser = True
+    path = reverse_lazy("product-list")
+
+    def setUp(self):
+        super().setUp()
+        self.products = ProductFactory.create_batch(25)
+
+    def test_exact_count(self):
+        response = self.client.get(self.path, {"page_size": 10})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 25)
+        self.assertEqual(response.data["count_type"], "exact")
+
+    def test_no_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                self.path, {"page_size": 10, "page": 2, "count": "none"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(get_count_queries(queries), [])
+        self.assertIsNone(response.data["count"])
+        self.assertEqual(response.data["count_type"], "none")
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertIsNotNone(response.data["next"])
+        self.assertIsNotNone(response.data["previous"])
+
+    def test_no_count_last_page(self):
+        response = self.client.get(
+            self.path, {"page_size": 10, "page": 3, "count": "none"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertIsNone(response.data["next"])
+
+        response = self.client.get(
+            self.path, {"page_size": 10, "page": 4, "count": "none"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_num_pages_without_count(self):
+        paginator = UncountedPaginator(
+            Product.objects.order_by("pk"), 10, CountTypes.NONE, 10
+        )
+
+        paginator.page(2)
+        self.assertEqual(paginator.num_pages, 3)
+
+        paginator.page(3)
+        self.assertEqual(paginator.num_pages, 3)
+
+    def test_capped_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.path, {"page_size": 10, "count": "capped"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 10)
+        self.assertEqual(response.data["count_type"], "capped")
+
+        [count_query] = get_count_queries(queries)
+        self.assertIn("LIMIT 11", count_query)
+
+    def test_capped_count_below_cap_is_exact(self):
+        response = self.client.get(
+            self.path,
+            {
+                "count": "capped",
+                "producttype__uuid": self.products[0].producttype.uuid,
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["count_type"], "exact")
+
+    def test_estimated_count(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE producten_product")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                self.path, {"page_size": 10, "count": "estimate"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(get_count_queries(queries), [])
+        self.assertEqual(response.data["count"], 25)
+        self.assertEqual(response.data["count_type"], "estimate")
+
+    def test_estimate_falls_back_to_capped_count_for_distinct_filters(self):
+        response = self.client.get(
+            self.path,
+            {"count": "estimate", "eigenaren__bsn": "111222333"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 0)
+        self.assertEqual(response.data["count_type"], "exact")
+
+    def test_invalid_count_type(self):
+        response = self.client.get(self.path, {"count": "abc"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,6 +1,19 @@
+from decimal import Decimal
+
 from django.test import TestCase
 
-from ..serializers import clean_duplicate_uuids_in_list
+import reversion
+from reversion.models import Revision, Version
+
+from openproduct.producttypen.models import Parameter, PrijsOptie
+from openproduct.producttypen.tests.factories import (
+    ParameterFactory,
+    PrijsFactory,
+    PrijsOptieFactory,
+    ProductTypeFactory,
+)
+
+from ..serializers import clean_duplicate_uuids_in_list, reconcile_nested_objects
 
 
 class TestDuplicateIds(TestCase):
@@ -28,3 +41,103 @@ class TestDuplicateIds(TestCase):
         values = ["123", "456"]
         clean_duplicate_uuids_in_list(values, "test", errors)
         self.assertEqual(errors, {})
+
+
+class TestReconcileNestedObjects(TestCase):
+    def test_unchanged_objects_are_kept(self):
+        producttype = ProductTypeFactory.create()
+        parameter = ParameterFactory.create(
+            producttype=producttype, naam="a", waarde="1"
+        )
+
+        with self.assertNumQueries(1):
+            reconcile_nested_objects(
+                Parameter,
+                "producttype",
+                [(producttype, [{"naam": "a", "waarde": "1"}])],
+                key_fields=("naam",),
+            )
+
+        self.assertEqual(
+            list(producttype.parameters.values_list("id")), [(parameter.id,)]
+        )
+
+    def test_create_update_and_delete(self):
+        producttype = ProductTypeFactory.create()
+        updated = ParameterFactory.create(producttype=producttype, naam="a", waarde="1")
+        ParameterFactory.create(producttype=producttype, naam="b", waarde="2")
+
+        with self.assertNumQueries(5):  # select, delete (2), update & insert
+            reconcile_nested_objects(
+                Parameter,
+                "producttype",
+                [
+                    (
+                        producttype,
+                        [{"naam": "a", "waarde": "3"}, {"naam": "c", "waarde": "4"}],
+                    )
+                ],
+                key_fields=("naam",),
+            )
+
+        self.assertEqual(
+            set(producttype.parameters.values_list("id", "naam", "waarde")),
+            {
+                (updated.id, "a", "3"),
+                (producttype.parameters.get(naam="c").id, "c", "4"),
+            },
+        )
+
+    def test_multiple_parents(self):
+        prijs = PrijsFactory.create()
+        other_prijs = PrijsFactory.create()
+        optie = PrijsOptieFactory.create(prijs=prijs, bedrag=Decimal("10"))
+        other_optie = PrijsOptieFactory.create(prijs=other_prijs)
+
+        with self.assertNumQueries(4):  # select, delete (2) & insert
+            reconcile_nested_objects(
+                PrijsOptie,
+                "prijs",
+                [
+                    (
+                        prijs,
+                        [
+                            {
+                                "uuid": optie.uuid,
+                                "bedrag": Decimal("10"),
+                                "beschrijving": optie.beschrijving,
+                            },
+                        ],
+                    ),
+                    (other_prijs, [{"bedrag": Decimal("5"), "beschrijving": "b"}]),
+                ],
+                key_fields=("uuid",),
+            )
+
+        self.assertEqual(list(prijs.prijsopties.all()), [optie])
+        self.assertFalse(PrijsOptie.objects.filter(id=other_optie.id).exists())
+        self.assertEqual(other_prijs.prijsopties.get().bedrag, Decimal("5"))
+
+    def test_deleted_objects_are_added_to_the_revision(self):
+        producttype = ProductTypeFactory.create()
+        deleted = ParameterFactory.create(producttype=producttype, naam="a")
+
+        with reversion.create_revision():
+            reversion.add_to_revision(producttype)
+            reconcile_nested_objects(
+                Parameter,
+                "producttype",
+                [(producttype, [{"naam": "b", "waarde": "1"}])],
+                key_fields=("naam",),
+            )
+
+        revision = Revision.objects.get()
+        version = Version.objects.get_deleted(Parameter).get()
+        self.assertEqual(version.revision, revision)
+        self.assertEqual(version.field_dict["naam"], "a")
+
+        version.revert()
+        self.assertEqual(
+            set(producttype.parameters.values_list("naam", flat=True)), {"a", "b"}
+        )
+        self.assertEqual(Parameter.objects.get(naam="a").pk, deleted.pk)